@@ -1,18 +1,31 @@
 import streamlit as st
 import math
 import time
-from PIL import Image
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import pandas as pd
 import json
-from fpdf import FPDF
 from datetime import datetime
 from io import BytesIO
 import os
+from isolafacil.transferencia import calcular_q_superficie
+from isolafacil.psicrometria import temperatura_orvalho
+from isolafacil.espessura import arredondar_comercial as espessura_comercial, espessura_minima
+from isolafacil.condensacao import mapa_condensacao
+from isolafacil.catalogo import CAMINHO_PADRAO, CatalogoLocal, FonteArquivo, FonteGoogleSheets
+from isolafacil.auditoria import CAMINHO_PADRAO as CAMINHO_SIMULACOES, FilaSimulacoes, abrir_aba
+from isolafacil.materiais import montar_acabamentos, montar_materiais
+from isolafacil.cache_resultados import CacheResultados
+from isolafacil.multicamada import Camada, resolver_multicamada
+from isolafacil.relatorios import RelatorioConsolidado, avisos_recursos, gerar_pdf, gerar_pdf_frio
+from isolafacil.lote_planilha import COLUNAS, ArquivoLoteInvalido, contar_linhas, processar_para_bytes
+from isolafacil.execucao import aquecer, numero_processos
+from isolafacil.metricas import iniciar_rastro, texto_prometheus
+from isolafacil.linhas import COLUNAS as COLUNAS_LINHAS, avaliar_linhas
+from isolafacil.sensibilidade import VARIAVEIS, CasoBase, CurvasSensibilidade, faixa
+from isolafacil.economia import COMBUSTIVEIS, calcular_retorno_financeiro, espessura_economica
 
 # --- CONFIGURAÇÕES GERAIS E ESTILO ---
 st.set_page_config(page_title="Calculadora IsolaFácil", layout="wide")
+# Tempos de catálogo, solver e PDF desta execução do script (painel de depuração no fim da página).
+rastro = iniciar_rastro("streamlit")
 
 st.markdown("""
 <style>
@@ -29,275 +42,144 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# --- CONSTANTE GLOBAL ---
-sigma = 5.67e-8
-
 # --- CONEXÃO E FUNÇÕES DO GOOGLE SHEETS ---
 @st.cache_resource(ttl=600)
 def get_gspread_client():
+    # gspread e oauth2client só são importados na primeira conexão, não na abertura da página.
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
     scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
     gcp_json = json.loads(st.secrets["GCP_JSON"])
     credentials = ServiceAccountCredentials.from_json_keyfile_dict(gcp_json, scope)
     return gspread.authorize(credentials)
 
-def get_worksheet(sheet_name):
+@st.cache_resource(ttl=600)
+def get_planilha():
     client = get_gspread_client()
-    sheet = client.open_by_url("https://docs.google.com/spreadsheets/d/1W1JHXAnGJeWbGVK0AmORux5I7CYTEwoBIvBfVKO40aY")
-    return sheet.worksheet(sheet_name)
+    return client.open_by_url("https://docs.google.com/spreadsheets/d/1W1JHXAnGJeWbGVK0AmORux5I7CYTEwoBIvBfVKO40aY")
 
-@st.cache_data(ttl=300)
-def carregar_isolantes():
+def get_worksheet(sheet_name):
+    return get_planilha().worksheet(sheet_name)
+
+@st.cache_resource
+def get_catalogo():
+    # Cópia local das abas; ISOLAFACIL_CATALOGO_FIXTURE substitui a planilha por um arquivo JSON.
+    fixture = os.environ.get("ISOLAFACIL_CATALOGO_FIXTURE")
+    fonte = FonteArquivo(fixture) if fixture else FonteGoogleSheets(get_planilha)
+    return CatalogoLocal(fonte, os.environ.get("ISOLAFACIL_CATALOGO_DB", CAMINHO_PADRAO))
+
+@st.cache_resource
+def aquecer_pool():
+    # Uma vez por processo: os processos do pool sobem e importam o solver enquanto o usuário ainda
+    # escolhe as opções do lote, e não no clique em "Processar Lote".
+    aquecer()
+
+@st.cache_resource
+def get_fila_simulacoes():
+    # Auditoria na aba "Simulações", enviada em lotes por uma thread; desligada na execução offline.
+    if os.environ.get("ISOLAFACIL_CATALOGO_FIXTURE"):
+        return None
+    return FilaSimulacoes(lambda: abrir_aba(get_planilha()), os.environ.get("ISOLAFACIL_SIMULACOES_DB", CAMINHO_SIMULACOES))
+
+def registrar_simulacao(tipo, dados):
+    fila = get_fila_simulacoes()
+    if fila is not None:
+        fila.registrar(tipo, dados)
+
+def preparar_catalogo():
+    catalogo = get_catalogo()
+    if any(catalogo.registros(aba) is None for aba in catalogo.abas):
+        with st.spinner("Baixando catálogo de materiais..."):
+            catalogo.atualizar()
+    else:
+        catalogo.atualizar_em_segundo_plano()
+    if catalogo.ultimo_erro is not None:
+        st.warning(f"Não foi possível atualizar o catálogo a partir da planilha; usando a última cópia local. ({catalogo.ultimo_erro})")
+    return catalogo
+
+@st.cache_resource
+def carregar_isolantes(revisao):
     try:
-        worksheet = get_worksheet("Isolantes 2")
-        df = pd.DataFrame(worksheet.get_all_records())
-        df['T_min'] = pd.to_numeric(df['T_min'], errors='coerce').fillna(-999)
-        df['T_max'] = pd.to_numeric(df['T_max'], errors='coerce').fillna(9999)
-        return df
+        return montar_materiais(get_catalogo().registros("Isolantes 2"))
     except Exception as ex:
         st.error(f"Erro ao carregar materiais isolantes: {ex}")
-        return pd.DataFrame()
+        return montar_materiais([])
 
-@st.cache_data(ttl=300)
-def carregar_acabamentos():
+@st.cache_resource
+def carregar_acabamentos(revisao):
     try:
-        worksheet = get_worksheet("Emissividade")
-        df = pd.DataFrame(worksheet.get_all_records())
-        df['emissividade'] = pd.to_numeric(df['emissividade'].astype(str).str.replace(',', '.'), errors='coerce').fillna(0.9)
-        return df
+        return montar_acabamentos(get_catalogo().registros("Emissividade"))
     except Exception as ex:
         st.error(f"Erro ao carregar acabamentos: {ex}")
-        return pd.DataFrame()
+        return montar_acabamentos([])
 
 # --- FUNÇÕES DE CÁLCULO ---
-def calcular_k(k_func_str, T_media):
-    try:
-        k_func_safe = str(k_func_str).replace(',', '.')
-        return eval(k_func_safe, {"math": math, "T": T_media})
-    except Exception as ex:
-        st.error(f"Erro na fórmula k(T) '{k_func_str}': {ex}")
-        return None
-
-def calcular_h_conv(Tf, To, geometry, outer_diameter_m=None, wind_speed_ms=0):
-    Tf_K, To_K = Tf + 273.15, To + 273.15
-    T_film_K = (Tf_K + To_K) / 2
-    g, beta = 9.81, 1 / T_film_K
-    nu = 1.589e-5 * (T_film_K / 293.15)**0.7
-    alpha = 2.25e-5 * (T_film_K / 293.15)**0.8
-    k_ar = 0.0263
-    Pr = nu / alpha
-    delta_T = abs(Tf - To)
-    if delta_T == 0: return 0
-    
-    if wind_speed_ms >= 1.0:
-        L_c = 1.0 if geometry == "Superfície Plana" else outer_diameter_m
-        if L_c is None or L_c == 0: L_c = 1.0
-        Re = (wind_speed_ms * L_c) / nu
-        if Re < 5e5:
-            Nu = 0.664 * (Re**0.5) * (Pr**(1/3))
-        else:
-            Nu = (0.037 * (Re**0.8) - 871) * (Pr**(1/3))
-    else:
-        if geometry == "Superfície Plana":
-            L_c = 0.1
-            Ra = (g * beta * delta_T * L_c**3) / (nu * alpha)
-            Nu = 0.27 * Ra**(1/4)
-        elif geometry == "Tubulação":
-            L_c = outer_diameter_m
-            Ra = (g * beta * delta_T * L_c**3) / (nu * alpha)
-            term1 = 0.60
-            term2 = (0.387 * Ra**(1/6)) / ((1 + (0.559 / Pr)**(9/16))**(8/27))
-            Nu = (term1 + term2)**2
-        else:
-            Nu = 0
-    
-    return (Nu * k_ar) / L_c
-
-def encontrar_temperatura_face_fria(Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0):
-    Tf = To + 10.0
-    max_iter, step, min_step, tolerancia = 1000, 50.0, 0.001, 0.5
-    erro_anterior = None
-    
-    for i in range(max_iter):
-        T_media = (Tq + Tf) / 2
-        k = calcular_k(k_func_str, T_media)
-        if k is None or k <= 0: return None, None, False
-
-        if geometry == "Superfície Plana":
-            q_conducao = k * (Tq - Tf) / L_total
-            outer_surface_diameter = L_total
-        elif geometry == "Tubulação":
-            r_inner = pipe_diameter_m / 2
-            r_outer = r_inner + L_total
-            if r_inner <= 0 or r_outer <= r_inner: return None, None, False
-            q_conducao = (k * (Tq - Tf)) / (r_outer * math.log(r_outer / r_inner))
-            outer_surface_diameter = r_outer * 2
-
-        Tf_K, To_K = Tf + 273.15, To + 273.15
-        h_conv = calcular_h_conv(Tf, To, geometry, outer_surface_diameter, wind_speed_ms)
-        q_rad = emissividade * sigma * (Tf_K**4 - To_K**4)
-        q_conv = h_conv * (Tf - To)
-        q_transferencia = q_conv + q_rad
-        
-        erro = q_conducao - q_transferencia
-        if abs(erro) < tolerancia: return Tf, q_transferencia, True
-
-        if erro_anterior is not None and erro * erro_anterior < 0:
-            step = max(min_step, step * 0.5)
-        Tf += step if erro > 0 else -step
-        erro_anterior = erro
-        
-    return Tf, None, False
+@st.cache_resource
+def get_cache_resultados():
+    # Compartilhado entre todas as sessões do processo.
+    return CacheResultados()
+
+@st.cache_resource
+def get_curvas_sensibilidade():
+    # Pontos das curvas de sensibilidade, também compartilhados entre as sessões.
+    return CurvasSensibilidade()
+
+def desenhar_sensibilidade(grafico_tf, grafico_q, pontos, rotulo):
+    validos = [p for p in pontos if p["convergiu"]]
+    grafico_tf.line_chart({rotulo: [p["x"] for p in validos], "Temperatura da face fria [°C]": [p["tf"] for p in validos]},
+                          x=rotulo)
+    grafico_q.line_chart({rotulo: [p["x"] for p in validos], "Perda com isolante [kW/m²]": [p["perda_kw"] for p in validos]},
+                         x=rotulo)
 
 # --- FUNÇÕES DE GERAÇÃO DE PDF ---
-def preparar_pdf():
-    pdf = FPDF()
-    pdf.add_page()
-    
-    background_image_path = 'fundo_relatorio.png'
-    if os.path.exists(background_image_path):
-        pdf.image(background_image_path, x=0, y=0, w=210, h=297)
-    else:
-        st.warning(f"Aviso: Imagem de fundo '{background_image_path}' não encontrada. O PDF será gerado com fundo branco.")
-    
-    try:
-        pdf.add_font('DejaVu', '', 'DejaVuSans.ttf', uni=True)
-        pdf.add_font('DejaVu', 'B', 'DejaVuSans-Bold.ttf', uni=True)
-        font_family = 'DejaVu'
-    except RuntimeError:
-        st.warning("Arquivos de fonte (DejaVu) não encontrados. PDF usará fonte padrão Arial.")
-        font_family = 'Arial'
-    return pdf, font_family
-
-def gerar_pdf(dados):
-    pdf, font_family = preparar_pdf()
-    
-    # Posiciona o cursor 8mm a partir do topo da página (mais acima que o padrão)
-    pdf.set_y(8)
-    # Define a cor do texto como branco
-    pdf.set_text_color(255, 255, 255)
-    
-    pdf.set_font(font_family, 'B', 16)
-    pdf.cell(0, 10, "Relatório de Cálculo Térmico", 0, 1, "C")
-    
-    # Restaura a cor do texto para preto para o restante do documento
-    pdf.set_text_color(0, 0, 0)
-    
-    pdf.ln(10)
-    
-    pdf.set_font(font_family, '', 10)
-    data_simulacao = datetime.now().strftime("%d/%m/%Y")
-    pdf.cell(0, 5, f"Data da Simulação: {data_simulacao}", 0, 1, "L")
-    pdf.ln(5)
-
-    pdf.set_font(font_family, 'B', 12)
-    pdf.cell(0, 8, "1. Parâmetros de Entrada", ln=1)
-    pdf.set_font(font_family, '', 11)
-    
-    texto_entradas = (
-        f"Material do Isolante: {dados.get('material', '')}\n"
-        f"Acabamento Externo: {dados.get('acabamento', '')}\n"
-        f"Tipo de Superfície: {dados.get('geometria', '')}\n"
-    )
-    if dados.get("geometria") == "Tubulação":
-        texto_entradas += f"Diâmetro da Tubulação: {dados.get('diametro_tubo', 0)} mm\n"
-    texto_entradas += (
-        f"Número de Camadas: {dados.get('num_camadas', '')}\n"
-        f"Espessura Total: {dados.get('esp_total', 0)} mm\n"
-        f"Temp. da Face Quente: {dados.get('tq', 0)} °C\n"
-        f"Temp. Ambiente: {dados.get('to', 0)} °C\n"
-        f"Emissividade (e): {dados.get('emissividade', '')}\n"
-    )
-    pdf.multi_cell(0, 6, texto_entradas.strip())
-    pdf.ln(5)
-
-    pdf.set_font(font_family, 'B', 12)
-    pdf.cell(0, 8, "2. Resultados do Cálculo Térmico", ln=1)
-    pdf.set_font(font_family, '', 11)
-
-    texto_resultados = (
-        f"Temperatura da Face Fria: {dados.get('tf', 0):.1f} °C\n"
-        f"Perda de Calor com Isolante: {dados.get('perda_com_kw', 0):.3f} kW/m²\n"
-        f"Perda de Calor sem Isolante: {dados.get('perda_sem_kw', 0):.3f} kW/m²\n"
-    )
-    pdf.multi_cell(0, 6, texto_resultados.strip())
-    pdf.ln(5)
-
-    if dados.get("calculo_financeiro", False):
-        pdf.set_font(font_family, 'B', 12)
-        pdf.cell(0, 8, "3. Análise Financeira e Ambiental", ln=1)
-        pdf.set_font(font_family, '', 11)
-     
-        texto_financeiro = (
-            f"Economia Mensal: R$ {dados.get('eco_mensal', 0):,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.') + "\n"
-            f"Economia Anual: R$ {dados.get('eco_anual', 0):,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.') + "\n"
-            f"Redução de Perda: {dados.get('reducao_pct', 0):.1f} %\n"
-            f"Carbono Evitado: {dados.get('co2_ton_ano', 0):.2f} tCO2e/ano\n"
-        )
-        pdf.multi_cell(0, 6, texto_financeiro.strip())
-
-    buffer = BytesIO()
-    pdf.output(buffer)
-    return buffer.getvalue()
-
-def gerar_pdf_frio(dados):
-    pdf, font_family = preparar_pdf()
-
-    # Posiciona o cursor 8mm a partir do topo da página (mais acima que o padrão)
-    pdf.set_y(8)
-    # Define a cor do texto como branco
-    pdf.set_text_color(255, 255, 255)
-
-    pdf.set_font(font_family, 'B', 16)
-    pdf.cell(0, 10, "Relatório de Cálculo de Condensação", 0, 1, "C")
-    
-    # Restaura a cor do texto para preto para o restante do documento
-    pdf.set_text_color(0, 0, 0)
-
-    pdf.ln(10)
+@st.cache_data(max_entries=64, show_spinner=False)
+def gerar_pdf_em_cache(dados):
+    return gerar_pdf(dados)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def gerar_pdf_frio_em_cache(dados):
+    return gerar_pdf_frio(dados)
+
+def botao_relatorio_pdf(gerador, dados, chave, **kwargs):
+    # O PDF só é montado quando o usuário pede; depois fica em cache pelo conteúdo de 'dados'.
+    if not st.session_state.get(chave, False):
+        espaco = st.empty()
+        if not espaco.button("Preparar Relatório PDF", key=f"{chave}_preparar"):
+            return
+        espaco.empty()
+        st.session_state[chave] = True
+    for aviso in avisos_recursos():
+        st.warning(aviso)
+    with st.spinner("Gerando relatório..."):
+        pdf_bytes = gerador(dados)
+    st.download_button(label="Download Relatório PDF", data=pdf_bytes, mime="application/pdf", **kwargs)
     
-    pdf.set_font(font_family, '', 10)
-    data_simulacao = datetime.now().strftime("%d/%m/%Y")
-    pdf.cell(0, 5, f"Data da Simulação: {data_simulacao}", 0, 1, "L")
-    pdf.ln(5)
-
-    pdf.set_font(font_family, 'B', 12)
-    pdf.cell(0, 8, "1. Parâmetros de Entrada", ln=1)
-    pdf.set_font(font_family, '', 11)
-
-    texto_entradas = (
-        f"Material do Isolante: {dados.get('material', '')}\n"
-        f"Tipo de Superfície: {dados.get('geometria', '')}\n"
-    )
-    if dados.get("geometria") == "Tubulação":
-        texto_entradas += f"Diâmetro da Tubulação: {dados.get('diametro_tubo', 0)} mm\n"
-    texto_entradas += (
-        f"Temp. Interna: {dados.get('ti', 0)} °C\n"
-        f"Temp. Ambiente: {dados.get('ta', 0)} °C\n"
-        f"Umidade Relativa: {dados.get('ur', 0)} %\n"
-        f"Velocidade do Vento: {dados.get('vento', 0)} m/s\n"
-    )
-    pdf.multi_cell(0, 6, texto_entradas.strip())
-    pdf.ln(5)
+# --- RECURSOS ESTÁTICOS ---
+PASTA_APP = os.path.dirname(os.path.abspath(__file__))
+LARGURA_LOGO = 300
 
-    pdf.set_font(font_family, 'B', 12)
-    pdf.cell(0, 8, "2. Resultados do Cálculo", ln=1)
-    pdf.set_font(font_family, '', 11)
+@st.cache_resource
+def carregar_logo(largura=LARGURA_LOGO):
+    # Decodifica e reduz o logo uma vez por processo. Com uma imagem PIL do original, o st.image
+    # recodificava e redimensionava os 1024 px a cada execução do script; com o PNG já na largura
+    # exibida ele só lê o cabeçalho.
+    from PIL import Image
 
-    texto_resultados = (
-        f"Temperatura de Orvalho: {dados.get('t_orvalho', 0):.1f} °C\n"
-        f"Espessura Mínima Recomendada: {dados.get('espessura_final', 0):.1f} mm\n"
-    )
-    pdf.multi_cell(0, 6, texto_resultados.strip())
+    try:
+        with Image.open(os.path.join(PASTA_APP, "logo.png")) as logo:
+            logo.thumbnail((largura, logo.height), Image.LANCZOS)
+            saida = BytesIO()
+            logo.save(saida, format="PNG")
+    except FileNotFoundError:
+        return None
+    return saida.getvalue()
 
-    buffer = BytesIO()
-    pdf.output(buffer)
-    return buffer.getvalue()
-    
 # --- INICIALIZAÇÃO E INTERFACE PRINCIPAL ---
-try:
-    logo = Image.open("logo.png")
-    st.image(logo, width=300)
-except FileNotFoundError:
+logo = carregar_logo()
+if logo is not None:
+    st.image(logo, width=LARGURA_LOGO)
+else:
     st.warning("Arquivo 'logo.png' não encontrado.")
 
 st.title("Análise de Isolamento Térmico")
@@ -308,46 +190,53 @@ if 'calculo_realizado' not in st.session_state:
 if 'calculo_frio_realizado' not in st.session_state:
     st.session_state.calculo_frio_realizado = False
 
-df_isolantes = carregar_isolantes()
-df_acabamentos = carregar_acabamentos()
+catalogo = preparar_catalogo()
+isolantes, isolantes_rejeitados = carregar_isolantes(catalogo.revisao("Isolantes 2"))
+acabamentos = carregar_acabamentos(catalogo.revisao("Emissividade"))
+for nome, k_func_invalida, erro in isolantes_rejeitados:
+    st.warning(f"Material '{nome}' ignorado: fórmula k(T) '{k_func_invalida}' inválida ({erro}).")
 
-if df_isolantes.empty or df_acabamentos.empty:
+if not isolantes or not acabamentos:
     st.error("Não foi possível carregar os dados da planilha. Verifique as abas 'Isolantes 2' e 'Emissividade'.")
     st.stop()
 
 # --- INTERFACE COM TABS ---
-abas = st.tabs(["🔥 Cálculo Térmico e Financeiro", "🧊 Cálculo Térmico Frio"])
+abas = st.tabs(["🔥 Cálculo Térmico e Financeiro", "🧊 Cálculo Térmico Frio", "📋 Cálculo em Lote", "🛢️ Lista de Linhas"])
 with abas[0]:
     st.subheader("Parâmetros do Isolamento Térmico")
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        material_selecionado_nome = st.selectbox("Escolha o material do isolante", df_isolantes['nome'].tolist(), key="mat_quente")
+        opcoes_quente = isolantes.validos_para(st.session_state.get("Tq_quente", 250.0)) or isolantes.nomes
+        material_selecionado_nome = st.selectbox("Escolha o material do isolante", opcoes_quente, key="mat_quente")
     with col2:
-        acabamento_selecionado_nome = st.selectbox("Tipo de isolamento / acabamento", df_acabamentos['acabamento'].tolist(), key="acab_quente")
+        acabamento_selecionado_nome = st.selectbox("Tipo de isolamento / acabamento", acabamentos.nomes, key="acab_quente")
     with col3:
         geometry = st.selectbox("Tipo de Superfície", ["Superfície Plana", "Tubulação"], key="geom_quente")
 
-    isolante_selecionado = df_isolantes[df_isolantes['nome'] == material_selecionado_nome].iloc[0]
-    k_func_str = isolante_selecionado['k_func']
+    isolante_selecionado = isolantes[material_selecionado_nome]
+    k_func_str = isolante_selecionado.k_func_str
     
-    acabamento_selecionado = df_acabamentos[df_acabamentos['acabamento'] == acabamento_selecionado_nome].iloc[0]
-    emissividade_selecionada = acabamento_selecionado['emissividade']
+    acabamento_selecionado = acabamentos[acabamento_selecionado_nome]
+    emissividade_selecionada = acabamento_selecionado.emissividade
 
     pipe_diameter_mm = 0
     if geometry == "Tubulação":
         pipe_diameter_mm = st.number_input("Diâmetro externo da tubulação [mm]", min_value=1.0, value=88.9, step=0.1, format="%.1f")
 
     col_temp1, col_temp2, col_temp3 = st.columns(3)
-    Tq = col_temp1.number_input("Temperatura da face quente [°C]", value=250.0)
+    Tq = col_temp1.number_input("Temperatura da face quente [°C]", value=250.0, key="Tq_quente")
     To = col_temp2.number_input("Temperatura ambiente [°C]", value=30.0)
     numero_camadas = col_temp3.number_input("Número de camadas de isolante", 1, 3, 1)
 
     espessuras = []
+    materiais_camadas = [material_selecionado_nome]
     cols_esp = st.columns(numero_camadas)
     for i in range(numero_camadas):
         esp = cols_esp[i].number_input(f"Espessura camada {i+1} [mm]", value=51.0/numero_camadas, key=f"L{i+1}_quente", min_value=0.1)
         espessuras.append(esp)
+        if i > 0:
+            materiais_camadas.append(cols_esp[i].selectbox(f"Material camada {i+1}", isolantes.nomes, index=isolantes.nomes.index(material_selecionado_nome), key=f"mat{i+1}_quente"))
     L_total = sum(espessuras)
 
     st.markdown("---")
@@ -357,15 +246,8 @@ with abas[0]:
         st.subheader("Parâmetros do Cálculo Financeiro e Ambiental")
         st.info("💡 Os custos e fatores de emissão são pré-configurados com valores médios de mercado.")
         
-        combustiveis = {
-            "Óleo BPF (kg)":                   {"v": 3.50, "pc": 11.34, "ef": 0.80, "fator_emissao": 3.15},
-            "Gás Natural (m³)":                {"v": 3.60, "pc": 9.65,  "ef": 0.75, "fator_emissao": 2.0},
-            "Lenha Eucalipto 30% umidade (ton)": {"v": 200.00,"pc": 3500.00,"ef": 0.70, "fator_emissao": 1260},
-            "Eletricidade (kWh)":                {"v": 0.75, "pc": 1.00,  "ef": 1.00, "fator_emissao": 0.0358}
-        }
-        
-        comb_sel_nome = st.selectbox("Tipo de combustível", list(combustiveis.keys()))
-        comb_sel_obj = combustiveis[comb_sel_nome]
+        comb_sel_nome = st.selectbox("Tipo de combustível", list(COMBUSTIVEIS.keys()))
+        comb_sel_obj = COMBUSTIVEIS[comb_sel_nome]
         
         editar_valor = st.checkbox("Editar custo do combustível/energia")
         if editar_valor:
@@ -374,87 +256,122 @@ with abas[0]:
             valor_comb = comb_sel_obj['v']
             
         col_fin1, col_fin2, col_fin3 = st.columns(3)
-        m2 = col_fin1.number_input("Área do projeto (m²)", min_value=0.001, value=10.0, format="%.2f")
+        if geometry == "Tubulação":
+            # Em tubulação a perda é por metro de tubo, então a extensão do projeto é o comprimento.
+            extensao = col_fin1.number_input("Comprimento da tubulação (m)", min_value=0.001, value=10.0, format="%.2f")
+        else:
+            extensao = col_fin1.number_input("Área do projeto (m²)", min_value=0.001, value=10.0, format="%.2f")
         h_dia = col_fin2.number_input("Horas de operação/dia", 1.0, 24.0, 8.0)
         d_sem = col_fin3.number_input("Dias de operação/semana", 1, 7, 5)
 
+        otimizar_espessura = st.checkbox("Calcular espessura econômica")
+        if otimizar_espessura:
+            st.caption("Compara, para todos os materiais adequados à temperatura da face quente, o custo anual da energia perdida com o custo anualizado do isolamento.")
+            col_eco1, col_eco2, col_eco3, col_eco4 = st.columns(4)
+            preco_m3 = col_eco1.number_input("Custo instalado do isolante (R$/m³)", min_value=0.0, value=1500.0, step=50.0)
+            vida_util = col_eco2.number_input("Vida útil (anos)", 1, 50, 10)
+            taxa_juros = col_eco3.number_input("Taxa de juros (% a.a.)", 0.0, 50.0, 10.0)
+            esp_max_eco = col_eco4.number_input("Espessura máxima (mm)", 10.0, 500.0, 200.0, step=10.0)
+            incluir_acabamentos = st.checkbox("Comparar também os acabamentos")
+
+            if st.button("Calcular Espessura Econômica", key="btn_economica"):
+                materiais_candidatos = [(nome, isolantes[nome].k_func_str) for nome in isolantes.validos_para(Tq)]
+                if not materiais_candidatos:
+                    st.error(f"Nenhum material do catálogo é adequado para {Tq}°C.")
+                elif Tq <= To:
+                    st.error("Erro: A temperatura da face quente deve ser maior do que a temperatura ambiente.")
+                else:
+                    candidatos_acabamento = [(a.nome, a.emissividade) for a in acabamentos] if incluir_acabamentos else [(acabamento_selecionado_nome, emissividade_selecionada)]
+                    with st.spinner("Otimizando espessura..."):
+                        resultado_eco = espessura_economica(
+                            Tq, To, geometry, materiais_candidatos, [e / 1000 for e in range(5, int(esp_max_eco) + 1, 5)],
+                            preco_m3, comb_sel_obj, h_dia, d_sem, vida_util, taxa_juros / 100, valor_comb,
+                            candidatos_acabamento, pipe_diameter_mm / 1000
+                        )
+                    otimo = resultado_eco.otimo
+                    if otimo is None:
+                        st.error("❌ Não foi possível calcular a espessura econômica para os dados informados.")
+                    else:
+                        custo_str = f"R$ {otimo['custo_total_ano']:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                        st.success(f"💰 Espessura econômica: {otimo['espessura_mm']:.0f} mm de {otimo['material']}"
+                                   + (f" ({otimo['acabamento']})" if incluir_acabamentos else "")
+                                   + f" — custo total {custo_str}/ano por {resultado_eco.unidade}")
+                        curva = resultado_eco.curva[resultado_eco.curva['convergiu']]
+                        curva_otima = curva[(curva['material'] == otimo['material']) & (curva['acabamento'] == otimo['acabamento'])]
+                        st.line_chart(curva_otima.set_index('espessura_mm')[['custo_energia_ano', 'custo_isolamento_ano', 'custo_total_ano']])
+                        with st.expander("Melhor espessura por material"):
+                            melhores = curva.loc[curva.groupby(['material', 'acabamento'])['custo_total_ano'].idxmin()]
+                            st.dataframe(melhores.sort_values('custo_total_ano')[['material', 'acabamento', 'espessura_mm', 'custo_total_ano']], hide_index=True)
+
     st.markdown("---")
 
     if st.button("Calcular", key="btn_quente"):
         st.session_state.calculo_realizado = False
-        if not (isolante_selecionado['T_min'] <= Tq <= isolante_selecionado['T_max']):
-            st.error(f"Material inadequado! A temperatura de operação ({Tq}°C) está fora dos limites para '{material_selecionado_nome}' (Mín: {isolante_selecionado['T_min']}°C, Máx: {isolante_selecionado['T_max']}°C).")
+        if not isolante_selecionado.aceita(Tq):
+            st.error(f"Material inadequado! A temperatura de operação ({Tq}°C) está fora dos limites para '{material_selecionado_nome}' (Mín: {isolante_selecionado.T_min}°C, Máx: {isolante_selecionado.T_max}°C).")
         elif Tq <= To:
             st.error("Erro: A temperatura da face quente deve ser maior do que a temperatura ambiente.")
         else:
             with st.spinner("Realizando cálculos..."):
-                Tf, q_com_isolante, convergiu = encontrar_temperatura_face_fria(Tq, To, L_total / 1000, k_func_str, geometry, emissividade_selecionada, pipe_diameter_mm / 1000)
-                if convergiu:
+                if numero_camadas == 1:
+                    resultado = get_cache_resultados().resolver(Tq, To, L_total / 1000, k_func_str, geometry, emissividade_selecionada, pipe_diameter_mm / 1000)
+                    interfaces = []
+                else:
+                    camadas = [Camada(esp / 1000, isolantes[nome].k_func_str) for esp, nome in zip(espessuras, materiais_camadas)]
+                    resultado = resolver_multicamada(Tq, To, camadas, geometry, emissividade_selecionada, pipe_diameter_mm / 1000)
+                    interfaces = list(resultado.interfaces)
+                Tf, q_com_isolante = resultado.Tf, resultado.q
+                if resultado.convergiu:
                     st.session_state.calculo_realizado = True
+                    for i, (nome, T_face) in enumerate(zip(materiais_camadas, [Tq] + interfaces)):
+                        if not isolantes[nome].aceita(T_face):
+                            st.warning(f"A face quente da camada {i+1} ({T_face:.1f}°C) está fora dos limites de '{nome}' (Mín: {isolantes[nome].T_min}°C, Máx: {isolantes[nome].T_max}°C).")
                     perda_com_kw = q_com_isolante / 1000
-                    h_sem = calcular_h_conv(Tq, To, geometry, (pipe_diameter_mm / 1000) if geometry == "Tubulação" else None)
-                    q_rad_sem = emissividade_selecionada * sigma * ((Tq + 273.15)**4 - (To + 273.15)**4)
-                    q_conv_sem = h_sem * (Tq - To)
-                    perda_sem_kw = (q_rad_sem + q_conv_sem) / 1000
+                    perda_sem_kw = calcular_q_superficie(Tq, To, geometry, emissividade_selecionada, (pipe_diameter_mm / 1000) if geometry == "Tubulação" else None) / 1000
+                    if geometry == "Tubulação":
+                        # kW/m de tubo: fluxo na face externa do isolante (com) ou na parede do tubo (sem).
+                        perda_com_kw_m = perda_com_kw * math.pi * (pipe_diameter_mm + 2 * L_total) / 1000
+                        perda_sem_kw_m = perda_sem_kw * math.pi * pipe_diameter_mm / 1000
+                    else:
+                        perda_com_kw_m = perda_sem_kw_m = None
                     
                     dados_para_relatorio = {
                         "material": material_selecionado_nome, "acabamento": acabamento_selecionado_nome, 
                         "geometria": geometry, "diametro_tubo": pipe_diameter_mm, "num_camadas": numero_camadas, 
+                        "materiais_camadas": materiais_camadas, "espessuras": espessuras, "interfaces": interfaces,
                         "esp_total": L_total, "tq": Tq, "to": To, "emissividade": emissividade_selecionada, 
-                        "tf": Tf, "perda_com_kw": perda_com_kw, "perda_sem_kw": perda_sem_kw, 
-                        "calculo_financeiro": calcular_financeiro
+                        "tf": Tf, "perda_com_kw": perda_com_kw, "perda_sem_kw": perda_sem_kw,
+                        "perda_com_kw_m": perda_com_kw_m, "perda_sem_kw_m": perda_sem_kw_m,
+                        "calculo_financeiro": calcular_financeiro, "data_simulacao": datetime.now().strftime("%d/%m/%Y")
                     }
 
                     if calcular_financeiro:
-                        economia_kw_m2 = perda_sem_kw - perda_com_kw
-                        custo_kwh = valor_comb / (comb_sel_obj['pc'] * comb_sel_obj['ef'])
-                        eco_mensal = economia_kw_m2 * custo_kwh * m2 * h_dia * d_sem * 4.33
-                        eco_anual = eco_mensal * 12
-                        reducao_pct = ((economia_kw_m2 / perda_sem_kw) * 100) if perda_sem_kw > 0 else 0
-                        
-                        # Cálculo de Carbono
-                        energia_efetiva_anual_kwh = economia_kw_m2 * m2 * h_dia * d_sem * 4.33 * 12
-                        energia_bruta_anual_kwh = energia_efetiva_anual_kwh / comb_sel_obj['ef']
-                        quantidade_comb_poupado = energia_bruta_anual_kwh / comb_sel_obj['pc']
-                        co2_evitado_anual_kg = quantidade_comb_poupado * comb_sel_obj['fator_emissao']
-                        co2_evitado_anual_ton = co2_evitado_anual_kg / 1000
-                        
-                        dados_para_relatorio.update({
-                            "eco_mensal": eco_mensal, "eco_anual": eco_anual, 
-                            "reducao_pct": reducao_pct, "co2_ton_ano": co2_evitado_anual_ton
-                        })
+                        dados_para_relatorio.update(
+                            calcular_retorno_financeiro(perda_sem_kw_m if geometry == "Tubulação" else perda_sem_kw,
+                                                        perda_com_kw_m if geometry == "Tubulação" else perda_com_kw,
+                                                        comb_sel_obj, valor_comb, extensao, h_dia, d_sem)
+                        )
 
                     st.session_state.dados_ultima_simulacao = dados_para_relatorio
+                    registrar_simulacao("quente", dados_para_relatorio)
+                    st.session_state.pdf_quente_solicitado = False
                 else:
                     st.session_state.calculo_realizado = False
-                    st.error("❌ O cálculo não convergiu. Verifique os dados de entrada.")
+                    st.error(f"❌ O cálculo não convergiu: {resultado.status}. Verifique os dados de entrada.")
     
     if st.session_state.get('calculo_realizado', False):
         dados = st.session_state.dados_ultima_simulacao
         st.subheader("Resultados")
         st.success(f"🌡️ Temperatura da face fria: {dados['tf']:.1f} °C".replace('.', ','))
         
-        if dados['num_camadas'] > 1:
-            T_atual = dados['tq']
-            k_medio = calcular_k(k_func_str, (dados['tq'] + dados['tf']) / 2)
-            q_com_isolante = dados['perda_com_kw'] * 1000
-            if k_medio and q_com_isolante is not None:
-                for i in range(dados['num_camadas'] - 1):
-                    if dados['geometria'] == "Superfície Plana":
-                        resistencia_camada = (espessuras[i] / 1000) / k_medio
-                        delta_T_camada = q_com_isolante * resistencia_camada
-                    elif dados['geometria'] == "Tubulação":
-                        r_camada_i = (dados['diametro_tubo'] / 2000) + sum(espessuras[:i]) / 1000
-                        r_camada_o = r_camada_i + espessuras[i] / 1000
-                        q_linha = q_com_isolante * (2 * math.pi * ((dados['diametro_tubo']/2000) + L_total/1000))
-                        resistencia_termica_linha = math.log(r_camada_o / r_camada_i) / (2 * math.pi * k_medio)
-                        delta_T_camada = q_linha * resistencia_termica_linha
-                    T_interface = T_atual - delta_T_camada
-                    st.success(f"↪️ Temp. entre camada {i+1} e {i+2}: {T_interface:.1f} °C".replace('.', ','))
-                    T_atual = T_interface
+        for i, T_interface in enumerate(dados['interfaces']):
+            st.success(f"↪️ Temp. entre camada {i+1} e {i+2}: {T_interface:.1f} °C".replace('.', ','))
                     
         st.info(f"⚡ Perda de calor com isolante: {dados['perda_com_kw']:.3f} kW/m²".replace('.', ','))
         st.warning(f"⚡ Perda de calor sem isolante: {dados['perda_sem_kw']:.3f} kW/m²".replace('.', ','))
+        if dados.get('perda_com_kw_m') is not None:
+            st.info(f"📏 Por metro de tubo: {dados['perda_com_kw_m'] * 1000:.1f} W/m com isolante, "
+                    f"{dados['perda_sem_kw_m'] * 1000:.1f} W/m sem isolante".replace('.', ','))
         
         if dados.get('calculo_financeiro', False):
             st.subheader("Retorno Financeiro e Ambiental")
@@ -473,8 +390,55 @@ with abas[0]:
             
 
         st.markdown("---")
-        pdf_bytes = gerar_pdf(dados)
-        st.download_button(label="Download Relatório PDF", data=pdf_bytes, file_name=f"Relatorio_IsolaFacil_{datetime.now().strftime('%Y%m%d')}.pdf", mime="application/pdf", key="pdf_quente")
+        botao_relatorio_pdf(gerar_pdf_em_cache, dados, "pdf_quente_solicitado", file_name=f"Relatorio_IsolaFacil_{datetime.now().strftime('%Y%m%d')}.pdf", key="pdf_quente")
+
+    st.markdown("---")
+    with st.expander("📈 Análise de sensibilidade"):
+        if numero_camadas > 1:
+            st.info("A análise de sensibilidade está disponível para isolamento de camada única.")
+        else:
+            st.caption("Curvas de temperatura da face fria e perda de calor variando uma entrada; as demais ficam como acima. "
+                       "Pontos já calculados são reaproveitados ao ampliar a faixa ou refinar o passo.")
+            variaveis_padrao = {"espessura_m": (10.0, 200.0, 5.0), "To": (0.0, 45.0, 1.0), "vento_ms": (0.0, 10.0, 0.5)}
+            col_sens1, col_sens2, col_sens3, col_sens4 = st.columns(4)
+            variavel_sens = col_sens1.selectbox("Variável", list(VARIAVEIS), format_func=lambda v: VARIAVEIS[v][0], key="var_sens")
+            nome_sens, unidade_sens, escala_sens = VARIAVEIS[variavel_sens]
+            inicio_padrao, fim_padrao, passo_padrao = variaveis_padrao[variavel_sens]
+            inicio_sens = col_sens2.number_input(f"De [{unidade_sens}]", value=inicio_padrao, key=f"inicio_sens_{variavel_sens}")
+            fim_sens = col_sens3.number_input(f"Até [{unidade_sens}]", value=fim_padrao, key=f"fim_sens_{variavel_sens}")
+            passo_sens = col_sens4.number_input(f"Passo [{unidade_sens}]", min_value=0.01, value=passo_padrao, key=f"passo_sens_{variavel_sens}")
+            rotulo_sens = f"{nome_sens} [{unidade_sens}]"
+            valores_sens = faixa(inicio_sens, fim_sens, passo_sens)
+
+            gerar_curvas = st.button("Gerar Curvas", key="btn_sens", disabled=not 2 <= len(valores_sens) <= 1000)
+            grafico_tf, grafico_q = st.empty(), st.empty()
+            if gerar_curvas:
+                st.session_state.sensibilidade = None
+                if not isolante_selecionado.aceita(Tq):
+                    st.error(f"Material inadequado para {Tq}°C.")
+                elif variavel_sens != "To" and Tq <= To:
+                    st.error("Erro: A temperatura da face quente deve ser maior do que a temperatura ambiente.")
+                else:
+                    caso_sens = CasoBase(Tq, To, L_total / 1000, k_func_str, geometry, emissividade_selecionada,
+                                         pipe_diameter_mm / 1000 if geometry == "Tubulação" else None)
+                    pontos_sens, ultimo_desenho = [], 0.0
+                    for ponto in get_curvas_sensibilidade().calcular(caso_sens, variavel_sens, [v * escala_sens for v in valores_sens]):
+                        pontos_sens.append({"x": ponto.valor / escala_sens, "tf": ponto.Tf, "convergiu": ponto.convergiu,
+                                            "perda_kw": ponto.q / 1000 if ponto.convergiu else None, "novo": ponto.avaliacoes > 0})
+                        # Redesenha no máximo a cada 0,2 s enquanto os pontos chegam.
+                        if time.perf_counter() - ultimo_desenho > 0.2:
+                            desenhar_sensibilidade(grafico_tf, grafico_q, pontos_sens, rotulo_sens)
+                            ultimo_desenho = time.perf_counter()
+                    st.session_state.sensibilidade = {"variavel": variavel_sens, "rotulo": rotulo_sens, "pontos": pontos_sens}
+
+            sensibilidade = st.session_state.get("sensibilidade")
+            if sensibilidade and sensibilidade["variavel"] == variavel_sens:
+                desenhar_sensibilidade(grafico_tf, grafico_q, sensibilidade["pontos"], sensibilidade["rotulo"])
+                novos = sum(p["novo"] for p in sensibilidade["pontos"])
+                falhas = sum(not p["convergiu"] for p in sensibilidade["pontos"])
+                st.caption(f"{len(sensibilidade['pontos'])} pontos, {novos} calculados agora e "
+                           f"{len(sensibilidade['pontos']) - novos} reaproveitados."
+                           + (f" {falhas} pontos sem convergência foram omitidos." if falhas else ""))
 
     st.markdown("---")
     st.markdown("""
@@ -486,12 +450,13 @@ with abas[1]:
     
     col1, col2 = st.columns(2)
     with col1:
-        material_frio_nome = st.selectbox("Escolha o material do isolante", df_isolantes['nome'].tolist(), key="mat_frio")
+        opcoes_frio = isolantes.validos_para(st.session_state.get("Ti_frio", 5.0)) or isolantes.nomes
+        material_frio_nome = st.selectbox("Escolha o material do isolante", opcoes_frio, key="mat_frio")
     with col2:
         geometry_frio = st.selectbox("Tipo de Superfície", ["Superfície Plana", "Tubulação"], key="geom_frio")
 
-    isolante_frio_selecionado = df_isolantes[df_isolantes['nome'] == material_frio_nome].iloc[0]
-    k_func_str_frio = isolante_frio_selecionado['k_func']
+    isolante_frio_selecionado = isolantes[material_frio_nome]
+    k_func_str_frio = isolante_frio_selecionado.k_func_str
 
     pipe_diameter_mm_frio = 0
     if geometry_frio == "Tubulação":
@@ -506,56 +471,269 @@ with abas[1]:
     if wind_speed == 0:
         st.info("💡 Com velocidade do vento igual a 0 m/s, o cálculo considera convecção natural.")
 
+    arredondar_comercial = st.checkbox("Arredondar para espessura comercial", key="arredondar_frio")
+    espessuras_comerciais_mm = []
+    if arredondar_comercial:
+        texto_comerciais = st.text_input("Espessuras comerciais disponíveis [mm]", value="9, 13, 19, 25, 32, 40, 50, 63, 76, 100", key="comerciais_frio")
+        try:
+            espessuras_comerciais_mm = [float(e) for e in texto_comerciais.replace(';', ' ').replace(',', ' ').split()]
+        except ValueError:
+            st.error("Informe as espessuras comerciais como números separados por vírgula.")
+
     if st.button("Calcular Espessura Mínima", key="btn_frio"):
         st.session_state.calculo_frio_realizado = False
-        if not (isolante_frio_selecionado['T_min'] <= Ti_frio <= isolante_frio_selecionado['T_max']):
-            st.error(f"Material inadequado! A temperatura de operação ({Ti_frio}°C) está fora dos limites para '{material_frio_nome}' (Mín: {isolante_frio_selecionado['T_min']}°C, Máx: {isolante_frio_selecionado['T_max']}°C).")
+        if not isolante_frio_selecionado.aceita(Ti_frio):
+            st.error(f"Material inadequado! A temperatura de operação ({Ti_frio}°C) está fora dos limites para '{material_frio_nome}' (Mín: {isolante_frio_selecionado.T_min}°C, Máx: {isolante_frio_selecionado.T_max}°C).")
         elif Ta_frio <= Ti_frio:
             st.error("Erro: A temperatura ambiente deve ser maior que a temperatura interna para o cálculo de condensação.")
         else:
             with st.spinner("Iterando para encontrar espessura..."):
-                a_mag, b_mag = 17.27, 237.7
-                alfa = ((a_mag * Ta_frio) / (b_mag + Ta_frio)) + math.log(UR / 100.0)
-                T_orvalho = (b_mag * alfa) / (a_mag - alfa)
+                T_orvalho = temperatura_orvalho(Ta_frio, UR)
                 st.info(f"💧 Temperatura de orvalho calculada: {T_orvalho:.1f} °C")
 
-                espessura_final = None
-                for L_teste in [i * 0.001 for i in range(1, 501)]:
-                    Tf, _, convergiu = encontrar_temperatura_face_fria(
-                        Ti_frio, Ta_frio, L_teste, k_func_str_frio, 
-                        geometry_frio, 0.9, pipe_diameter_mm_frio / 1000, wind_speed_ms=wind_speed
-                    )
-                    if convergiu and Tf >= T_orvalho:
-                        espessura_final = L_teste
-                        break
-
-                if espessura_final:
+                espessuras_comerciais = [e / 1000 for e in espessuras_comerciais_mm] if arredondar_comercial else None
+                resultado_espessura = espessura_minima(
+                    Ti_frio, Ta_frio, T_orvalho, k_func_str_frio,
+                    geometry_frio, 0.9, pipe_diameter_mm_frio / 1000, wind_speed_ms=wind_speed,
+                    espessuras_comerciais=espessuras_comerciais
+                )
+
+                if resultado_espessura.encontrada:
+                    espessura_final = resultado_espessura.espessura
                     st.success(f"✅ Espessura mínima para Minimizar condensação: {espessura_final * 1000:.1f} mm".replace('.',','))
+                    espessura_comercial_mm = None
+                    if arredondar_comercial:
+                        if resultado_espessura.espessura_comercial is not None:
+                            espessura_comercial_mm = resultado_espessura.espessura_comercial * 1000
+                            st.success(f"📏 Espessura comercial recomendada: {espessura_comercial_mm:.1f} mm".replace('.',','))
+                        else:
+                            st.warning("Nenhuma espessura comercial da lista atende à espessura mínima calculada.")
+                    st.caption(f"Espessura obtida com {resultado_espessura.solucoes} cálculos da face fria.")
                     st.session_state.calculo_frio_realizado = True
                     dados_para_relatorio_frio = {
                         "material": material_frio_nome, "geometria": geometry_frio, "diametro_tubo": pipe_diameter_mm_frio,
                         "ti": Ti_frio, "ta": Ta_frio, "ur": UR, "vento": wind_speed,
-                        "t_orvalho": T_orvalho, "espessura_final": espessura_final * 1000
+                        "t_orvalho": T_orvalho, "espessura_final": espessura_final * 1000,
+                        "espessura_comercial": espessura_comercial_mm, "data_simulacao": datetime.now().strftime("%d/%m/%Y")
                     }
                     st.session_state.dados_ultima_simulacao_frio = dados_para_relatorio_frio
+                    registrar_simulacao("frio", dados_para_relatorio_frio)
+                    st.session_state.pdf_frio_solicitado = False
                 else:
                     st.session_state.calculo_frio_realizado = False
-                    st.error("❌ Não foi possível encontrar uma espessura que evite condensação até 500 mm.")
+                    st.error(f"❌ Não foi possível encontrar uma espessura que evite condensação: {resultado_espessura.status}.")
     
     if st.session_state.get('calculo_frio_realizado', False):
         st.markdown("---")
-        pdf_bytes_frio = gerar_pdf_frio(st.session_state.dados_ultima_simulacao_frio)
-        st.download_button(
-            label="Download Relatório PDF",
-            data=pdf_bytes_frio,
+        botao_relatorio_pdf(
+            gerar_pdf_frio_em_cache,
+            st.session_state.dados_ultima_simulacao_frio,
+            "pdf_frio_solicitado",
             file_name=f"Relatorio_Condensacao_{datetime.now().strftime('%Y%m%d')}.pdf",
-            mime="application/pdf",
             key="btn_pdf_frio"
         )
 
+    st.markdown("---")
+    with st.expander("🗺️ Mapa de risco de condensação"):
+        st.caption("Espessura mínima para cada combinação de temperatura ambiente, umidade relativa e temperatura interna, "
+                   "com o material, a superfície e o vento informados acima. O envelope de projeto é a espessura que "
+                   "atende ao percentil escolhido das combinações de clima.")
+        col_mapa1, col_mapa2, col_mapa3 = st.columns(3)
+        ta_inicio = col_mapa1.number_input("Temp. ambiente de [°C]", value=15.0, key="ta_inicio_mapa")
+        ta_fim = col_mapa2.number_input("até [°C]", value=40.0, key="ta_fim_mapa")
+        ta_passo = col_mapa3.number_input("passo [°C]", min_value=0.1, value=0.5, key="ta_passo_mapa")
+        ur_inicio = col_mapa1.number_input("Umidade relativa de [%]", 1.0, 100.0, 50.0, key="ur_inicio_mapa")
+        ur_fim = col_mapa2.number_input("até [%]", 1.0, 100.0, 95.0, key="ur_fim_mapa")
+        ur_passo = col_mapa3.number_input("passo [%]", min_value=0.1, value=1.0, key="ur_passo_mapa")
+        texto_ti_mapa = col_mapa1.text_input("Temperaturas internas [°C]", value=f"{Ti_frio:g}", key="ti_mapa")
+        percentil_mapa = col_mapa2.number_input("Percentil do envelope [%]", 50.0, 100.0, 95.0, step=1.0, key="percentil_mapa")
+        try:
+            ti_mapa = sorted({float(t) for t in texto_ti_mapa.replace(';', ' ').replace(',', ' ').split()})
+        except ValueError:
+            ti_mapa = []
+            st.error("Informe as temperaturas internas como números separados por vírgula.")
+        ta_mapa, ur_mapa = faixa(ta_inicio, ta_fim, ta_passo), faixa(ur_inicio, ur_fim, ur_passo)
+        celulas_mapa = len(ti_mapa) * len(ta_mapa) * len(ur_mapa)
+        st.caption(f"{len(ta_mapa)} × {len(ur_mapa)} climas × {len(ti_mapa)} temperaturas internas = {celulas_mapa} combinações.")
+
+        if st.button("Gerar Mapa", key="btn_mapa", disabled=not 0 < celulas_mapa <= 100_000):
+            st.session_state.mapa_condensacao = None
+            fora_dos_limites = [t for t in ti_mapa if not isolante_frio_selecionado.aceita(t)]
+            if fora_dos_limites:
+                st.error(f"Material inadequado para {', '.join(f'{t:g}' for t in fora_dos_limites)} °C (Mín: {isolante_frio_selecionado.T_min}°C, Máx: {isolante_frio_selecionado.T_max}°C).")
+            else:
+                with st.spinner("Calculando mapa..."):
+                    st.session_state.mapa_condensacao = mapa_condensacao(
+                        ti_mapa, ta_mapa, ur_mapa, k_func_str_frio, geometry_frio, 0.9,
+                        pipe_diameter_mm_frio / 1000 if geometry_frio == "Tubulação" else None, wind_speed)
+
+        mapa = st.session_state.get("mapa_condensacao")
+        if mapa is not None:
+            envelope = mapa.envelope(percentil_mapa)
+            linhas_envelope = []
+            for Ti_mapa, esp in zip(mapa.Ti, envelope):
+                linha = {"Temperatura interna [°C]": Ti_mapa, f"Envelope P{percentil_mapa:g} [mm]": esp * 1000}
+                if arredondar_comercial and espessuras_comerciais_mm:
+                    # Envelope NaN: nenhuma espessura atende, então não há comercial a recomendar.
+                    linha["Comercial [mm]"] = espessura_comercial(esp * 1000, espessuras_comerciais_mm) if math.isfinite(esp) else None
+                linhas_envelope.append(linha)
+            st.dataframe(linhas_envelope, hide_index=True)
+            if any(math.isnan(e) for e in envelope):
+                st.warning("Em alguma temperatura interna, nem 500 mm evitam a condensação no percentil escolhido.")
+
+            import altair as alt
+            tabela_mapa = mapa.tabela()
+            ti_grafico = st.selectbox("Temperatura interna do mapa [°C]", mapa.Ti, key="ti_grafico_mapa") if len(mapa.Ti) > 1 else mapa.Ti[0]
+            st.altair_chart(alt.Chart(tabela_mapa[tabela_mapa["ti"] == ti_grafico]).mark_rect().encode(
+                x=alt.X("ta:O", title="Temperatura ambiente [°C]", axis=alt.Axis(labelOverlap=True)),
+                y=alt.Y("ur:O", title="Umidade relativa [%]", sort="descending", axis=alt.Axis(labelOverlap=True)),
+                color=alt.Color("espessura_mm:Q", title="Espessura [mm]", scale=alt.Scale(scheme="blues")),
+                tooltip=["ta", "ur", alt.Tooltip("t_orvalho:Q", format=".1f"), alt.Tooltip("espessura_mm:Q", format=".1f")],
+            ), use_container_width=True)
+            st.caption(f"{len(tabela_mapa)} combinações resolvidas com {mapa.solucoes} cálculos da face fria. "
+                       "Células em branco: nem 500 mm evitam a condensação; 0 mm: sem risco mesmo sem isolante.")
+            st.download_button("Download Mapa (CSV)", data=tabela_mapa.to_csv(index=False).encode("utf-8"),
+                               file_name="mapa_condensacao.csv", mime="text/csv", key="csv_mapa")
+
+with abas[2]:
+    st.subheader("Cálculo em Lote a partir de Planilha")
+    st.caption(f"Envie um arquivo CSV ou Excel com as colunas: {', '.join(COLUNAS)} "
+               "(opcionais: area_m2 das superfícies planas, comprimento_m das tubulações, vento_ms). "
+               "Geometria: 'Superfície Plana' ou 'Tubulação', esta com perda por metro de tubo; "
+               "material e acabamento com os nomes do catálogo.")
+    arquivo_lote = st.file_uploader("Planilha de itens", type=["csv", "xlsx", "xlsm"], key="arquivo_lote")
+    if arquivo_lote is not None and numero_processos() > 1:
+        aquecer_pool()
+
+    calcular_financeiro_lote = st.checkbox("Incluir retorno financeiro e ambiental", key="fin_lote")
+    financeiro_lote = None
+    if calcular_financeiro_lote:
+        col_lote1, col_lote2, col_lote3, col_lote4 = st.columns(4)
+        comb_lote_nome = col_lote1.selectbox("Tipo de combustível", list(COMBUSTIVEIS.keys()), key="comb_lote")
+        valor_comb_lote = col_lote2.number_input("Custo combustível (R$)", min_value=0.10, value=COMBUSTIVEIS[comb_lote_nome]['v'], step=0.01, format="%.2f", key="valor_comb_lote")
+        h_dia_lote = col_lote3.number_input("Horas de operação/dia", 1.0, 24.0, 8.0, key="h_dia_lote")
+        d_sem_lote = col_lote4.number_input("Dias de operação/semana", 1, 7, 5, key="d_sem_lote")
+        financeiro_lote = {"combustivel": COMBUSTIVEIS[comb_lote_nome], "valor_comb": valor_comb_lote, "h_dia": h_dia_lote, "d_sem": d_sem_lote}
+
+    if st.button("Processar Lote", key="btn_lote", disabled=arquivo_lote is None):
+        st.session_state.lote_processado = None
+        dados_arquivo = arquivo_lote.getvalue()
+        total_linhas = contar_linhas(BytesIO(dados_arquivo), arquivo_lote.name)
+        barra = st.progress(0.0, text="Processando itens...")
+
+        def atualizar_progresso(linhas):
+            fracao = min(linhas / total_linhas, 1.0) if total_linhas else 0.0
+            barra.progress(fracao, text=f"{linhas} itens processados" + (f" de {total_linhas}" if total_linhas else ""))
+
+        try:
+            relatorio_lote = RelatorioConsolidado(data_simulacao=datetime.now().strftime("%d/%m/%Y"))
+            csv_lote, resumo_lote = processar_para_bytes(dados_arquivo, arquivo_lote.name, isolantes, acabamentos,
+                                                         relatorio_lote, financeiro_lote, progresso=atualizar_progresso,
+                                                         paralelo=numero_processos() > 1)
+            with st.spinner("Gerando relatório consolidado..."):
+                pdf_lote = relatorio_lote.concluir(resumo_lote)
+            st.session_state.lote_processado = {"csv": csv_lote, "pdf": pdf_lote, "resumo": resumo_lote}
+        except ArquivoLoteInvalido as ex:
+            st.error(f"❌ Arquivo inválido: {ex}.")
+        finally:
+            barra.empty()
+
+    lote = st.session_state.get("lote_processado")
+    if lote:
+        resumo_lote = lote["resumo"]
+        l1, l2, l3 = st.columns(3)
+        l1.metric("Itens calculados", f"{resumo_lote['calculadas']} de {resumo_lote['linhas']}")
+        l2.metric("Redução de perda", f"{resumo_lote['perda_sem_kw'] - resumo_lote['perda_com_kw']:,.1f} kW".replace(',', 'X').replace('.', ',').replace('X', '.'))
+        if resumo_lote['calculo_financeiro']:
+            l3.metric("Economia anual", f"R$ {resumo_lote['eco_anual']:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'))
+        if resumo_lote['com_erro']:
+            st.warning(f"{resumo_lote['com_erro']} itens não foram calculados; veja a coluna 'status' do CSV.")
+        col_dl1, col_dl2 = st.columns(2)
+        col_dl1.download_button("Download Resultados CSV", data=lote["csv"], mime="text/csv",
+                                file_name=f"Resultados_Lote_{datetime.now().strftime('%Y%m%d')}.csv", key="csv_lote")
+        col_dl2.download_button("Download Relatório Consolidado PDF", data=lote["pdf"], mime="application/pdf",
+                                file_name=f"Relatorio_Lote_IsolaFacil_{datetime.now().strftime('%Y%m%d')}.pdf", key="pdf_lote")
+
+with abas[3]:
+    st.subheader("Balanço de Energia de uma Lista de Linhas")
+    st.caption("Um trecho de tubulação por linha. A perda é calculada por metro de tubo e multiplicada pelo comprimento; "
+               "trechos com a mesma especificação (diâmetro, temperaturas, material, acabamento e espessura) são "
+               "resolvidos uma única vez.")
+    arquivo_linhas = st.file_uploader(f"Importar CSV (colunas: {', '.join(COLUNAS_LINHAS)})", type=["csv"], key="arquivo_linhas")
+    if arquivo_linhas is not None:
+        import pandas as pd
+        trechos_iniciais = pd.read_csv(arquivo_linhas, sep=None, engine="python", encoding="utf-8-sig", decimal=",")
+    else:
+        material_padrao = isolantes.validos_para(250.0)[0] if isolantes.validos_para(250.0) else isolantes.nomes[0]
+        trechos_iniciais = [
+            {"tag": "L-001", "diametro_mm": 88.9, "comprimento_m": 120.0, "tq": 250.0, "to": 25.0,
+             "material": material_padrao, "acabamento": acabamentos.nomes[0], "espessura_mm": 51.0},
+            {"tag": "L-002", "diametro_mm": 60.3, "comprimento_m": 45.0, "tq": 180.0, "to": 25.0,
+             "material": material_padrao, "acabamento": acabamentos.nomes[0], "espessura_mm": 38.0},
+        ]
+    trechos_editados = st.data_editor(
+        trechos_iniciais, num_rows="dynamic", use_container_width=True, key="editor_linhas",
+        column_config={
+            "material": st.column_config.SelectboxColumn("material", options=isolantes.nomes),
+            "acabamento": st.column_config.SelectboxColumn("acabamento", options=acabamentos.nomes),
+            "diametro_mm": st.column_config.NumberColumn("diametro_mm", min_value=0.0, format="%.1f"),
+            "comprimento_m": st.column_config.NumberColumn("comprimento_m", min_value=0.0, format="%.1f"),
+        },
+    )
 
-
-
-
-
-
+    calcular_financeiro_linhas = st.checkbox("Incluir retorno financeiro e ambiental", key="fin_linhas")
+    financeiro_linhas = None
+    if calcular_financeiro_linhas:
+        col_lin1, col_lin2, col_lin3, col_lin4 = st.columns(4)
+        comb_linhas_nome = col_lin1.selectbox("Tipo de combustível", list(COMBUSTIVEIS.keys()), key="comb_linhas")
+        valor_comb_linhas = col_lin2.number_input("Custo combustível (R$)", min_value=0.10, value=COMBUSTIVEIS[comb_linhas_nome]['v'], step=0.01, format="%.2f", key="valor_comb_linhas")
+        h_dia_linhas = col_lin3.number_input("Horas de operação/dia", 1.0, 24.0, 24.0, key="h_dia_linhas")
+        d_sem_linhas = col_lin4.number_input("Dias de operação/semana", 1, 7, 7, key="d_sem_linhas")
+        financeiro_linhas = {"combustivel": COMBUSTIVEIS[comb_linhas_nome], "valor_comb": valor_comb_linhas, "h_dia": h_dia_linhas, "d_sem": d_sem_linhas}
+
+    if st.button("Calcular Linhas", key="btn_linhas"):
+        try:
+            with st.spinner("Calculando trechos..."):
+                st.session_state.linhas_resultado = avaliar_linhas(trechos_editados, isolantes, acabamentos, financeiro_linhas)
+        except ValueError as ex:
+            st.session_state.linhas_resultado = None
+            st.error(f"❌ Lista inválida: {ex}.")
+
+    resultado_linhas = st.session_state.get("linhas_resultado")
+    if resultado_linhas:
+        resumo_linhas = resultado_linhas.resumo
+        formatar = lambda valor, casas: f"{valor:,.{casas}f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+        k1, k2, k3, k4 = st.columns(4)
+        k1.metric("Trechos calculados", f"{resumo_linhas['calculados']} de {resumo_linhas['trechos']}",
+                  help=f"{resultado_linhas.especificacoes} especificações distintas resolvidas")
+        k2.metric("Comprimento total", f"{formatar(resumo_linhas['comprimento_m'], 1)} m")
+        k3.metric("Perda com isolante", f"{formatar(resumo_linhas['perda_com_kw'], 2)} kW",
+                  help=f"Sem isolante: {formatar(resumo_linhas['perda_sem_kw'], 2)} kW")
+        if resumo_linhas['calculo_financeiro']:
+            k4.metric("Economia anual", f"R$ {formatar(resumo_linhas['eco_anual'], 2)}",
+                      help=f"Carbono evitado: {formatar(resumo_linhas['co2_ton_ano'], 2)} tCO₂e/ano")
+        if resumo_linhas['com_erro']:
+            st.warning(f"{resumo_linhas['com_erro']} trechos não foram calculados; veja a coluna 'status'.")
+        st.dataframe(resultado_linhas.trechos, hide_index=True, use_container_width=True)
+        st.download_button("Download Resultados CSV",
+                           data=resultado_linhas.trechos.to_csv(index=False, sep=";").encode("utf-8-sig"),
+                           mime="text/csv", file_name=f"Lista_Linhas_{datetime.now().strftime('%Y%m%d')}.csv", key="csv_linhas")
+
+# --- DEPURAÇÃO ---
+# Aberto com ?debug=1 na URL ou com a variável de ambiente ISOLAFACIL_DEBUG.
+if st.query_params.get("debug") == "1" or os.environ.get("ISOLAFACIL_DEBUG"):
+    with st.expander("⏱️ Tempos da última execução (depuração)"):
+        st.caption(f"Execução completa: {rastro.duracao() * 1000:.0f} ms. Etapas aninhadas se sobrepõem "
+                   "(por exemplo, solver_face_fria dentro de espessura_minima); resultados em cache não aparecem.")
+        resumo_rastro = rastro.resumo()
+        if resumo_rastro:
+            st.dataframe(resumo_rastro, hide_index=True, use_container_width=True)
+        else:
+            st.write("Nenhuma etapa medida nesta execução.")
+        st.caption(f"Cache de resultados: {get_cache_resultados().estatisticas()}")
+        fila_simulacoes = get_fila_simulacoes()
+        if fila_simulacoes is not None:
+            st.caption(f"Auditoria: {fila_simulacoes.enviadas} simulações enviadas, {fila_simulacoes.pendentes()} no spool"
+                       + (f" (último erro: {fila_simulacoes.ultimo_erro})" if fila_simulacoes.ultimo_erro else ""))
+        st.download_button("Download Métricas (Prometheus)", data=texto_prometheus(), mime="text/plain",
+                           file_name="metricas_isolafacil.txt", key="metricas_debug")
@@ -0,0 +1,46 @@
+"""Núcleo de cálculo da Calculadora IsolaFácil.
+
+Pode ser usado sem o Streamlit (scripts, testes, ``isolafacil.api``). Os
+nomes abaixo são importados sob demanda, de modo que ``import isolafacil``
+não carrega NumPy, pandas nem fpdf.
+"""
+import importlib
+
+_EXPORTADOS = {
+    "calcular_h_conv": "transferencia",
+    "calcular_q_superficie": "transferencia",
+    "compilar_k": "condutividade",
+    "validar_k": "condutividade",
+    "FormulaKInvalida": "condutividade",
+    "resolver_face_fria": "solver",
+    "encontrar_temperatura_face_fria": "solver",
+    "ResultadoFaceFria": "solver",
+    "resolver_lote": "lote",
+    "resolver_multicamada": "multicamada",
+    "Camada": "multicamada",
+    "espessura_minima": "espessura",
+    "simular_transiente": "transiente",
+    "CamadaTransiente": "transiente",
+    "avaliar_linhas": "linhas",
+    "temperatura_orvalho": "psicrometria",
+    "COMBUSTIVEIS": "economia",
+    "calcular_retorno_financeiro": "economia",
+    "espessura_economica": "economia",
+    "montar_materiais": "materiais",
+    "montar_acabamentos": "materiais",
+}
+
+__all__ = sorted(_EXPORTADOS)
+
+
+def __getattr__(nome):
+    modulo = _EXPORTADOS.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f".{modulo}", __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
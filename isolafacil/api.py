@@ -0,0 +1,364 @@
+"""API HTTP (ASGI) para os cálculos, sem a interface do Streamlit.
+
+    uvicorn isolafacil.api:app --workers 4
+    python -m isolafacil.api [--host 0.0.0.0] [--port 8000]
+
+Rotas (JSON):
+
+    GET  /saude                  situação do serviço e do cache
+    POST /face-fria              um caso
+    POST /face-fria/lote         {"casos": [...]}, resolvidos de uma vez com NumPy
+    POST /orvalho                {"ta": ..., "ur": ...}
+    POST /espessura-minima       espessura que evita condensação
+    GET  /metricas               contadores e tempos, em texto no formato do Prometheus
+
+Um caso traz ``tq``, ``to`` e ``espessura_mm``; ``geometria`` ("Superfície
+Plana" ou "Tubulação", com ``diametro_mm``); a condutividade em ``k_func``
+ou o nome de um ``material`` do catálogo local; ``emissividade`` ou o nome
+de um ``acabamento`` (padrão 0,9); ``vento_ms`` opcional. Em tubulação a
+resposta traz também a perda por metro de tubo. Com o objeto opcional
+``financeiro`` ({"combustivel", "valor_comb", "area_m2" ou, em tubulação,
+"comprimento_m", "h_dia", "d_sem"}), a resposta inclui economia e carbono
+evitado.
+
+Cada resposta traz o cabeçalho ``Server-Timing`` com o tempo de cada etapa
+da requisição (solver, catálogo...).
+
+Não depende de nenhum framework: o módulo expõe um callable ASGI simples.
+"""
+import asyncio
+import json
+import math
+import os
+
+from . import metricas
+from .cache_resultados import CacheResultados
+from .catalogo import CAMINHO_PADRAO
+from .condutividade import FormulaKInvalida, validar_k
+
+TAMANHO_MAXIMO_CORPO = 10 * 1024 * 1024   # bytes
+MAXIMO_CASOS_LOTE = 100_000
+
+_cache = CacheResultados()
+_registros = {}
+
+
+class ErroRequisicao(ValueError):
+    def __init__(self, mensagem, status=400):
+        super().__init__(mensagem)
+        self.status = status
+
+
+# --- CATÁLOGO ---
+def _catalogo():
+    """Registros de materiais e acabamentos da cópia local, remontados só quando a revisão muda."""
+    from .catalogo import CatalogoLocal
+    from .materiais import montar_acabamentos, montar_materiais
+
+    if "catalogo" not in _registros:
+        _registros["catalogo"] = CatalogoLocal(None, os.environ.get("ISOLAFACIL_CATALOGO_DB", CAMINHO_PADRAO))
+    catalogo = _registros["catalogo"]
+    revisao = (catalogo.revisao("Isolantes 2"), catalogo.revisao("Emissividade"))
+    if _registros.get("revisao") != revisao:
+        isolantes, _ = montar_materiais(catalogo.registros("Isolantes 2") or [])
+        acabamentos = montar_acabamentos(catalogo.registros("Emissividade") or [])
+        _registros.update(revisao=revisao, isolantes=isolantes, acabamentos=acabamentos)
+    return _registros["isolantes"], _registros["acabamentos"]
+
+
+# --- LEITURA DOS CASOS ---
+def _numero(caso, campo, padrao=None):
+    valor = caso.get(campo, padrao)
+    if valor is None:
+        raise ErroRequisicao(f"campo obrigatório ausente: {campo}")
+    try:
+        numero = float(str(valor).replace(",", ".")) if isinstance(valor, str) else float(valor)
+    except (TypeError, ValueError):
+        raise ErroRequisicao(f"campo '{campo}' deve ser numérico") from None
+    if not math.isfinite(numero):
+        raise ErroRequisicao(f"campo '{campo}' deve ser finito")
+    return numero
+
+
+def _texto(caso, campo):
+    valor = caso[campo]
+    if not isinstance(valor, str):
+        raise ErroRequisicao(f"campo '{campo}' deve ser texto")
+    return valor
+
+
+def _lista_numeros(corpo, campo):
+    valores = corpo.get(campo)
+    if valores is None:
+        return None
+    if not isinstance(valores, list):
+        raise ErroRequisicao(f"campo '{campo}' deve ser uma lista de números")
+    return [_numero({campo: valor}, campo) for valor in valores]
+
+
+def _ler_caso(caso):
+    if not isinstance(caso, dict):
+        raise ErroRequisicao("cada caso deve ser um objeto JSON")
+    geometria = caso.get("geometria", "Superfície Plana")
+    if geometria not in ("Superfície Plana", "Tubulação"):
+        raise ErroRequisicao("geometria deve ser 'Superfície Plana' ou 'Tubulação'")
+
+    Tq, To = _numero(caso, "tq"), _numero(caso, "to")
+    espessura_mm = _numero(caso, "espessura_mm")
+    if espessura_mm <= 0:
+        raise ErroRequisicao("espessura_mm deve ser maior que zero")
+    diametro_m = None
+    if geometria == "Tubulação":
+        diametro_mm = _numero(caso, "diametro_mm")
+        if diametro_mm <= 0:
+            raise ErroRequisicao("diametro_mm deve ser maior que zero")
+        diametro_m = diametro_mm / 1000
+
+    if caso.get("k_func") is not None:
+        k_func = _texto(caso, "k_func")
+        # k positivo e finito em toda a faixa de temperaturas médias do caso, entre To e Tq.
+        try:
+            validar_k(k_func, min(Tq, To), max(Tq, To))
+        except FormulaKInvalida as ex:
+            raise ErroRequisicao(f"fórmula k(T) inválida: {ex}") from None
+    elif "material" in caso:
+        material = _texto(caso, "material")
+        isolantes, _ = _catalogo()
+        if material not in isolantes:
+            raise ErroRequisicao(f"material desconhecido: {material}", 404)
+        k_func = isolantes[material].k_func_str
+    else:
+        raise ErroRequisicao("informe 'k_func' ou 'material'")
+
+    if "emissividade" in caso:
+        emissividade = _numero(caso, "emissividade")
+        if not 0 < emissividade <= 1:
+            raise ErroRequisicao("emissividade deve estar entre 0 e 1")
+    elif "acabamento" in caso:
+        acabamento = _texto(caso, "acabamento")
+        _, acabamentos = _catalogo()
+        if acabamento not in acabamentos:
+            raise ErroRequisicao(f"acabamento desconhecido: {acabamento}", 404)
+        emissividade = acabamentos[acabamento].emissividade
+    else:
+        emissividade = 0.9
+
+    return {
+        "Tq": Tq, "To": To, "L_total": espessura_mm / 1000, "k_func_str": k_func,
+        "geometry": geometria, "emissividade": emissividade, "pipe_diameter_m": diametro_m,
+        "wind_speed_ms": _numero(caso, "vento_ms", 0),
+    }
+
+
+def _financeiro(dados, geometria, perda_sem_kw, perda_com_kw):
+    """Retorno financeiro; em tubulação as perdas são em kW/m de tubo e a extensão é ``comprimento_m``."""
+    from .economia import COMBUSTIVEIS, calcular_retorno_financeiro
+
+    if not isinstance(dados, dict) or dados.get("combustivel") not in COMBUSTIVEIS:
+        raise ErroRequisicao(f"financeiro.combustivel deve ser um de: {', '.join(COMBUSTIVEIS)}")
+    if geometria == "Tubulação":
+        if "area_m2" in dados:
+            raise ErroRequisicao("em tubulação informe financeiro.comprimento_m: a perda é por metro de tubo")
+        extensao = _numero(dados, "comprimento_m", 1.0)
+    else:
+        extensao = _numero(dados, "area_m2", 1.0)
+    combustivel = COMBUSTIVEIS[dados["combustivel"]]
+    return calcular_retorno_financeiro(
+        perda_sem_kw, perda_com_kw, combustivel, _numero(dados, "valor_comb", combustivel["v"]),
+        extensao, _numero(dados, "h_dia", 8.0), _numero(dados, "d_sem", 5))
+
+
+# --- ROTAS ---
+def _face_fria(corpo):
+    from .transferencia import calcular_q_superficie
+
+    caso = _ler_caso(corpo)
+    resultado = _cache.resolver(**caso)
+    resposta = {"convergiu": resultado.convergiu, "status": resultado.status,
+                "tf": resultado.Tf, "perda_com_kw": None, "perda_sem_kw": None}
+    if resultado.convergiu:
+        perda_sem_kw = calcular_q_superficie(caso["Tq"], caso["To"], caso["geometry"], caso["emissividade"],
+                                             caso["pipe_diameter_m"], caso["wind_speed_ms"]) / 1000
+        perda_com_kw = resultado.q / 1000
+        resposta.update(perda_com_kw=perda_com_kw, perda_sem_kw=perda_sem_kw)
+        if caso["geometry"] == "Tubulação":
+            # kW/m de tubo: fluxo na face externa do isolante (com) ou na parede do tubo (sem).
+            D = caso["pipe_diameter_m"]
+            perda_com_kw = perda_com_kw * math.pi * (D + 2 * caso["L_total"])
+            perda_sem_kw = perda_sem_kw * math.pi * D
+            resposta.update(perda_com_kw_m=perda_com_kw, perda_sem_kw_m=perda_sem_kw)
+        if corpo.get("financeiro") is not None:
+            resposta["financeiro"] = _financeiro(corpo["financeiro"], caso["geometry"], perda_sem_kw, perda_com_kw)
+    return resposta
+
+
+def _face_fria_lote(corpo):
+    from .lote import resolver_lote
+
+    casos = corpo.get("casos") if isinstance(corpo, dict) else None
+    if not isinstance(casos, list) or not casos:
+        raise ErroRequisicao("envie {'casos': [...]} com ao menos um caso")
+    if len(casos) > MAXIMO_CASOS_LOTE:
+        raise ErroRequisicao(f"no máximo {MAXIMO_CASOS_LOTE} casos por requisição", 413)
+    lidos = []
+    for i, caso in enumerate(casos):
+        try:
+            lidos.append(_ler_caso(caso))
+        except ErroRequisicao as ex:
+            raise ErroRequisicao(f"caso {i}: {ex}", ex.status) from None
+    colunas = {campo: [caso[campo] for caso in lidos] for campo in lidos[0]}
+    resultado = resolver_lote(colunas["Tq"], colunas["To"], colunas["L_total"], colunas["geometry"],
+                              colunas["emissividade"], colunas["k_func_str"],
+                              [d or 0.0 for d in colunas["pipe_diameter_m"]], colunas["wind_speed_ms"])
+    resultado = resultado.astype(object).where(resultado.notna(), None)
+    return {"resultados": resultado.to_dict("records")}
+
+
+def _orvalho(corpo):
+    from .psicrometria import temperatura_orvalho
+
+    UR = _numero(corpo, "ur")
+    if not 0 < UR <= 100:
+        raise ErroRequisicao("ur deve estar entre 0 e 100 %")
+    return {"t_orvalho": temperatura_orvalho(_numero(corpo, "ta"), UR)}
+
+
+def _espessura_minima(corpo):
+    from .espessura import espessura_minima
+    from .psicrometria import temperatura_orvalho
+
+    caso = _ler_caso({**corpo, "tq": corpo.get("ti"), "to": corpo.get("ta"), "espessura_mm": 1})
+    UR = _numero(corpo, "ur")
+    if not 0 < UR <= 100:
+        raise ErroRequisicao("ur deve estar entre 0 e 100 %")
+    comerciais = _lista_numeros(corpo, "espessuras_comerciais_mm")
+    T_orvalho = temperatura_orvalho(caso["To"], UR)
+    resultado = espessura_minima(caso["Tq"], caso["To"], T_orvalho, caso["k_func_str"], caso["geometry"],
+                                 caso["emissividade"], caso["pipe_diameter_m"], caso["wind_speed_ms"],
+                                 espessuras_comerciais=[e / 1000 for e in comerciais] if comerciais else None)
+    return {
+        "encontrada": resultado.encontrada, "status": resultado.status, "t_orvalho": T_orvalho,
+        "espessura_mm": resultado.espessura * 1000 if resultado.espessura is not None else None,
+        "espessura_comercial_mm": resultado.espessura_comercial * 1000 if resultado.espessura_comercial is not None else None,
+        "tf": resultado.Tf,
+    }
+
+
+def _saude(_):
+    return {"situacao": "ok", "cache": _cache.estatisticas()}
+
+
+def _metricas(_):
+    return metricas.texto_prometheus()
+
+
+ROTAS = {
+    ("GET", "/saude"): _saude,
+    ("POST", "/face-fria"): _face_fria,
+    ("POST", "/face-fria/lote"): _face_fria_lote,
+    ("POST", "/orvalho"): _orvalho,
+    ("POST", "/espessura-minima"): _espessura_minima,
+    ("GET", "/metricas"): _metricas,
+}
+
+
+# --- ASGI ---
+async def _ler_corpo(receive):
+    partes, tamanho = [], 0
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "http.disconnect":
+            return None
+        parte = mensagem.get("body", b"")
+        tamanho += len(parte)
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroRequisicao("corpo da requisição muito grande", 413)
+        partes.append(parte)
+        if not mensagem.get("more_body", False):
+            return b"".join(partes)
+
+
+def _server_timing(rastro):
+    etapas = [f"{linha['etapa']};dur={linha['total_ms']:.2f}" for linha in rastro.resumo()]
+    return ", ".join(etapas + [f"total;dur={rastro.duracao() * 1000:.2f}"]).encode()
+
+
+async def _responder(send, status, dados, rastro=None):
+    if isinstance(dados, str):
+        corpo, tipo = dados.encode("utf-8"), b"text/plain; version=0.0.4; charset=utf-8"
+    else:
+        corpo, tipo = json.dumps(dados, ensure_ascii=False, allow_nan=False).encode("utf-8"), b"application/json; charset=utf-8"
+    cabecalhos = [(b"content-type", tipo), (b"content-length", str(len(corpo)).encode())]
+    if rastro is not None:
+        cabecalhos.append((b"server-timing", _server_timing(rastro)))
+        metricas.registrar("api_requisicao", rastro.duracao(), status=str(status))
+    await send({"type": "http.response.start", "status": status, "headers": cabecalhos})
+    await send({"type": "http.response.body", "body": corpo})
+
+
+async def _ciclo_de_vida(receive, send):
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif mensagem["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _ciclo_de_vida(receive, send)
+    if scope["type"] != "http":
+        return
+
+    caminho = scope["path"].rstrip("/") or "/"
+    rota = ROTAS.get((scope["method"], caminho))
+    if rota is None:
+        if any(c == caminho for _, c in ROTAS):
+            return await _responder(send, 405, {"erro": "método não permitido"})
+        return await _responder(send, 404, {"erro": "rota não encontrada"})
+
+    # asyncio.to_thread copia o contexto, então os eventos do cálculo chegam a este rastro.
+    rastro = metricas.iniciar_rastro(caminho)
+    try:
+        corpo = await _ler_corpo(receive)
+        if corpo is None:
+            return
+        try:
+            dados = json.loads(corpo) if corpo.strip() else {}
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ErroRequisicao("corpo deve ser JSON válido") from None
+        if not isinstance(dados, dict):
+            raise ErroRequisicao("corpo deve ser um objeto JSON")
+        # O cálculo roda numa thread para não bloquear o laço de eventos.
+        resposta = await asyncio.to_thread(rota, dados)
+    except ErroRequisicao as ex:
+        return await _responder(send, ex.status, {"erro": str(ex)}, rastro)
+    await _responder(send, 200, _sem_nan(resposta), rastro)
+
+
+def _sem_nan(valor):
+    # JSON não tem NaN/Infinity; valores não finitos viram null.
+    if isinstance(valor, float):
+        return valor if math.isfinite(valor) else None
+    if isinstance(valor, dict):
+        return {chave: _sem_nan(v) for chave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_sem_nan(v) for v in valor]
+    if hasattr(valor, "item"):  # escalares NumPy
+        return _sem_nan(valor.item())
+    return valor
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="API HTTP da Calculadora IsolaFácil")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    argumentos = parser.parse_args()
+    uvicorn.run("isolafacil.api:app", host=argumentos.host, port=argumentos.port, workers=argumentos.workers)
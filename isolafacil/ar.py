@@ -0,0 +1,112 @@
+"""Propriedades do ar seco a 1 atm em função da temperatura de filme.
+
+Os valores de referência (Incropera, Tabela A.4) são interpolados uma única
+vez em uma grade de 1 K, sobre a qual também são pré-calculados os grupos
+usados nas correlações de convecção: g·β/(ν·α), Pr^(1/3) e o denominador de
+Churchill-Chu [1 + (0,559/Pr)^(9/16)]^(8/27). Cada consulta é então uma
+interpolação linear entre dois pontos vizinhos da grade, para um valor
+escalar ou para um array NumPy. Fora da faixa da tabela os valores são os
+do extremo mais próximo.
+"""
+import math
+
+G = 9.81  # m/s²
+
+# T [K], ν [1e-6 m²/s], k [1e-3 W/m.K], α [1e-6 m²/s], Pr
+_REFERENCIA = (
+    (150, 4.426, 13.8, 5.84, 0.758),
+    (200, 7.590, 18.1, 10.3, 0.737),
+    (250, 11.44, 22.3, 15.9, 0.720),
+    (300, 15.89, 26.3, 22.5, 0.707),
+    (350, 20.92, 30.0, 29.9, 0.700),
+    (400, 26.41, 33.8, 38.3, 0.690),
+    (450, 32.39, 37.3, 47.2, 0.686),
+    (500, 38.79, 40.7, 56.7, 0.684),
+    (550, 45.57, 43.9, 66.7, 0.683),
+    (600, 52.69, 46.9, 76.9, 0.685),
+    (650, 60.21, 49.7, 87.3, 0.690),
+    (700, 68.10, 52.4, 98.0, 0.695),
+    (750, 76.37, 54.9, 109.0, 0.702),
+    (800, 84.93, 57.3, 120.0, 0.709),
+    (850, 93.80, 59.6, 131.0, 0.716),
+    (900, 102.9, 62.0, 143.0, 0.720),
+    (950, 112.2, 64.3, 155.0, 0.723),
+    (1000, 121.9, 66.7, 168.0, 0.726),
+    (1100, 141.8, 71.5, 195.0, 0.728),
+    (1200, 162.9, 76.3, 224.0, 0.728),
+)
+
+T_MIN = float(_REFERENCIA[0][0])
+T_MAX = float(_REFERENCIA[-1][0])
+PASSO = 1.0  # K
+
+COLUNAS = ("nu", "k", "g_beta_nu_alfa", "Pr_1_3", "churchill_chu", "alfa", "Pr")
+
+
+def _montar_grade():
+    # ν, k e α variam aproximadamente como potências de T: entre pontos da tabela
+    # a interpolação é feita em log-log; Pr é interpolado linearmente.
+    grade = []
+    j = 0
+    n = int(round((T_MAX - T_MIN) / PASSO)) + 1
+    for i in range(n):
+        T = T_MIN + i * PASSO
+        while j < len(_REFERENCIA) - 2 and T > _REFERENCIA[j + 1][0]:
+            j += 1
+        (T0, nu0, k0, a0, Pr0), (T1, nu1, k1, a1, Pr1) = _REFERENCIA[j], _REFERENCIA[j + 1]
+        f_log = math.log(T / T0) / math.log(T1 / T0)
+        nu = nu0 * (nu1 / nu0) ** f_log * 1e-6
+        k = k0 * (k1 / k0) ** f_log * 1e-3
+        alfa = a0 * (a1 / a0) ** f_log * 1e-6
+        Pr = Pr0 + (Pr1 - Pr0) * (T - T0) / (T1 - T0)
+        grade.append((nu, k, G / T / (nu * alfa), Pr ** (1 / 3), (1 + (0.559 / Pr) ** (9 / 16)) ** (8 / 27), alfa, Pr))
+    return tuple(grade)
+
+
+_GRADE = _montar_grade()
+_ULTIMO = len(_GRADE) - 1
+_tabela_numpy = None
+
+
+def _posicao(T_film_K):
+    x = (T_film_K - T_MIN) / PASSO
+    if math.isnan(x):
+        return 0, math.nan   # NaN segue NaN pelo peso, como em propriedades_vetorizado
+    if x <= 0:
+        return 0, 0.0
+    if x >= _ULTIMO:
+        return _ULTIMO - 1, 1.0
+    i = int(x)
+    return i, x - i
+
+
+def conveccao(T_film_K):
+    """(ν, k, g·β/(ν·α), Pr^(1/3), denominador de Churchill-Chu) para um valor escalar; usado em calcular_h_conv."""
+    i, f = _posicao(T_film_K)
+    a, b = _GRADE[i], _GRADE[i + 1]
+    return (a[0] + f * (b[0] - a[0]), a[1] + f * (b[1] - a[1]), a[2] + f * (b[2] - a[2]),
+            a[3] + f * (b[3] - a[3]), a[4] + f * (b[4] - a[4]))
+
+
+def propriedades(T_film_K):
+    """Dicionário com todas as colunas da grade para um valor escalar."""
+    i, f = _posicao(T_film_K)
+    a, b = _GRADE[i], _GRADE[i + 1]
+    return {nome: va + f * (vb - va) for nome, va, vb in zip(COLUNAS, a, b)}
+
+
+def propriedades_vetorizado(T_film_K, colunas=COLUNAS):
+    """Dicionário coluna -> array, para um array de temperaturas de filme [K]."""
+    import numpy as np
+
+    global _tabela_numpy
+    if _tabela_numpy is None:
+        valores = np.array(_GRADE).T
+        inclinacoes = np.diff(valores, axis=1, append=valores[:, -1:])
+        _tabela_numpy = {nome: (np.ascontiguousarray(valores[j]), np.ascontiguousarray(inclinacoes[j]))
+                         for j, nome in enumerate(COLUNAS)}
+    # Índice e peso calculados uma vez e aplicados às colunas pedidas.
+    x = np.clip((np.asarray(T_film_K, dtype=float) - T_MIN) / PASSO, 0, _ULTIMO)
+    i = np.where(np.isnan(x), 0, x).astype(np.intp)   # NaN segue NaN pelo peso f
+    f = x - i
+    return {nome: _tabela_numpy[nome][0][i] + f * _tabela_numpy[nome][1][i] for nome in colunas}
@@ -0,0 +1,244 @@
+"""Registro de auditoria das simulações na aba "Simulações" da planilha.
+
+Cada cálculo vira uma linha, mas a planilha não é chamada no clique: as
+linhas entram numa fila em memória e uma thread as envia em lotes com
+``append_rows``, esperando até ``intervalo`` segundos para juntar cliques
+próximos. Falhas são repetidas com espera exponencial; se a planilha
+continuar inacessível, o lote vai para um arquivo SQLite local (spool) e é
+reenviado, antes das linhas novas, quando a conexão voltar. Ao encerrar o
+processo o que ainda estiver na fila também vai para o spool.
+"""
+import atexit
+import json
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from datetime import datetime
+
+from . import metricas
+
+ABA = "Simulações"
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "simulacoes.sqlite")
+TAMANHO_LOTE = 50
+INTERVALO = 5.0            # s de espera para juntar linhas num lote
+INTERVALO_SPOOL = 60.0     # s entre tentativas de reenviar o spool sem linhas novas
+TENTATIVAS = 4
+ESPERA_INICIAL = 1.0       # s, dobrada a cada tentativa
+ESPERA_MAXIMA = 30.0
+
+# coluna da aba -> chaves de dados_para_relatorio (cálculo térmico) ou dados_para_relatorio_frio (condensação)
+CAMPOS = {
+    "material": ("material",),
+    "acabamento": ("acabamento",),
+    "geometria": ("geometria",),
+    "diametro_tubo_mm": ("diametro_tubo",),
+    "camadas": ("materiais_camadas",),
+    "espessuras_mm": ("espessuras",),
+    "espessura_mm": ("esp_total", "espessura_final"),
+    "espessura_comercial_mm": ("espessura_comercial",),
+    "temperatura_interna": ("tq", "ti"),
+    "temperatura_ambiente": ("to", "ta"),
+    "umidade_relativa": ("ur",),
+    "vento_ms": ("vento",),
+    "emissividade": ("emissividade",),
+    "tf": ("tf",),
+    "t_orvalho": ("t_orvalho",),
+    "perda_com_kw": ("perda_com_kw",),
+    "perda_sem_kw": ("perda_sem_kw",),
+    "perda_com_kw_m": ("perda_com_kw_m",),
+    "perda_sem_kw_m": ("perda_sem_kw_m",),
+    "eco_anual": ("eco_anual",),
+    "co2_ton_ano": ("co2_ton_ano",),
+}
+COLUNAS = ("id", "registrado_em", "tipo") + tuple(CAMPOS)
+
+
+def _celula(valor):
+    if valor is None:
+        return ""
+    if isinstance(valor, (list, tuple)):
+        return " / ".join(str(v) for v in valor)
+    if isinstance(valor, (int, float, str)):
+        return valor
+    return str(valor)
+
+
+def linha_simulacao(tipo, dados, agora=None):
+    """Linha da aba (na ordem de COLUNAS) para um dicionário de resultados da interface."""
+    agora = agora or datetime.now()
+    linha = [uuid.uuid4().hex[:12], agora.strftime("%d/%m/%Y %H:%M:%S"), tipo]
+    for chaves in CAMPOS.values():
+        linha.append(_celula(next((dados[c] for c in chaves if dados.get(c) is not None), None)))
+    return linha
+
+
+def abrir_aba(planilha, nome=ABA):
+    """Aba de auditoria; é criada, com o cabeçalho, na primeira vez."""
+    from gspread.exceptions import WorksheetNotFound
+
+    try:
+        return planilha.worksheet(nome)
+    except WorksheetNotFound:
+        aba = planilha.add_worksheet(title=nome, rows=1000, cols=len(COLUNAS))
+        aba.append_row(list(COLUNAS))
+        return aba
+
+
+class FilaSimulacoes:
+    """Envia as linhas de auditoria em lotes numa thread; ``abrir`` devolve a aba (chamado só na thread)."""
+
+    def __init__(self, abrir, caminho=CAMINHO_PADRAO, tamanho_lote=TAMANHO_LOTE, intervalo=INTERVALO,
+                 intervalo_spool=INTERVALO_SPOOL, tentativas=TENTATIVAS, espera_inicial=ESPERA_INICIAL,
+                 espera_maxima=ESPERA_MAXIMA):
+        self._abrir = abrir
+        self._aba = None
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.intervalo_spool = intervalo_spool
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self.ultimo_erro = None
+        self.enviadas = 0
+        self._fila = queue.Queue()
+        self._parar = threading.Event()
+        self._trava = threading.Lock()
+        self._thread = None
+        self._encerramento_registrado = False
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with closing(self._conectar()) as con, con:
+            con.execute("""CREATE TABLE IF NOT EXISTS pendentes (
+                ordem INTEGER PRIMARY KEY AUTOINCREMENT, linha TEXT NOT NULL, gravado_em REAL NOT NULL)""")
+        if self.pendentes():
+            self._iniciar()   # spool deixado por uma execução anterior
+
+    def _conectar(self):
+        return sqlite3.connect(self.caminho, timeout=10)
+
+    # --- LADO DA INTERFACE ---
+    def registrar(self, tipo, dados):
+        """Enfileira a simulação e volta imediatamente."""
+        self._fila.put(linha_simulacao(tipo, dados))
+        self._iniciar()
+
+    def _iniciar(self):
+        with self._trava:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._executar, name="auditoria-simulacoes", daemon=True)
+            self._thread.start()
+            if not self._encerramento_registrado:
+                atexit.register(self.fechar)
+                self._encerramento_registrado = True
+
+    def fechar(self, timeout=10.0):
+        """Envia o que der até ``timeout``; o restante da fila fica no spool."""
+        self._parar.set()
+        self._fila.put(None)
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._guardar(self._drenar())
+
+    def pendentes(self):
+        """Linhas no spool à espera de reenvio."""
+        with closing(self._conectar()) as con:
+            return con.execute("SELECT COUNT(*) FROM pendentes").fetchone()[0]
+
+    # --- SPOOL LOCAL ---
+    def _guardar(self, linhas):
+        if not linhas:
+            return
+        agora = time.time()
+        with closing(self._conectar()) as con, con:
+            con.executemany("INSERT INTO pendentes (linha, gravado_em) VALUES (?, ?)",
+                            [(json.dumps(linha, ensure_ascii=False), agora) for linha in linhas])
+
+    def _spool(self, limite):
+        with closing(self._conectar()) as con:
+            return con.execute("SELECT ordem, linha FROM pendentes ORDER BY ordem LIMIT ?", (limite,)).fetchall()
+
+    def _descartar(self, ordens):
+        with closing(self._conectar()) as con, con:
+            con.executemany("DELETE FROM pendentes WHERE ordem = ?", [(o,) for o in ordens])
+
+    # --- THREAD DE ENVIO ---
+    def _drenar(self):
+        linhas = []
+        while True:
+            try:
+                linha = self._fila.get_nowait()
+            except queue.Empty:
+                return linhas
+            if linha is not None:
+                linhas.append(linha)
+
+    def _coletar(self, espera):
+        """Linhas novas de um lote: espera a primeira (até ``espera`` s, ou sem limite com None) e depois
+        até ``intervalo`` s pelas seguintes."""
+        try:
+            primeira = self._fila.get(timeout=espera)
+        except queue.Empty:
+            return []
+        linhas = [] if primeira is None else [primeira]
+        limite = time.monotonic() + self.intervalo
+        while len(linhas) < self.tamanho_lote and not self._parar.is_set():
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                linha = self._fila.get(timeout=restante)
+            except queue.Empty:
+                break
+            if linha is not None:
+                linhas.append(linha)
+        return linhas
+
+    def _enviar(self, linhas):
+        """append_rows com espera exponencial entre as tentativas; True se o lote foi gravado."""
+        for tentativa in range(self.tentativas):
+            try:
+                if self._aba is None:
+                    self._aba = self._abrir()
+                self._aba.append_rows(linhas, value_input_option="USER_ENTERED")
+                self.ultimo_erro = None
+                return True
+            except Exception as ex:
+                self.ultimo_erro = ex
+                self._aba = None
+                if self._parar.is_set() or tentativa == self.tentativas - 1:
+                    break
+                espera = min(self.espera_maxima, self.espera_inicial * 2**tentativa)
+                self._parar.wait(espera * random.uniform(0.5, 1.0))
+        return False
+
+    def _executar(self):
+        espera = 0.0
+        while True:
+            novas = self._coletar(espera)
+            antigas = self._spool(self.tamanho_lote)
+            if novas or antigas:
+                inicio = time.perf_counter()
+                enviado = self._enviar([json.loads(linha) for _, linha in antigas] + novas)
+                if enviado:
+                    self._descartar([ordem for ordem, _ in antigas])
+                    self.enviadas += len(antigas) + len(novas)
+                else:
+                    self._guardar(novas)
+                metricas.registrar("planilha_simulacoes", time.perf_counter() - inicio,
+                                   status="enviado" if enviado else "spool", linhas=len(antigas) + len(novas))
+                # Com a planilha respondendo, o restante do spool segue sem pausa; fora do ar, só a cada intervalo.
+                espera = (0.0 if len(antigas) == self.tamanho_lote else None) if enviado else self.intervalo_spool
+            else:
+                espera = None
+            if self._parar.is_set() and self._fila.empty():
+                return
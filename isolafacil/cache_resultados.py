@@ -0,0 +1,79 @@
+"""Cache LRU, limitado em tamanho, de soluções da face fria.
+
+As entradas são normalizadas (fórmula k(T) sem espaços, diâmetro ignorado
+para superfície plana) e quantizadas antes de formar a chave, de modo que
+casos iguais digitados com pequenas diferenças de arredondamento
+compartilham o mesmo resultado. O cálculo é feito com as entradas já
+quantizadas, para que o valor guardado corresponda exatamente à chave.
+"""
+import threading
+from collections import OrderedDict
+
+from .solver import TOLERANCIA_Q, TOLERANCIA_T, resolver_face_fria
+
+# Casas decimais por grandeza
+CASAS_TEMPERATURA = 2   # °C
+CASAS_COMPRIMENTO = 5   # m (0,01 mm)
+CASAS_EMISSIVIDADE = 3
+CASAS_VENTO = 2         # m/s
+TAMANHO_PADRAO = 4096
+
+
+def chave_caso(Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+               tol_T=TOLERANCIA_T, tol_q=TOLERANCIA_Q):
+    formula = "".join(str(k_func_str).replace(',', '.').split())
+    diametro = round(pipe_diameter_m or 0.0, CASAS_COMPRIMENTO) if geometry == "Tubulação" else 0.0
+    return (formula, geometry, diametro, round(L_total, CASAS_COMPRIMENTO),
+            round(Tq, CASAS_TEMPERATURA), round(To, CASAS_TEMPERATURA),
+            round(emissividade, CASAS_EMISSIVIDADE), round(wind_speed_ms or 0.0, CASAS_VENTO), tol_T, tol_q)
+
+
+class CacheResultados:
+    """Seguro para uso simultâneo por várias sessões (threads) do Streamlit."""
+
+    def __init__(self, tamanho_maximo=TAMANHO_PADRAO):
+        self.tamanho_maximo = tamanho_maximo
+        self._dados = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def resolver(self, Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+                 tol_T=TOLERANCIA_T, tol_q=TOLERANCIA_Q):
+        chave = chave_caso(Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m, wind_speed_ms, tol_T, tol_q)
+        with self._trava:
+            if chave in self._dados:
+                self._dados.move_to_end(chave)
+                self.acertos += 1
+                return self._dados[chave]
+            self.falhas += 1
+
+        formula, geometry, diametro, L_total, Tq, To, emissividade, wind_speed_ms = chave[:8]
+        resultado = resolver_face_fria(Tq, To, L_total, formula, geometry, emissividade, diametro or None,
+                                       wind_speed_ms, tol_T=tol_T, tol_q=tol_q)
+
+        with self._trava:
+            self._dados[chave] = resultado
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.tamanho_maximo:
+                self._dados.popitem(last=False)
+                self.remocoes += 1
+        return resultado
+
+    def limpar(self):
+        with self._trava:
+            self._dados.clear()
+            self.acertos = self.falhas = self.remocoes = 0
+
+    def estatisticas(self):
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {
+                "tamanho": len(self._dados),
+                "tamanho_maximo": self.tamanho_maximo,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "remocoes": self.remocoes,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            }
@@ -0,0 +1,151 @@
+"""Cópia local persistente das abas de materiais e acabamentos.
+
+A aplicação lê sempre do arquivo SQLite local. A planilha do Google é
+consultada apenas para atualizar esse arquivo, em segundo plano: primeiro
+compara-se a revisão (data de última alteração da planilha) e só então as
+abas são baixadas. Se a atualização falhar, a última cópia válida continua
+em uso.
+
+Para testes e uso offline, a fonte pode ser um arquivo JSON no formato
+``{"Isolantes 2": [...], "Emissividade": [...]}`` (variável de ambiente
+``ISOLAFACIL_CATALOGO_FIXTURE``).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from . import metricas
+
+ABAS = ("Isolantes 2", "Emissividade")
+INTERVALO_ATUALIZACAO = 300  # s
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "catalogo.sqlite")
+
+
+def _revisao_conteudo(dados):
+    texto = json.dumps(dados, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16]
+
+
+class FonteGoogleSheets:
+    """Lê as abas da planilha; o objeto Spreadsheet é aberto uma única vez."""
+
+    def __init__(self, abrir_planilha):
+        self._abrir_planilha = abrir_planilha
+        self._planilha = None
+
+    @property
+    def planilha(self):
+        if self._planilha is None:
+            self._planilha = self._abrir_planilha()
+        return self._planilha
+
+    def revisao(self):
+        # Consulta leve à API do Drive; None força o download completo.
+        try:
+            return self.planilha.get_lastUpdateTime()
+        except AttributeError:
+            return None
+
+    def registros(self, aba):
+        return self.planilha.worksheet(aba).get_all_records()
+
+
+class FonteArquivo:
+    """Fonte local em JSON, usada em testes e em execução offline."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+
+    def _ler(self):
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+
+    def revisao(self):
+        return _revisao_conteudo(self._ler())
+
+    def registros(self, aba):
+        return self._ler()[aba]
+
+
+class CatalogoLocal:
+    def __init__(self, fonte, caminho=CAMINHO_PADRAO, abas=ABAS, intervalo=INTERVALO_ATUALIZACAO):
+        self.fonte = fonte
+        self.caminho = caminho
+        self.abas = tuple(abas)
+        self.intervalo = intervalo
+        self.ultimo_erro = None
+        self._trava = threading.Lock()
+        self._thread = None
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with closing(self._conectar()) as con, con:
+            con.execute("""CREATE TABLE IF NOT EXISTS abas (
+                nome TEXT PRIMARY KEY, registros TEXT NOT NULL, revisao TEXT, verificado_em REAL NOT NULL)""")
+
+    def _conectar(self):
+        return sqlite3.connect(self.caminho, timeout=10)
+
+    def registros(self, aba):
+        """Última cópia gravada da aba, ou None se ela nunca foi baixada."""
+        with closing(self._conectar()) as con:
+            linha = con.execute("SELECT registros FROM abas WHERE nome = ?", (aba,)).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def revisao(self, aba):
+        with closing(self._conectar()) as con:
+            linha = con.execute("SELECT revisao FROM abas WHERE nome = ?", (aba,)).fetchone()
+        return linha[0] if linha else None
+
+    def desatualizado(self):
+        with closing(self._conectar()) as con:
+            linhas = dict(con.execute("SELECT nome, verificado_em FROM abas").fetchall())
+        agora = time.time()
+        return any(agora - linhas.get(aba, 0) >= self.intervalo for aba in self.abas)
+
+    def atualizar(self):
+        """Sincroniza com a fonte. Retorna True se alguma aba mudou; em falha mantém a cópia atual."""
+        with self._trava, metricas.medir("catalogo_atualizacao") as detalhes:
+            try:
+                revisao = self.fonte.revisao()
+                agora = time.time()
+                mudou = False
+                baixadas = 0
+                for aba in self.abas:
+                    if revisao is not None and revisao == self.revisao(aba):
+                        registros, revisao_aba = None, revisao
+                    else:
+                        registros = self.fonte.registros(aba)
+                        revisao_aba = revisao or _revisao_conteudo(registros)
+                        baixadas += 1
+                    mudou |= self._gravar(aba, registros, revisao_aba, agora)
+                self.ultimo_erro = None
+                detalhes.update(status="mudou" if mudou else "sem_mudanca", abas_baixadas=baixadas)
+                return mudou
+            except Exception as ex:
+                self.ultimo_erro = ex
+                detalhes["status"] = "erro"
+                return False
+
+    def _gravar(self, aba, registros, revisao, agora):
+        with closing(self._conectar()) as con, con:
+            if registros is None or revisao == self.revisao(aba):
+                con.execute("UPDATE abas SET verificado_em = ? WHERE nome = ?", (agora, aba))
+                return False
+            con.execute("INSERT OR REPLACE INTO abas (nome, registros, revisao, verificado_em) VALUES (?, ?, ?, ?)",
+                        (aba, json.dumps(registros, ensure_ascii=False, default=str), revisao, agora))
+            return True
+
+    def atualizar_em_segundo_plano(self):
+        """Dispara a sincronização numa thread, se a cópia estiver vencida e nenhuma estiver em andamento."""
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        if not self.desatualizado():
+            return False
+        self._thread = threading.Thread(target=self.atualizar, name="atualizar-catalogo", daemon=True)
+        self._thread.start()
+        return True
@@ -0,0 +1,143 @@
+"""Mapa de risco de condensação: espessura mínima sobre uma grade de climas.
+
+Para cada temperatura interna Ti, temperatura ambiente Ta e umidade relativa
+UR da grade, a espessura é a mesma de ``espessura_minima`` (menor L com
+Tf(L) >= T_orvalho), mas todas as combinações são resolvidas juntas:
+
+1. Tf não depende de UR: para cada par (Ti, Ta) uma tabela Tf(L), com L
+   espaçado em log, é resolvida numa única chamada de ``resolver_lote``;
+2. a tabela dá, para cada célula, o intervalo de L em que Tf cruza a
+   temperatura de orvalho;
+3. esses intervalos são estreitados juntos por falsa posição (Illinois) em
+   ln(L), em chamadas de ``resolver_lote`` só com as células ainda abertas.
+
+Células em que Ti já fica acima da temperatura de orvalho não precisam de
+isolante e recebem espessura 0 (``espessura_minima`` devolveria L_min).
+
+O envelope de projeto é a espessura que atende a um percentil das células de
+clima, opcionalmente ponderadas pela frequência de cada clima.
+"""
+import math
+import time
+from dataclasses import dataclass
+
+from . import metricas
+from .espessura import L_MAX, L_MIN, RESOLUCAO, TOLERANCIA_Q, TOLERANCIA_T
+from .psicrometria import temperatura_orvalho_vetorizada
+
+PONTOS_TABELA = 48
+MAX_ITER = 30
+
+
+@dataclass(frozen=True)
+class MapaCondensacao:
+    Ti: tuple
+    Ta: tuple
+    UR: tuple
+    espessura: object   # array (Ti, Ta, UR) em m; 0 sem risco de condensação, NaN se nem L_max evita
+    T_orvalho: object   # array (Ta, UR) em °C
+    solucoes: int       # linhas resolvidas pelo solver em lote
+
+    def envelope(self, percentil=95.0, pesos=None):
+        """Espessura [m] por Ti que atende ``percentil`` % das células de clima; NaN se passar de L_max.
+
+        ``pesos`` (forma Ta × UR) é a frequência de cada clima, por exemplo em
+        horas por ano; sem pesos todas as células contam igual.
+        """
+        import numpy as np
+
+        espessuras = np.where(np.isnan(self.espessura), np.inf, self.espessura).reshape(len(self.Ti), -1)
+        pesos = np.ones(espessuras.shape[1]) if pesos is None else np.asarray(pesos, dtype=float).ravel()
+        ordem = np.argsort(espessuras, axis=1)
+        ordenadas = np.take_along_axis(espessuras, ordem, axis=1)
+        acumulado = np.cumsum(pesos[ordem], axis=1) / pesos.sum()
+        posicao = (acumulado < percentil / 100 - 1e-12).sum(axis=1).clip(max=espessuras.shape[1] - 1)
+        valores = ordenadas[np.arange(len(self.Ti)), posicao]
+        return np.where(np.isinf(valores), np.nan, valores)
+
+    def tabela(self):
+        """DataFrame com uma linha por célula: ti, ta, ur, t_orvalho e espessura_mm."""
+        import numpy as np
+        import pandas as pd
+
+        Ti, Ta, UR = np.meshgrid(self.Ti, self.Ta, self.UR, indexing="ij")
+        return pd.DataFrame({
+            "ti": Ti.ravel(), "ta": Ta.ravel(), "ur": UR.ravel(),
+            "t_orvalho": np.broadcast_to(self.T_orvalho, Ti.shape).ravel(),
+            "espessura_mm": self.espessura.ravel() * 1000,
+        })
+
+
+def mapa_condensacao(Ti, Ta, UR, k_func_str, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+                     L_min=L_MIN, L_max=L_MAX, resolucao=RESOLUCAO, pontos_tabela=PONTOS_TABELA):
+    """Espessura mínima contra condensação para todas as combinações de Ti, Ta e UR (listas de valores)."""
+    import numpy as np
+
+    from .lote import resolver_lote
+
+    inicio = time.perf_counter()
+    Ti, Ta, UR = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (Ti, Ta, UR))
+    T_orvalho = temperatura_orvalho_vetorizada(Ta[:, None], UR[None, :])
+    diametro = pipe_diameter_m or 0.0
+    solucoes = 0
+
+    def resolver(Tq, To, L, Tf_inicial=None):
+        nonlocal solucoes
+        solucoes += len(L)
+        return resolver_lote(Tq, To, L, geometry, emissividade, k_func_str, diametro, wind_speed_ms,
+                             tol_T=TOLERANCIA_T, tol_q=TOLERANCIA_Q, Tf_inicial=Tf_inicial)["tf"].to_numpy()
+
+    # 1. Tabela Tf(L) por par (Ti, Ta) com Ti < Ta; os demais pares não têm face fria abaixo do ambiente.
+    L_tabela = np.geomspace(L_min, L_max, pontos_tabela)
+    Tf_tabela = np.full((len(Ti), len(Ta), pontos_tabela), np.nan)
+    pares = np.argwhere(Ti[:, None] < Ta[None, :])
+    if len(pares):
+        i, a = pares.T
+        Tf_tabela[i, a] = resolver(np.repeat(Ti[i], pontos_tabela), np.repeat(Ta[a], pontos_tabela),
+                                   np.tile(L_tabela, len(pares))).reshape(len(pares), pontos_tabela)
+
+    # 2. Intervalo de cada célula: o primeiro ponto da tabela que atende e o anterior.
+    alvo = np.broadcast_to(T_orvalho, (len(Ti), len(Ta), len(UR)))
+    atende = Tf_tabela[:, :, None, :] >= alvo[..., None]
+    primeiro = atende.argmax(axis=-1)
+    espessura = np.full(alvo.shape, np.nan)
+    espessura[Ti[:, None, None] >= alvo] = 0.0
+    invalida = np.isnan(Tf_tabela).any(axis=-1)[:, :, None] | (espessura == 0.0)
+    espessura[~invalida & atende[..., 0]] = L_min
+    abertas = ~invalida & atende.any(axis=-1) & (primeiro > 0)
+
+    # 3. Illinois em ln(L) para todas as células abertas ao mesmo tempo.
+    celulas = np.nonzero(abertas)
+    j = primeiro[celulas]
+    linhas_tabela = Tf_tabela[celulas[0], celulas[1]]
+    Ti_c, Ta_c, alvo_c = Ti[celulas[0]], Ta[celulas[1]], alvo[celulas]
+    baixo, alto = np.log(L_tabela[j - 1]), np.log(L_tabela[j])
+    g_baixo = linhas_tabela[np.arange(len(j)), j - 1] - alvo_c
+    g_alto = linhas_tabela[np.arange(len(j)), j] - alvo_c
+    lado_anterior = np.zeros(len(j), dtype=int)
+    ativo = np.exp(alto) - np.exp(baixo) > resolucao
+    for _ in range(MAX_ITER):
+        if not ativo.any():
+            break
+        k = np.flatnonzero(ativo)
+        x = alto[k] - g_alto[k] * (alto[k] - baixo[k]) / (g_alto[k] - g_baixo[k])
+        # Garante avanço mínimo para que o colchete se feche nas duas pontas.
+        margem = 0.25 * resolucao / np.exp(alto[k])
+        x = np.minimum(np.maximum(x, baixo[k] + margem), alto[k] - margem)
+        g_x = resolver(Ti_c[k], Ta_c[k], np.exp(x), Tf_inicial=alvo_c[k]) - alvo_c[k]
+
+        falhou = np.isnan(g_x)
+        acima = g_x >= 0
+        sobe, desce = k[acima], k[~acima & ~falhou]
+        # Illinois: a ponta que fica parada duas vezes seguidas tem o resíduo dividido por 2.
+        g_baixo[sobe[lado_anterior[sobe] == 1]] /= 2
+        g_alto[desce[lado_anterior[desce] == -1]] /= 2
+        alto[sobe], g_alto[sobe], lado_anterior[sobe] = x[acima], g_x[acima], 1
+        baixo[desce], g_baixo[desce], lado_anterior[desce] = x[~acima & ~falhou], g_x[~acima & ~falhou], -1
+        alto[k[falhou]] = math.nan
+        ativo[k] = ~falhou & (np.exp(alto[k]) - np.exp(baixo[k]) > resolucao)
+    espessura[celulas] = np.where(ativo, np.nan, np.exp(alto))
+
+    metricas.registrar("mapa_condensacao", time.perf_counter() - inicio, celulas=int(espessura.size),
+                       solucoes=solucoes)
+    return MapaCondensacao(tuple(Ti.tolist()), tuple(Ta.tolist()), tuple(UR.tolist()), espessura, T_orvalho, solucoes)
@@ -0,0 +1,157 @@
+"""Compilação das fórmulas de condutividade térmica k(T) da planilha.
+
+As fórmulas chegam como texto (ex.: ``0,035 + 0,0001*T``) e são analisadas
+uma única vez: a árvore sintática é restrita a aritmética, ``T`` e funções
+de ``math``, e o resultado fica guardado em um cache LRU pelo texto.
+"""
+import ast
+import math
+from functools import lru_cache, reduce
+from types import SimpleNamespace
+
+# --- ELEMENTOS PERMITIDOS NAS FÓRMULAS ---
+_OPERADORES = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod)
+_OPERADORES_UNARIOS = (ast.UAdd, ast.USub)
+
+# Nome em math -> nome equivalente em numpy
+_FUNCOES_MATH = {
+    "exp": "exp", "log": "log", "log10": "log10", "sqrt": "sqrt", "pow": "power",
+    "fabs": "abs", "sin": "sin", "cos": "cos", "tan": "tan", "atan": "arctan",
+    "sinh": "sinh", "cosh": "cosh", "tanh": "tanh",
+}
+# Argumentos aceitos: em numpy um argumento a mais seria tomado como ``out``.
+_ARGUMENTOS_MATH = {"log": (1, 2), "pow": (2, 2)}
+_CONSTANTES_MATH = ("pi", "e")
+_FUNCOES_NATIVAS = ("abs", "min", "max")
+
+
+class FormulaKInvalida(ValueError):
+    """Fórmula k(T) com sintaxe inválida ou elementos não permitidos."""
+
+
+def _verificar(no):
+    if isinstance(no, ast.Expression):
+        _verificar(no.body)
+    elif isinstance(no, ast.BinOp):
+        if not isinstance(no.op, _OPERADORES):
+            raise FormulaKInvalida(f"operador não permitido: {type(no.op).__name__}")
+        _verificar(no.left)
+        _verificar(no.right)
+    elif isinstance(no, ast.UnaryOp):
+        if not isinstance(no.op, _OPERADORES_UNARIOS):
+            raise FormulaKInvalida(f"operador não permitido: {type(no.op).__name__}")
+        _verificar(no.operand)
+    elif isinstance(no, ast.Constant):
+        if isinstance(no.value, bool) or not isinstance(no.value, (int, float)):
+            raise FormulaKInvalida(f"constante não numérica: {no.value!r}")
+        # Inteiros viram float: 9**9**8 levanta OverflowError em vez de calcular um inteiro enorme.
+        try:
+            no.value = float(no.value)
+        except OverflowError:
+            raise FormulaKInvalida(f"constante fora da faixa: {no.value}") from None
+    elif isinstance(no, ast.Name):
+        if no.id != "T":
+            raise FormulaKInvalida(f"nome não permitido: {no.id}")
+    elif isinstance(no, ast.Attribute):
+        if not (isinstance(no.value, ast.Name) and no.value.id == "math" and no.attr in _CONSTANTES_MATH):
+            raise FormulaKInvalida(f"atributo não permitido: {ast.unparse(no)}")
+    elif isinstance(no, ast.Call):
+        if no.keywords or not no.args:
+            raise FormulaKInvalida(f"chamada não permitida: {ast.unparse(no)}")
+        funcao = no.func
+        if isinstance(funcao, ast.Attribute):
+            permitida = isinstance(funcao.value, ast.Name) and funcao.value.id == "math" and funcao.attr in _FUNCOES_MATH
+        else:
+            permitida = isinstance(funcao, ast.Name) and funcao.id in _FUNCOES_NATIVAS
+        if not permitida:
+            raise FormulaKInvalida(f"função não permitida: {ast.unparse(funcao)}")
+        if isinstance(funcao, ast.Attribute):
+            minimo, maximo = _ARGUMENTOS_MATH.get(funcao.attr, (1, 1))
+            if not minimo <= len(no.args) <= maximo:
+                raise FormulaKInvalida(f"número de argumentos inválido: {ast.unparse(no)}")
+        for argumento in no.args:
+            _verificar(argumento)
+    else:
+        raise FormulaKInvalida(f"expressão não permitida: {type(no).__name__}")
+
+
+def _namespace_numpy():
+    import numpy as np
+
+    modulo = SimpleNamespace(**{nome: getattr(np, nome_np) for nome, nome_np in _FUNCOES_MATH.items()})
+    modulo.pi, modulo.e = np.pi, np.e
+    modulo.log = lambda x, base=None: np.log(x) if base is None else np.log(x) / np.log(base)
+    return {
+        "__builtins__": {},
+        "math": modulo,
+        "abs": np.abs,
+        "min": lambda *args: reduce(np.minimum, args),
+        "max": lambda *args: reduce(np.maximum, args),
+    }
+
+
+class FormulaK:
+    """k(T) [W/m.K] compilada a partir do texto da planilha, com T em °C."""
+
+    __slots__ = ("texto", "_codigo", "_escalar", "_vetorial")
+
+    def __init__(self, texto, codigo):
+        self.texto = texto
+        self._codigo = codigo
+        self._escalar = eval(codigo, {"__builtins__": {}, "math": math, "abs": abs, "min": min, "max": max})
+        self._vetorial = None
+
+    def __call__(self, T):
+        return self._escalar(T)
+
+    def vetorizada(self, T):
+        """Avalia k para um array de temperaturas médias em uma única chamada."""
+        import numpy as np
+
+        if self._vetorial is None:
+            self._vetorial = eval(self._codigo, _namespace_numpy())
+        T = np.asarray(T, dtype=float)
+        k = self._vetorial(T)
+        if k is not T and isinstance(k, np.ndarray) and k.shape == T.shape and k.dtype == float:
+            return k
+        # Fórmulas constantes (ou só ``T``) devolvem um escalar ou o próprio array de entrada.
+        return np.broadcast_to(k, T.shape).astype(float)
+
+    def __reduce__(self):
+        # O código compilado não é serializável; no outro processo a fórmula é recompilada pelo texto.
+        return compilar_k, (self.texto,)
+
+    def __repr__(self):
+        return f"FormulaK({self.texto!r})"
+
+
+@lru_cache(maxsize=256)
+def compilar_k(k_func_str):
+    """Valida e compila uma fórmula k(T); o resultado é reaproveitado pelo texto."""
+    texto = str(k_func_str).replace(',', '.').strip()
+    if not texto:
+        raise FormulaKInvalida("fórmula vazia")
+    try:
+        arvore = ast.parse(texto, mode="eval")
+    except SyntaxError as ex:
+        raise FormulaKInvalida(f"sintaxe inválida: {ex.msg}") from None
+    _verificar(arvore)
+    codigo = compile(f"lambda T: ({ast.unparse(arvore)})", "<k(T)>", "eval")
+    return FormulaK(texto, codigo)
+
+
+def validar_k(k_func_str, T_min=None, T_max=None):
+    """Compila a fórmula e confere que k é positivo e finito dentro da faixa do material."""
+    formula = compilar_k(k_func_str)
+    if T_min is not None and T_max is not None and -273.15 < T_min <= T_max < 5000:
+        temperaturas = (T_min, (T_min + T_max) / 2, T_max)
+    else:
+        temperaturas = (50.0,)
+    for T in temperaturas:
+        try:
+            k = float(formula(T))
+        except (ArithmeticError, ValueError, TypeError) as ex:
+            raise FormulaKInvalida(f"erro ao avaliar em T={T:g} °C: {ex}") from None
+        if not math.isfinite(k) or k <= 0:
+            raise FormulaKInvalida(f"k(T={T:g} °C) = {k:g} não é positivo")
+    return formula
@@ -0,0 +1,119 @@
+"""Retorno financeiro, carbono evitado e espessura econômica."""
+import itertools
+import math
+from dataclasses import dataclass
+
+COMBUSTIVEIS = {
+    "Óleo BPF (kg)":                   {"v": 3.50, "pc": 11.34, "ef": 0.80, "fator_emissao": 3.15},
+    "Gás Natural (m³)":                {"v": 3.60, "pc": 9.65,  "ef": 0.75, "fator_emissao": 2.0},
+    "Lenha Eucalipto 30% umidade (ton)": {"v": 200.00,"pc": 3500.00,"ef": 0.70, "fator_emissao": 1260},
+    "Eletricidade (kWh)":                {"v": 0.75, "pc": 1.00,  "ef": 1.00, "fator_emissao": 0.0358}
+}
+SEMANAS_POR_MES = 4.33
+
+
+def horas_por_ano(h_dia, d_sem):
+    return h_dia * d_sem * SEMANAS_POR_MES * 12
+
+
+def custo_kwh(combustivel, valor_comb=None):
+    """Custo da energia útil [R$/kWh] considerando poder calorífico e eficiência."""
+    valor = combustivel['v'] if valor_comb is None else valor_comb
+    return valor / (combustivel['pc'] * combustivel['ef'])
+
+
+def co2_ton_por_kwh(combustivel):
+    """Emissão [tCO2e] por kWh de energia útil."""
+    return combustivel['fator_emissao'] / (combustivel['ef'] * combustivel['pc']) / 1000
+
+
+def calcular_retorno_financeiro(perda_sem_kw, perda_com_kw, combustivel, valor_comb, area, h_dia, d_sem):
+    """Economia e carbono evitado ao isolar ``area`` (m², ou m para perdas em kW/m de tubo)."""
+    economia_kw = perda_sem_kw - perda_com_kw
+    eco_mensal = economia_kw * custo_kwh(combustivel, valor_comb) * area * h_dia * d_sem * SEMANAS_POR_MES
+    energia_efetiva_anual_kwh = economia_kw * area * horas_por_ano(h_dia, d_sem)
+    return {
+        "eco_mensal": eco_mensal,
+        "eco_anual": eco_mensal * 12,
+        "reducao_pct": ((economia_kw / perda_sem_kw) * 100) if perda_sem_kw > 0 else 0,
+        "co2_ton_ano": energia_efetiva_anual_kwh * co2_ton_por_kwh(combustivel),
+    }
+
+
+def fator_recuperacao_capital(taxa_juros, vida_util_anos):
+    """Fração anual equivalente de um investimento (taxa em fração ao ano)."""
+    if taxa_juros == 0:
+        return 1 / vida_util_anos
+    fator = (1 + taxa_juros) ** vida_util_anos
+    return taxa_juros * fator / (fator - 1)
+
+
+@dataclass(frozen=True)
+class ResultadoEconomico:
+    otimo: dict | None
+    curva: object   # DataFrame com uma linha por combinação material × acabamento × espessura
+    unidade: str    # "m²" (superfície plana) ou "m" (tubulação)
+
+
+def espessura_economica(Tq, To, geometry, materiais, espessuras_m, preco_m3, combustivel, h_dia, d_sem,
+                        vida_util_anos=10, taxa_juros=0.0, valor_comb=None, acabamentos=(("", 0.9),),
+                        pipe_diameter_m=None, wind_speed_ms=0.0):
+    """Varre material × acabamento × espessura e retorna o ponto de menor custo anual total.
+
+    ``materiais`` é uma sequência de (nome, k_func_str); ``acabamentos`` de
+    (nome, emissividade); ``preco_m3`` é o custo instalado do isolante [R$/m³],
+    um número ou um dicionário por nome de material. Os custos são por m² de
+    superfície plana ou por metro de tubulação.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from .lote import resolver_lote
+
+    combinacoes = list(itertools.product(materiais, acabamentos, espessuras_m))
+    if not combinacoes:
+        return ResultadoEconomico(None, pd.DataFrame(), "m" if geometry == "Tubulação" else "m²")
+    materiais, acabamentos, espessuras = zip(*combinacoes)
+    nomes, k_funcs = zip(*materiais)
+    nomes_acab, emissividades = zip(*acabamentos)
+    espessuras = np.array(espessuras, dtype=float)
+
+    # Toda a grade numa única chamada, sem partir da Tf da espessura anterior: o encadeamento reduz as
+    # avaliações de k, mas uma chamada por espessura custa mais em despacho do que economiza.
+    resultado = resolver_lote(Tq, To, espessuras, geometry, np.array(emissividades, dtype=float),
+                              np.array(k_funcs, dtype=object), pipe_diameter_m or 0.0, wind_speed_ms)
+
+    # Perdas e volume de isolante por unidade (m² de parede ou m de tubo).
+    if geometry == "Tubulação":
+        r_inner = pipe_diameter_m / 2
+        r_outer = r_inner + espessuras
+        perda_kw = resultado["perda_com_kw"].to_numpy() * 2 * math.pi * r_outer
+        perda_sem_kw = resultado["perda_sem_kw"].to_numpy() * 2 * math.pi * r_inner
+        volume = math.pi * (r_outer**2 - r_inner**2)
+        unidade = "m"
+    else:
+        perda_kw = resultado["perda_com_kw"].to_numpy()
+        perda_sem_kw = resultado["perda_sem_kw"].to_numpy()
+        volume = espessuras
+        unidade = "m²"
+
+    precos = np.array([preco_m3[nome] if isinstance(preco_m3, dict) else preco_m3 for nome in nomes], dtype=float)
+    horas = horas_por_ano(h_dia, d_sem)
+    custo_energia = perda_kw * horas * custo_kwh(combustivel, valor_comb)
+    custo_isolamento = precos * volume * fator_recuperacao_capital(taxa_juros, vida_util_anos)
+
+    curva = pd.DataFrame({
+        "material": nomes,
+        "acabamento": nomes_acab,
+        "espessura_mm": espessuras * 1000,
+        "tf": resultado["tf"].to_numpy(),
+        "perda_kw": perda_kw,
+        "perda_sem_kw": perda_sem_kw,
+        "custo_energia_ano": custo_energia,
+        "custo_isolamento_ano": custo_isolamento,
+        "custo_total_ano": custo_energia + custo_isolamento,
+        "convergiu": resultado["convergiu"].to_numpy(),
+    })
+    validos = curva[curva["convergiu"]]
+    otimo = validos.loc[validos["custo_total_ano"].idxmin()].to_dict() if not validos.empty else None
+    return ResultadoEconomico(otimo, curva, unidade)
@@ -0,0 +1,103 @@
+"""Espessura mínima de isolamento para evitar condensação.
+
+Com a face interna fria (Ti < Ta), a temperatura da face externa Tf cresce
+monotonicamente com a espessura. A espessura mínima é a raiz de
+Tf(L) - T_orvalho, procurada por falsa posição (Illinois) em ln(L) dentro
+de um colchete [L_min, L_max]; cada solução interna parte da Tf do último
+ponto calculado.
+"""
+import bisect
+import math
+from dataclasses import dataclass
+
+from . import metricas
+from .solver import resolver_face_fria
+
+L_MIN = 0.001       # m
+L_MAX = 0.500       # m
+RESOLUCAO = 1e-4    # m
+# Perto da espessura mínima Tf varia pouco com L; as soluções internas usam tolerâncias
+# mais apertadas que as do cálculo isolado para não deslocar a resposta.
+TOLERANCIA_T = 1e-5  # °C
+TOLERANCIA_Q = 1e-3  # W/m²
+
+
+@dataclass(frozen=True)
+class ResultadoEspessura:
+    espessura: float | None
+    espessura_comercial: float | None
+    Tf: float | None
+    encontrada: bool
+    solucoes: int
+    status: str
+
+
+def arredondar_comercial(espessura, espessuras_comerciais):
+    """Menor espessura comercial que não é inferior à espessura calculada (mesma unidade).
+
+    Retorna None sem espessura calculada (None ou NaN, quando nem a maior resolve).
+    """
+    if espessura is None or math.isnan(espessura) or not espessuras_comerciais:
+        return None
+    opcoes = sorted(espessuras_comerciais)
+    posicao = bisect.bisect_left(opcoes, espessura - 1e-12)
+    return opcoes[posicao] if posicao < len(opcoes) else None
+
+
+@metricas.cronometrado("espessura_minima", lambda r: {"status": "encontrada" if r.encontrada else "falhou",
+                                                      "solucoes": r.solucoes})
+def espessura_minima(Ti, Ta, T_orvalho, k_func_str, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+                     L_min=L_MIN, L_max=L_MAX, resolucao=RESOLUCAO, espessuras_comerciais=None):
+    """Menor espessura [m], com a resolução pedida, para a qual Tf >= T_orvalho.
+
+    ``espessuras_comerciais`` (em metros) é opcional; quando informada, o
+    resultado também traz a menor espessura comercial que atende.
+    """
+    solucoes = 0
+    Tf_anterior = None
+
+    def diferenca(L):
+        nonlocal solucoes, Tf_anterior
+        solucoes += 1
+        resultado = resolver_face_fria(Ti, Ta, L, k_func_str, geometry, emissividade, pipe_diameter_m, wind_speed_ms,
+                                       tol_T=TOLERANCIA_T, tol_q=TOLERANCIA_Q, Tf_inicial=Tf_anterior)
+        if not resultado.convergiu:
+            raise ArithmeticError(resultado.status)
+        Tf_anterior = resultado.Tf
+        return resultado.Tf - T_orvalho, resultado.Tf
+
+    def falha(status):
+        return ResultadoEspessura(None, None, None, False, solucoes, status)
+
+    try:
+        g_alto, Tf_alto = diferenca(L_max)
+        if g_alto < 0:
+            return falha(f"nenhuma espessura até {L_max * 1000:.0f} mm evita a condensação")
+        g_baixo, Tf_baixo = diferenca(L_min)
+        if g_baixo >= 0:
+            L, Tf = L_min, Tf_baixo
+        else:
+            baixo, alto = math.log(L_min), math.log(L_max)
+            lado_anterior = 0
+            while math.exp(alto) - math.exp(baixo) > resolucao:
+                x = alto - g_alto * (alto - baixo) / (g_alto - g_baixo)
+                # Garante avanço mínimo para que o colchete se feche nas duas pontas.
+                margem = 0.25 * resolucao / math.exp(alto)
+                x = min(max(x, baixo + margem), alto - margem)
+                g_x, Tf_x = diferenca(math.exp(x))
+                if g_x >= 0:
+                    alto, g_alto, Tf_alto = x, g_x, Tf_x
+                    if lado_anterior == 1:
+                        g_baixo /= 2
+                    lado_anterior = 1
+                else:
+                    baixo, g_baixo = x, g_x
+                    if lado_anterior == -1:
+                        g_alto /= 2
+                    lado_anterior = -1
+            L, Tf = math.exp(alto), Tf_alto
+    except ArithmeticError as ex:
+        return falha(f"o cálculo da face fria não convergiu: {ex}")
+
+    comerciais = arredondar_comercial(L, espessuras_comerciais)
+    return ResultadoEspessura(L, comerciais, Tf, True, solucoes, "encontrada")
@@ -0,0 +1,101 @@
+"""Execução paralela de cálculos independentes em um pool de processos.
+
+O pool é criado na primeira utilização, dimensionado pelos núcleos
+disponíveis, e permanece ativo entre as requisições (é compartilhado por
+todas as sessões do servidor). ``aquecer`` inicia os processos e carrega
+neles o solver em lote antes do primeiro cálculo, para que o custo de
+criação e de importação não caia no clique do usuário.
+
+Os processos são iniciados com "spawn": o servidor do Streamlit tem várias
+threads, e um fork nessas condições pode travar o processo filho.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_executor = None
+_trava = threading.Lock()
+
+
+def numero_processos():
+    try:
+        return max(len(os.sched_getaffinity(0)), 1)
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def obter_executor():
+    """Pool compartilhado, criado sob demanda."""
+    global _executor
+    with _trava:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=numero_processos(),
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def encerrar():
+    global _executor
+    with _trava:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+atexit.register(encerrar)
+
+
+def _reiniciar_se_quebrado(ex):
+    # Um processo filho que morre inutiliza o pool; o próximo uso cria outro.
+    if isinstance(ex, BrokenProcessPool):
+        encerrar()
+
+
+def aquecer(esperar=False):
+    """Inicia os processos e importa neles o solver em lote (NumPy, pandas) antes do primeiro cálculo.
+
+    Sem ``esperar`` volta imediatamente e os processos sobem em segundo plano.
+    """
+    executor = obter_executor()
+    futuros = [executor.submit(_preparar_processo) for _ in range(numero_processos())]
+    if esperar:
+        try:
+            return sorted({futuro.result() for futuro in futuros})
+        except BrokenProcessPool as ex:
+            _reiniciar_se_quebrado(ex)
+            raise
+    return futuros
+
+
+def _preparar_processo():
+    from . import lote, lote_planilha  # noqa: F401
+
+    return os.getpid()
+
+
+def mapear_ordenado(funcao, itens, *argumentos, em_voo=None):
+    """Aplica ``funcao(item, *argumentos)`` a cada item de um iterável, em ordem.
+
+    No máximo ``em_voo`` itens ficam pendentes ao mesmo tempo, de modo que
+    entradas longas (um arquivo lido em blocos) não são carregadas de uma vez.
+    """
+    executor = obter_executor()
+    em_voo = em_voo or numero_processos() + 1
+    pendentes = []
+    try:
+        for item in itens:
+            pendentes.append(executor.submit(funcao, item, *argumentos))
+            while len(pendentes) >= em_voo:
+                yield pendentes.pop(0).result()
+        for futuro in pendentes:
+            yield futuro.result()
+    except BrokenProcessPool as ex:
+        _reiniciar_se_quebrado(ex)
+        raise
+    finally:
+        for futuro in pendentes:
+            futuro.cancel()
+
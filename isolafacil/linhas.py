@@ -0,0 +1,130 @@
+"""Lista de linhas: balanço de energia de uma rede de tubulações por trecho.
+
+Cada trecho tem diâmetro, comprimento, temperatura do fluido, ambiente e a
+especificação do isolamento (material, acabamento, espessura). A perda é
+calculada por metro de tubo a partir da solução cilíndrica da face fria,
+
+    W/m com isolante = q(Tf) · π · D_ext       W/m sem isolante = q(Tq) · π · D
+
+e multiplicada pelo comprimento. Trechos com a mesma especificação (diâmetro,
+temperaturas, vento, material, acabamento e espessura) são resolvidos uma
+única vez, o que numa planta costuma reduzir centenas de trechos a poucas
+dezenas de soluções.
+"""
+import math
+import time
+from dataclasses import dataclass
+
+from . import metricas
+from .economia import co2_ton_por_kwh, custo_kwh, horas_por_ano
+from .solver import resolver_face_fria
+from .transferencia import calcular_q_superficie
+
+COLUNAS = ("tag", "diametro_mm", "comprimento_m", "tq", "to", "material", "acabamento", "espessura_mm")
+OPCIONAIS = {"vento_ms": 0.0}
+ESPECIFICACAO = ("diametro_mm", "tq", "to", "vento_ms", "material", "acabamento", "espessura_mm")
+COLUNAS_RESULTADO = COLUNAS + tuple(OPCIONAIS) + (
+    "tf", "perda_com_w_m", "perda_sem_w_m", "perda_com_kw", "perda_sem_kw",
+    "eco_anual", "co2_ton_ano", "status")
+
+
+@dataclass(frozen=True)
+class ResultadoLinhas:
+    trechos: object          # DataFrame com COLUNAS_RESULTADO, na ordem de entrada
+    especificacoes: int      # soluções distintas efetivamente calculadas
+    resumo: dict
+
+
+def _solucao_por_metro(especificacao, isolantes, acabamentos):
+    """(Tf, W/m com isolante, W/m sem isolante, status) de uma especificação."""
+    D_mm, Tq, To, vento, material, acabamento, L_mm = especificacao
+    if material not in isolantes:
+        return None, None, None, f"material desconhecido: {material}"
+    if acabamento not in acabamentos:
+        return None, None, None, f"acabamento desconhecido: {acabamento}"
+    if not isolantes[material].aceita(Tq):
+        return None, None, None, "Tq fora dos limites do material"
+    if not (D_mm > 0 and L_mm > 0):
+        return None, None, None, "diâmetro ou espessura inválidos"
+    if not Tq > To:
+        return None, None, None, "Tq deve ser maior que To"
+
+    D, L = D_mm / 1000, L_mm / 1000
+    emissividade = acabamentos[acabamento].emissividade
+    resultado = resolver_face_fria(Tq, To, L, isolantes[material].k_func_str, "Tubulação", emissividade, D, vento)
+    if not resultado.convergiu:
+        return None, None, None, f"não convergiu: {resultado.status}"
+    perda_sem = calcular_q_superficie(Tq, To, "Tubulação", emissividade, D, vento) * math.pi * D
+    return resultado.Tf, resultado.q * math.pi * (D + 2 * L), perda_sem, "ok"
+
+
+def avaliar_linhas(trechos, isolantes, acabamentos, financeiro=None):
+    """Perdas por trecho e totais da lista de linhas.
+
+    ``trechos`` é um DataFrame (ou algo aceito por ``pd.DataFrame``) com
+    COLUNAS e, opcionalmente, ``vento_ms``. ``financeiro`` é None ou um
+    dicionário com ``combustivel``, ``valor_comb``, ``h_dia`` e ``d_sem``,
+    como em ``lote_planilha``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    inicio = time.perf_counter()
+    trechos = pd.DataFrame(trechos)
+    faltando = [c for c in COLUNAS if c not in trechos.columns]
+    if faltando:
+        raise ValueError(f"colunas ausentes: {', '.join(faltando)}")
+    trechos = trechos.copy()
+    for coluna, padrao in OPCIONAIS.items():
+        if coluna not in trechos.columns:
+            trechos[coluna] = padrao
+    for coluna in ("diametro_mm", "comprimento_m", "tq", "to", "espessura_mm") + tuple(OPCIONAIS):
+        trechos[coluna] = pd.to_numeric(trechos[coluna], errors="coerce").fillna(OPCIONAIS.get(coluna, np.nan))
+    for coluna in ("tag", "material", "acabamento"):
+        trechos[coluna] = trechos[coluna].fillna("").astype(str).str.strip()
+
+    # Uma solução por especificação distinta; cada trecho aponta para a sua.
+    especificacoes = list(trechos[list(ESPECIFICACAO)].itertuples(index=False, name=None))
+    solucoes = {}
+    for especificacao in especificacoes:
+        if especificacao not in solucoes:
+            solucoes[especificacao] = _solucao_por_metro(especificacao, isolantes, acabamentos)
+    por_trecho = [solucoes[e] for e in especificacoes]
+    tf = np.array([s[0] for s in por_trecho], dtype=float)
+    com_w_m = np.array([s[1] for s in por_trecho], dtype=float)
+    sem_w_m = np.array([s[2] for s in por_trecho], dtype=float)
+    status = np.array([s[3] for s in por_trecho], dtype=object)
+
+    comprimento = trechos["comprimento_m"].to_numpy(float)
+    status = np.where((status == "ok") & ~(comprimento > 0), "comprimento inválido", status)
+    ok = status == "ok"
+    resultado = trechos[list(COLUNAS) + list(OPCIONAIS)].copy()
+    resultado["tf"] = tf
+    resultado["perda_com_w_m"] = com_w_m
+    resultado["perda_sem_w_m"] = sem_w_m
+    resultado["perda_com_kw"] = np.where(ok, com_w_m * comprimento / 1000, np.nan)
+    resultado["perda_sem_kw"] = np.where(ok, sem_w_m * comprimento / 1000, np.nan)
+    resultado["eco_anual"] = np.nan
+    resultado["co2_ton_ano"] = np.nan
+    if financeiro is not None:
+        energia_kwh_ano = ((resultado["perda_sem_kw"] - resultado["perda_com_kw"]).to_numpy()
+                           * horas_por_ano(financeiro["h_dia"], financeiro["d_sem"]))
+        resultado["eco_anual"] = energia_kwh_ano * custo_kwh(financeiro["combustivel"], financeiro.get("valor_comb"))
+        resultado["co2_ton_ano"] = energia_kwh_ano * co2_ton_por_kwh(financeiro["combustivel"])
+    resultado["status"] = status
+
+    validos = resultado[ok]
+    resumo = {
+        "trechos": len(resultado),
+        "calculados": int(ok.sum()),
+        "com_erro": int((~ok).sum()),
+        "comprimento_m": float(validos["comprimento_m"].sum()),
+        "perda_com_kw": float(validos["perda_com_kw"].sum()),
+        "perda_sem_kw": float(validos["perda_sem_kw"].sum()),
+        "eco_anual": float(validos["eco_anual"].sum()) if financeiro is not None else 0.0,
+        "co2_ton_ano": float(validos["co2_ton_ano"].sum()) if financeiro is not None else 0.0,
+        "calculo_financeiro": financeiro is not None,
+    }
+    metricas.registrar("lista_linhas", time.perf_counter() - inicio, trechos=len(resultado),
+                       especificacoes=len(solucoes))
+    return ResultadoLinhas(resultado[list(COLUNAS_RESULTADO)], len(solucoes), resumo)
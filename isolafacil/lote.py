@@ -0,0 +1,119 @@
+"""Solução simultânea de muitas superfícies com NumPy.
+
+Cada linha é um caso independente (face quente, ambiente, espessura,
+geometria, acabamento, vento e material). O balanço de energia de todas as
+linhas é resolvido ao mesmo tempo pelo método de Illinois (falsa posição
+modificada), sempre dentro do colchete [To, Tq] de cada linha.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import metricas
+from .condutividade import compilar_k
+from .solver import MAX_ITER, TOLERANCIA_Q, TOLERANCIA_T
+from .transferencia import calcular_q_superficie_vetorizado
+
+GEOMETRIAS = ("Superfície Plana", "Tubulação")
+
+
+class _CondutividadeLote:
+    """Avalia k(T) agrupando as linhas por fórmula, uma chamada vetorizada por material."""
+
+    def __init__(self, k_func):
+        formulas, self.indice = np.unique(np.asarray(k_func, dtype=object).astype(str), return_inverse=True)
+        self.grupos = [(compilar_k(formula), np.flatnonzero(self.indice == i)) for i, formula in enumerate(formulas)]
+
+    def __call__(self, T_media):
+        k = np.empty_like(T_media)
+        for formula, linhas in self.grupos:
+            k[linhas] = formula.vetorizada(T_media[linhas])
+        return k
+
+
+def _coluna(valores, n, dtype):
+    return np.broadcast_to(np.asarray(valores, dtype=dtype), (n,)).copy()
+
+
+def resolver_lote(Tq, To, espessura_m, geometria, emissividade, k_func, diametro_m=0.0, vento_ms=0.0,
+                  tol_T=TOLERANCIA_T, tol_q=TOLERANCIA_Q, max_iter=MAX_ITER, Tf_inicial=None):
+    """Resolve Tf e as perdas com e sem isolante para todas as linhas.
+
+    Os argumentos aceitam arrays ou escalares (que são replicados). Retorna um
+    DataFrame com ``tf`` [°C], ``perda_com_kw`` e ``perda_sem_kw`` [kW/m²],
+    ``convergiu`` e ``iteracoes``.
+    """
+    inicio = time.perf_counter()
+    n = max(np.size(x) for x in (Tq, To, espessura_m, geometria, emissividade, k_func, diametro_m, vento_ms))
+    Tq, To, L, D, emissividade, vento = (_coluna(x, n, float) for x in (Tq, To, espessura_m, diametro_m, emissividade, vento_ms))
+    geometria = _coluna(geometria, n, object)
+    tubulacao = geometria == "Tubulação"
+    k_lote = _CondutividadeLote(_coluna(k_func, n, object))
+
+    r_inner = D / 2
+    r_outer = r_inner + L
+    valido = (L > 0) & (~tubulacao | (D > 0)) & np.isin(geometria, GEOMETRIAS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        resistencia = np.where(tubulacao, r_outer * np.log(r_outer / r_inner), L)
+    resistencia = np.where(valido, resistencia, 1.0)
+    D_ext = np.where(tubulacao, 2 * r_outer, L)
+
+    avaliacoes = 0
+
+    def balanco(Tf):
+        nonlocal avaliacoes
+        avaliacoes += n
+        k = k_lote((Tq + Tf) / 2)
+        q_superficie = calcular_q_superficie_vetorizado(Tf, To, tubulacao, emissividade, D_ext, vento)
+        return k * (Tq - Tf) / resistencia - q_superficie
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        a, b = To.copy(), Tq.copy()
+        fa, fb = balanco(a), balanco(b)
+        if Tf_inicial is not None:
+            x = np.clip(_coluna(Tf_inicial, n, float), np.minimum(a, b), np.maximum(a, b))
+            fx = balanco(x)
+            mesmo_lado_a = (fx > 0) == (fa > 0)
+            a, fa = np.where(mesmo_lado_a, x, a), np.where(mesmo_lado_a, fx, fa)
+            b, fb = np.where(mesmo_lado_a, b, x), np.where(mesmo_lado_a, fb, fx)
+
+        valido &= np.isfinite(fa) & np.isfinite(fb) & (((fa > 0) != (fb > 0)) | (Tq == To))
+        ativo = valido & (np.abs(fb) > tol_q) & (np.abs(b - a) > tol_T)
+        iteracoes = np.zeros(n, dtype=int)
+        lado_anterior = np.zeros(n, dtype=int)
+        for _ in range(max_iter):
+            if not ativo.any():
+                break
+            c = b - fb * (b - a) / (fb - fa)
+            fora = ~np.isfinite(c) | (c <= np.minimum(a, b)) | (c >= np.maximum(a, b))
+            c = np.where(fora, (a + b) / 2, c)
+            fc = balanco(c)
+
+            troca = (fc > 0) != (fb > 0)
+            # Illinois: quando a mesma ponta fica parada duas vezes, o seu resíduo é dividido por 2.
+            repetiu = ~troca & (lado_anterior == -1)
+            novo_a = np.where(troca, b, a)
+            novo_fa = np.where(troca, fb, np.where(repetiu, fa / 2, fa))
+            a = np.where(ativo, novo_a, a)
+            fa = np.where(ativo, novo_fa, fa)
+            b = np.where(ativo, c, b)
+            fb = np.where(ativo, fc, fb)
+            lado_anterior = np.where(ativo, np.where(troca, 1, -1), lado_anterior)
+            iteracoes += ativo
+            ativo &= (np.abs(fb) > tol_q) & (np.abs(b - a) > tol_T)
+
+        convergiu = valido & ~ativo
+        Tf = np.where(convergiu, b, np.nan)
+        perda_com = calcular_q_superficie_vetorizado(Tf, To, tubulacao, emissividade, D_ext, vento)
+        perda_sem = calcular_q_superficie_vetorizado(Tq, To, tubulacao, emissividade, np.where(tubulacao, D, 0.0), vento)
+
+    metricas.registrar("solver_lote", time.perf_counter() - inicio, linhas=n, convergidas=int(convergiu.sum()),
+                       iteracoes=int(iteracoes.sum()), avaliacoes_k=avaliacoes)
+    return pd.DataFrame({
+        "tf": Tf,
+        "perda_com_kw": perda_com / 1000,
+        "perda_sem_kw": perda_sem / 1000,
+        "convergiu": convergiu,
+        "iteracoes": iteracoes,
+    })
@@ -0,0 +1,259 @@
+"""Cálculo em lote a partir de uma planilha CSV ou Excel de itens.
+
+Cada linha é um item (tag, geometria, diâmetro, Tq, To, material, acabamento
+e espessura). A extensão do item é a área (``area_m2``) de uma superfície
+plana ou o comprimento (``comprimento_m``) de uma tubulação, cuja perda é
+tomada por metro de tubo, como na aba de cálculo quente. O arquivo é lido em blocos, cada bloco é resolvido de uma vez
+por ``resolver_lote`` e escrito em seguida no CSV de resultados e no
+relatório consolidado, de modo que a memória usada não cresce com o número
+de linhas.
+"""
+import csv
+import io
+import itertools
+import unicodedata
+
+from . import metricas
+from .economia import SEMANAS_POR_MES, co2_ton_por_kwh, custo_kwh
+
+COLUNAS = ("tag", "geometria", "diametro_mm", "tq", "to", "material", "acabamento", "espessura_mm")
+OPCIONAIS = {"area_m2": 1.0, "comprimento_m": 1.0, "vento_ms": 0.0}
+COLUNAS_RESULTADO = COLUNAS + tuple(OPCIONAIS) + (
+    "tf", "perda_com_kw", "perda_sem_kw", "perda_com_kw_m", "perda_sem_kw_m", "eco_mensal", "eco_anual", "reducao_pct", "co2_ton_ano", "status")
+TAMANHO_BLOCO = 500
+BLOCOS_PARALELO = 3   # abaixo disso, criar as tarefas no pool custa mais do que calcular em série
+
+_GEOMETRIAS = {
+    "superficie plana": "Superfície Plana", "plana": "Superfície Plana",
+    "tubulacao": "Tubulação", "tubo": "Tubulação",
+}
+
+
+class ArquivoLoteInvalido(ValueError):
+    pass
+
+
+def _sem_acento(texto):
+    return "".join(c for c in unicodedata.normalize("NFKD", str(texto)) if not unicodedata.combining(c)).strip().lower()
+
+
+def _normalizar(bloco):
+    import pandas as pd
+
+    bloco = bloco.rename(columns=lambda nome: _sem_acento(nome).replace(" ", "_"))
+    faltando = [c for c in COLUNAS if c not in bloco.columns]
+    if faltando:
+        raise ArquivoLoteInvalido(f"colunas ausentes: {', '.join(faltando)}")
+    for coluna, padrao in OPCIONAIS.items():
+        if coluna not in bloco.columns:
+            bloco[coluna] = padrao
+    bloco = bloco[list(COLUNAS) + list(OPCIONAIS)].copy()
+    for coluna in ("diametro_mm", "tq", "to", "espessura_mm") + tuple(OPCIONAIS):
+        # Sempre float: um bloco só com inteiros não pode sair no CSV com outra formatação.
+        bloco[coluna] = pd.to_numeric(bloco[coluna].astype(str).str.replace(",", ".", regex=False),
+                                      errors="coerce").astype(float)
+    for coluna, padrao in OPCIONAIS.items():
+        bloco[coluna] = bloco[coluna].fillna(padrao)
+    bloco["diametro_mm"] = bloco["diametro_mm"].fillna(0.0)
+    bloco["geometria"] = bloco["geometria"].map(lambda g: _GEOMETRIAS.get(_sem_acento(g), g))
+    for coluna in ("tag", "material", "acabamento"):
+        bloco[coluna] = bloco[coluna].fillna("").astype(str).str.strip()
+    return bloco
+
+
+def _blocos_excel(arquivo, tamanho_bloco):
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    # read_only percorre a planilha linha a linha, sem carregar a pasta inteira.
+    pasta = load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        linhas = pasta.worksheets[0].iter_rows(values_only=True)
+        cabecalho = [str(c) if c is not None else "" for c in next(linhas, ())]
+        acumuladas = []
+        for linha in linhas:
+            if all(c is None for c in linha):
+                continue
+            acumuladas.append(linha)
+            if len(acumuladas) == tamanho_bloco:
+                yield pd.DataFrame(acumuladas, columns=cabecalho)
+                acumuladas = []
+        if acumuladas:
+            yield pd.DataFrame(acumuladas, columns=cabecalho)
+    finally:
+        pasta.close()
+
+
+def ler_blocos(arquivo, nome_arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    """Lê o arquivo (.csv, .xlsx ou .xlsm) em DataFrames de até ``tamanho_bloco`` linhas já normalizadas."""
+    import pandas as pd
+
+    extensao = nome_arquivo.rsplit(".", 1)[-1].lower()
+    if extensao == "csv":
+        amostra = arquivo.read(4096)
+        arquivo.seek(0)
+        if isinstance(amostra, bytes):
+            amostra = amostra.decode("utf-8-sig", errors="ignore")
+        separador = ";" if amostra.count(";") > amostra.count(",") else ","
+        blocos = pd.read_csv(arquivo, sep=separador, chunksize=tamanho_bloco, dtype=str, encoding="utf-8-sig")
+    elif extensao in ("xlsx", "xlsm"):
+        blocos = _blocos_excel(arquivo, tamanho_bloco)
+    else:
+        raise ArquivoLoteInvalido(f"formato não suportado: .{extensao}")
+    for bloco in blocos:
+        yield _normalizar(bloco)
+
+
+def contar_linhas(arquivo, nome_arquivo):
+    """Número de itens do arquivo, para a barra de progresso (None se não for possível saber sem ler tudo)."""
+    extensao = nome_arquivo.rsplit(".", 1)[-1].lower()
+    if extensao != "csv":
+        return None
+    total = 0
+    for pedaco in iter(lambda: arquivo.read(1 << 20), b""):
+        total += pedaco.count(b"\n")
+    arquivo.seek(0)
+    return max(total - 1, 0)
+
+
+def perdas_item(resultado):
+    """(com, sem isolante) em kW de cada item: kW/m² × área na superfície plana, kW/m × comprimento na tubulação."""
+    import numpy as np
+
+    tubo = (resultado["geometria"] == "Tubulação").to_numpy()
+    com = np.where(tubo, resultado["perda_com_kw_m"] * resultado["comprimento_m"],
+                   resultado["perda_com_kw"] * resultado["area_m2"])
+    sem = np.where(tubo, resultado["perda_sem_kw_m"] * resultado["comprimento_m"],
+                   resultado["perda_sem_kw"] * resultado["area_m2"])
+    return com, sem
+
+
+def calcular_bloco(bloco, isolantes, acabamentos, financeiro=None):
+    """Resolve as linhas de um bloco normalizado.
+
+    ``financeiro`` é None ou um dicionário com ``combustivel``, ``valor_comb``,
+    ``h_dia`` e ``d_sem``. ``perda_com_kw``/``perda_sem_kw`` são os fluxos em
+    kW/m² da face; nas tubulações ``perda_com_kw_m``/``perda_sem_kw_m`` dão a
+    perda por metro de tubo. Como na aba de cálculo quente, a economia usa a
+    área da superfície plana e o comprimento da tubulação (``perdas_item``).
+    Linhas inválidas recebem o motivo em ``status`` e ficam sem resultado.
+    """
+    import numpy as np
+
+    from .lote import resolver_lote
+
+    n = len(bloco)
+    status = np.full(n, "", dtype=object)
+    k_func = np.full(n, "0.04", dtype=object)
+    emissividade = np.full(n, 0.9)
+    for i, (material, acabamento, Tq) in enumerate(zip(bloco["material"], bloco["acabamento"], bloco["tq"])):
+        if material not in isolantes:
+            status[i] = f"material desconhecido: {material}"
+        elif acabamento not in acabamentos:
+            status[i] = f"acabamento desconhecido: {acabamento}"
+        elif not isolantes[material].aceita(Tq):
+            status[i] = f"Tq fora dos limites do material ({isolantes[material].T_min} a {isolantes[material].T_max} °C)"
+        else:
+            k_func[i] = isolantes[material].k_func_str
+            emissividade[i] = acabamentos[acabamento].emissividade
+
+    Tq, To = bloco["tq"].to_numpy(float), bloco["to"].to_numpy(float)
+    espessura, diametro = bloco["espessura_mm"].to_numpy(float), bloco["diametro_mm"].to_numpy(float)
+    geometria = bloco["geometria"].to_numpy(object)
+    status[(status == "") & ~(np.isfinite(Tq) & np.isfinite(To) & (Tq > To))] = "Tq deve ser maior que To"
+    status[(status == "") & ~(espessura > 0)] = "espessura inválida"
+    status[(status == "") & ~np.isin(geometria, ("Superfície Plana", "Tubulação"))] = "geometria inválida"
+    status[(status == "") & (geometria == "Tubulação") & ~(diametro > 0)] = "diâmetro inválido"
+
+    resultado = bloco.copy()
+    validas = status == ""
+    tf = np.full(n, np.nan)
+    perda_com, perda_sem = np.full(n, np.nan), np.full(n, np.nan)
+    if validas.any():
+        lote = resolver_lote(Tq[validas], To[validas], espessura[validas] / 1000, geometria[validas],
+                             emissividade[validas], k_func[validas], diametro[validas] / 1000,
+                             bloco["vento_ms"].to_numpy(float)[validas])
+        tf[validas] = lote["tf"].to_numpy()
+        perda_com[validas] = lote["perda_com_kw"].to_numpy()
+        perda_sem[validas] = lote["perda_sem_kw"].to_numpy()
+        status[validas] = np.where(lote["convergiu"].to_numpy(), "ok", "não convergiu")
+    resultado["tf"], resultado["perda_com_kw"], resultado["perda_sem_kw"] = tf, perda_com, perda_sem
+    # kW/m de tubo: fluxo na face externa do isolante (com) ou na parede do tubo (sem).
+    tubo = geometria == "Tubulação"
+    resultado["perda_com_kw_m"] = np.where(tubo, perda_com * np.pi * (diametro + 2 * espessura) / 1000, np.nan)
+    resultado["perda_sem_kw_m"] = np.where(tubo, perda_sem * np.pi * diametro / 1000, np.nan)
+
+    for coluna in ("eco_mensal", "eco_anual", "reducao_pct", "co2_ton_ano"):
+        resultado[coluna] = np.nan
+    if financeiro is not None:
+        combustivel = financeiro["combustivel"]
+        item_com, item_sem = perdas_item(resultado)
+        economia_kw = item_sem - item_com
+        eco_mensal = (economia_kw * custo_kwh(combustivel, financeiro.get("valor_comb"))
+                      * financeiro["h_dia"] * financeiro["d_sem"] * SEMANAS_POR_MES)
+        resultado["eco_mensal"] = eco_mensal
+        resultado["eco_anual"] = eco_mensal * 12
+        with np.errstate(divide="ignore", invalid="ignore"):
+            resultado["reducao_pct"] = np.where(item_sem > 0, economia_kw / item_sem * 100, 0.0)
+        resultado["co2_ton_ano"] = (economia_kw * financeiro["h_dia"] * financeiro["d_sem"]
+                                    * SEMANAS_POR_MES * 12 * co2_ton_por_kwh(combustivel))
+    resultado["status"] = status
+    return resultado[list(COLUNAS_RESULTADO)]
+
+
+@metricas.cronometrado("lote_planilha", lambda resumo: {"linhas": resumo["linhas"], "com_erro": resumo["com_erro"]})
+def processar_arquivo(arquivo, nome_arquivo, isolantes, acabamentos, saida_csv, relatorio=None, financeiro=None,
+                      tamanho_bloco=TAMANHO_BLOCO, progresso=None, paralelo=False):
+    """Calcula todas as linhas do arquivo, bloco a bloco.
+
+    Os resultados são escritos em ``saida_csv`` (arquivo de texto aberto) e, se
+    ``relatorio`` for dado (``RelatorioConsolidado``), acrescentados a ele.
+    ``progresso(linhas_processadas)`` é chamado ao fim de cada bloco. Com
+    ``paralelo``, os blocos são calculados no pool de processos, mantendo a
+    ordem do arquivo, desde que o arquivo tenha ao menos ``BLOCOS_PARALELO``
+    blocos. Retorna um resumo com contagens e totais.
+    """
+    resumo = {"linhas": 0, "calculadas": 0, "com_erro": 0, "perda_com_kw": 0.0, "perda_sem_kw": 0.0,
+              "eco_anual": 0.0, "co2_ton_ano": 0.0, "calculo_financeiro": financeiro is not None}
+    escritor = csv.writer(saida_csv, delimiter=";", lineterminator="\n")
+    escritor.writerow(COLUNAS_RESULTADO)
+    blocos = ler_blocos(arquivo, nome_arquivo, tamanho_bloco)
+    if paralelo:
+        # Decidido pelos primeiros blocos lidos: no Excel o total de linhas só se sabe lendo o arquivo inteiro.
+        iniciais = list(itertools.islice(blocos, BLOCOS_PARALELO))
+        blocos = itertools.chain(iniciais, blocos)
+        paralelo = len(iniciais) == BLOCOS_PARALELO
+    if paralelo:
+        from .execucao import mapear_ordenado
+
+        resultados = mapear_ordenado(calcular_bloco, blocos, isolantes, acabamentos, financeiro)
+    else:
+        resultados = (calcular_bloco(bloco, isolantes, acabamentos, financeiro) for bloco in blocos)
+    for resultado in resultados:
+        escritor.writerows(resultado.itertuples(index=False, name=None))
+        if relatorio is not None:
+            relatorio.adicionar_itens(resultado)
+
+        ok = resultado["status"] == "ok"
+        item_com, item_sem = perdas_item(resultado[ok])
+        resumo["linhas"] += len(resultado)
+        resumo["calculadas"] += int(ok.sum())
+        resumo["com_erro"] += int((~ok).sum())
+        resumo["perda_com_kw"] += float(item_com.sum())
+        resumo["perda_sem_kw"] += float(item_sem.sum())
+        if financeiro is not None:
+            resumo["eco_anual"] += float(resultado.loc[ok, "eco_anual"].sum())
+            resumo["co2_ton_ano"] += float(resultado.loc[ok, "co2_ton_ano"].sum())
+        if progresso is not None:
+            progresso(resumo["linhas"])
+    return resumo
+
+
+def processar_para_bytes(dados_arquivo, nome_arquivo, isolantes, acabamentos, relatorio=None, financeiro=None,
+                         tamanho_bloco=TAMANHO_BLOCO, progresso=None, paralelo=False):
+    """Atalho para arquivos já em memória (upload): retorna (csv_bytes, resumo)."""
+    saida = io.StringIO()
+    resumo = processar_arquivo(io.BytesIO(dados_arquivo), nome_arquivo, isolantes, acabamentos, saida, relatorio,
+                               financeiro, tamanho_bloco, progresso, paralelo)
+    return saida.getvalue().encode("utf-8-sig"), resumo
+
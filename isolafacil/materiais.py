@@ -0,0 +1,129 @@
+"""Registro imutável de materiais isolantes e acabamentos.
+
+Montado uma única vez a partir das linhas da planilha: cada material já
+traz a fórmula k(T) compilada e os limites de temperatura, e o registro
+mantém um índice por faixa de temperatura para listar, por busca binária,
+os materiais adequados a uma dada temperatura de operação.
+"""
+import bisect
+import math
+from dataclasses import dataclass
+
+from . import metricas
+from .condutividade import FormulaK, FormulaKInvalida, validar_k
+
+T_MIN_PADRAO = -999
+T_MAX_PADRAO = 9999
+EMISSIVIDADE_PADRAO = 0.9
+
+
+@dataclass(frozen=True, slots=True)
+class Material:
+    nome: str
+    k_func_str: str
+    k: FormulaK
+    T_min: float
+    T_max: float
+
+    def aceita(self, T):
+        return self.T_min <= T <= self.T_max
+
+
+@dataclass(frozen=True, slots=True)
+class Acabamento:
+    nome: str
+    emissividade: float
+
+
+def _numero(valor, padrao):
+    try:
+        numero = float(str(valor).replace(',', '.'))
+    except ValueError:
+        return padrao
+    return padrao if math.isnan(numero) else numero
+
+
+class RegistroMateriais:
+    __slots__ = ("_por_nome", "nomes", "_pontos", "_no_ponto", "_entre")
+
+    def __init__(self, materiais):
+        self._por_nome = {m.nome: m for m in materiais}
+        self.nomes = tuple(self._por_nome)
+        # Os extremos das faixas dividem o eixo de temperatura em pontos e intervalos
+        # abertos; para cada um guarda-se a tupla de materiais válidos (na ordem da planilha).
+        self._pontos = sorted({T for m in self._por_nome.values() for T in (m.T_min, m.T_max)})
+        self._no_ponto = tuple(self._validos(lambda m, p=p: m.aceita(p)) for p in self._pontos)
+        limites = [float("-inf")] + self._pontos + [float("inf")]
+        self._entre = tuple(self._validos(lambda m, a=a, b=b: m.T_min <= a and b <= m.T_max)
+                            for a, b in zip(limites, limites[1:]))
+
+    def _validos(self, condicao):
+        return tuple(nome for nome, m in self._por_nome.items() if condicao(m))
+
+    def __getitem__(self, nome):
+        return self._por_nome[nome]
+
+    def __contains__(self, nome):
+        return nome in self._por_nome
+
+    def __iter__(self):
+        return iter(self._por_nome.values())
+
+    def __len__(self):
+        return len(self._por_nome)
+
+    def validos_para(self, T):
+        """Nomes dos materiais cuja faixa [T_min, T_max] contém T."""
+        i = bisect.bisect_left(self._pontos, T)
+        if i < len(self._pontos) and self._pontos[i] == T:
+            return self._no_ponto[i]
+        return self._entre[i]
+
+
+class RegistroAcabamentos:
+    __slots__ = ("_por_nome", "nomes")
+
+    def __init__(self, acabamentos):
+        self._por_nome = {a.nome: a for a in acabamentos}
+        self.nomes = tuple(self._por_nome)
+
+    def __getitem__(self, nome):
+        return self._por_nome[nome]
+
+    def __contains__(self, nome):
+        return nome in self._por_nome
+
+    def __iter__(self):
+        return iter(self._por_nome.values())
+
+    def __len__(self):
+        return len(self._por_nome)
+
+
+@metricas.cronometrado("catalogo_montagem", lambda r: {"materiais": len(r[0]), "rejeitados": len(r[1])})
+def montar_materiais(registros):
+    """Cria o registro a partir das linhas da aba 'Isolantes 2'.
+
+    Retorna (registro, rejeitados), onde rejeitados lista (nome, fórmula, erro)
+    das linhas cuja fórmula k(T) não passou na validação.
+    """
+    materiais, rejeitados = [], []
+    for linha in registros:
+        nome, k_func_str = str(linha['nome']), str(linha['k_func'])
+        T_min = _numero(linha.get('T_min'), T_MIN_PADRAO)
+        T_max = _numero(linha.get('T_max'), T_MAX_PADRAO)
+        try:
+            k = validar_k(k_func_str, T_min, T_max)
+        except FormulaKInvalida as ex:
+            rejeitados.append((nome, k_func_str, ex))
+            continue
+        materiais.append(Material(nome, k_func_str, k, T_min, T_max))
+    return RegistroMateriais(materiais), rejeitados
+
+
+def montar_acabamentos(registros):
+    """Cria o registro a partir das linhas da aba 'Emissividade'."""
+    return RegistroAcabamentos(
+        Acabamento(str(linha['acabamento']), _numero(linha.get('emissividade'), EMISSIVIDADE_PADRAO))
+        for linha in registros
+    )
@@ -0,0 +1,218 @@
+"""Contadores e tempos das etapas mais caras: catálogo, solvers e relatórios.
+
+Cada etapa medida alimenta três destinos:
+
+- o registro do processo (``REGISTRO``), exportável no formato de texto do
+  Prometheus por ``texto_prometheus``;
+- o rastro da requisição em andamento, quando há um (``iniciar_rastro``),
+  usado no painel de depuração da interface e no cabeçalho Server-Timing da API;
+- o logger ``isolafacil.metricas``, com uma linha JSON por evento; para
+  gravar em arquivo use ``exportar_jsonl`` ou a variável de ambiente
+  ``ISOLAFACIL_METRICAS_JSONL``.
+
+Detalhes numéricos de um evento (iterações, avaliações de k...) viram
+contadores; ``status`` vira rótulo do tempo, e por isso deve ter poucos
+valores possíveis. Cálculos feitos no pool de processos (``execucao``) são
+contados no registro de cada processo filho, não no do processo principal.
+"""
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+PREFIXO = "isolafacil"
+
+_log = logging.getLogger("isolafacil.metricas")
+_rastro = contextvars.ContextVar("isolafacil_rastro", default=None)
+
+
+def _rotulos_texto(rotulos):
+    if not rotulos:
+        return ""
+    return "{" + ",".join(f'{chave}="{valor}"' for chave, valor in rotulos) + "}"
+
+
+class Registro:
+    """Acumuladores do processo, compartilhados por todas as sessões (threads)."""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._contadores = {}   # (nome, rótulos) -> total
+        self._tempos = {}       # (nome, rótulos) -> [soma, contagem, máximo]
+
+    def acumular(self, chave_tempo, segundos, contadores=()):
+        """Um tempo e vários contadores ((chave, valor), ...) sob uma única trava."""
+        with self._trava:
+            acumulado = self._tempos.get(chave_tempo)
+            if acumulado is None:
+                self._tempos[chave_tempo] = [segundos, 1, segundos]
+            else:
+                acumulado[0] += segundos
+                acumulado[1] += 1
+                if segundos > acumulado[2]:
+                    acumulado[2] = segundos
+            for chave, valor in contadores:
+                self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def limpar(self):
+        with self._trava:
+            self._contadores.clear()
+            self._tempos.clear()
+
+    def instantaneo(self):
+        """(contadores, tempos): cópias com chaves (nome, rótulos); tempos como (soma, contagem, máximo)."""
+        with self._trava:
+            return dict(self._contadores), {chave: tuple(valor) for chave, valor in self._tempos.items()}
+
+    def texto_prometheus(self):
+        contadores, tempos = self.instantaneo()
+        linhas = []
+        for nome in sorted({nome for nome, _ in tempos}):
+            serie = sorted((rotulos, valor) for (n, rotulos), valor in tempos.items() if n == nome)
+            metrica = f"{PREFIXO}_{nome}_segundos"
+            linhas.append(f"# TYPE {metrica} summary")
+            for rotulos, (soma, contagem, _) in serie:
+                linhas.append(f"{metrica}_sum{_rotulos_texto(rotulos)} {soma:.9g}")
+                linhas.append(f"{metrica}_count{_rotulos_texto(rotulos)} {contagem}")
+            linhas.append(f"# TYPE {metrica}_max gauge")
+            for rotulos, (_, _, maximo) in serie:
+                linhas.append(f"{metrica}_max{_rotulos_texto(rotulos)} {maximo:.9g}")
+        for nome in sorted({nome for nome, _ in contadores}):
+            metrica = f"{PREFIXO}_{nome}_total"
+            linhas.append(f"# TYPE {metrica} counter")
+            for (n, rotulos), total in sorted(contadores.items()):
+                if n == nome:
+                    linhas.append(f"{metrica}{_rotulos_texto(rotulos)} {total:.9g}")
+        return "\n".join(linhas) + "\n"
+
+
+REGISTRO = Registro()
+
+
+class Rastro:
+    """Eventos de uma requisição (um rerun do Streamlit, uma chamada da API)."""
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.inicio = time.perf_counter()
+        self.eventos = []
+
+    def adicionar(self, etapa, segundos, detalhes):
+        self.eventos.append((etapa, segundos, detalhes))
+
+    def duracao(self):
+        return time.perf_counter() - self.inicio
+
+    def resumo(self):
+        """Uma linha por etapa: chamadas, tempo total e máximo [ms] e a soma dos detalhes numéricos."""
+        etapas = {}
+        for etapa, segundos, detalhes in self.eventos:
+            linha = etapas.setdefault(etapa, {"etapa": etapa, "chamadas": 0, "total_ms": 0.0, "max_ms": 0.0})
+            linha["chamadas"] += 1
+            linha["total_ms"] += segundos * 1000
+            linha["max_ms"] = max(linha["max_ms"], segundos * 1000)
+            for campo, valor in detalhes.items():
+                if campo == "status":
+                    campo, valor = f"status_{valor}", 1
+                if valor.__class__ is int or valor.__class__ is float:
+                    linha[campo] = linha.get(campo, 0) + valor
+        return sorted(etapas.values(), key=lambda linha: -linha["total_ms"])
+
+
+def iniciar_rastro(nome="requisicao"):
+    rastro = Rastro(nome)
+    _rastro.set(rastro)
+    return rastro
+
+
+def rastro_atual():
+    return _rastro.get()
+
+
+# --- REGISTRO DE EVENTOS ---
+_chaves = {}
+
+
+def _chave(etapa, campo, status):
+    # Chaves do registro montadas uma vez e reaproveitadas: o solver registra cada solução.
+    chave = _chaves.get((etapa, campo, status))
+    if chave is None:
+        nome = etapa if campo is None else f"{etapa}_{campo}"
+        chave = _chaves.setdefault((etapa, campo, status), (nome, () if status is None else (("status", status),)))
+    return chave
+
+
+def _publicar(etapa, segundos, detalhes):
+    rastro = _rastro.get()
+    if rastro is not None:
+        rastro.adicionar(etapa, segundos, detalhes)
+    if _log.isEnabledFor(logging.INFO):
+        _log.info(json.dumps({"ts": time.time(), "etapa": etapa, "ms": round(segundos * 1000, 3), **detalhes},
+                             ensure_ascii=False, default=str))
+
+
+def registrar(etapa, segundos, **detalhes):
+    contadores = [(_chave(etapa, campo, None), valor) for campo, valor in detalhes.items()
+                  if valor.__class__ is int or valor.__class__ is float]
+    REGISTRO.acumular(_chave(etapa, None, detalhes.get("status")), segundos, contadores)
+    _publicar(etapa, segundos, detalhes)
+
+
+_SOLUCAO = {convergiu: _chave("solver_face_fria", None, "convergiu" if convergiu else "falhou") for convergiu in (True, False)}
+_SOLUCAO_ITERACOES = _chave("solver_face_fria", "iteracoes", None)
+_SOLUCAO_AVALIACOES = _chave("solver_face_fria", "avaliacoes_k", None)
+
+
+def registrar_solucao(segundos, resultado):
+    """``registrar`` especializado para um ResultadoFaceFria, o evento mais frequente."""
+    REGISTRO.acumular(_SOLUCAO[resultado.convergiu], segundos,
+                      ((_SOLUCAO_ITERACOES, resultado.iteracoes), (_SOLUCAO_AVALIACOES, resultado.avaliacoes)))
+    if _rastro.get() is not None or _log.isEnabledFor(logging.INFO):
+        _publicar("solver_face_fria", segundos, {"status": "convergiu" if resultado.convergiu else "falhou",
+                                                 "iteracoes": resultado.iteracoes, "avaliacoes_k": resultado.avaliacoes})
+
+
+@contextmanager
+def medir(etapa, **detalhes):
+    """Cronometra o bloco; o dicionário entregue pode receber detalhes durante a execução."""
+    inicio = time.perf_counter()
+    try:
+        yield detalhes
+    finally:
+        registrar(etapa, time.perf_counter() - inicio, **detalhes)
+
+
+def cronometrado(etapa, detalhes=None):
+    """Decorador que mede a função inteira; ``detalhes(resultado)`` extrai os detalhes do evento."""
+    def decorador(funcao):
+        @wraps(funcao)
+        def envolvida(*args, **kwargs):
+            inicio = time.perf_counter()
+            resultado = funcao(*args, **kwargs)
+            registrar(etapa, time.perf_counter() - inicio, **(detalhes(resultado) if detalhes else {}))
+            return resultado
+        return envolvida
+    return decorador
+
+
+# --- EXPORTAÇÃO ---
+def texto_prometheus():
+    return REGISTRO.texto_prometheus()
+
+
+def exportar_jsonl(caminho):
+    """Passa a gravar cada evento como uma linha JSON em ``caminho``."""
+    manipulador = logging.FileHandler(caminho, encoding="utf-8")
+    manipulador.setFormatter(logging.Formatter("%(message)s"))
+    _log.addHandler(manipulador)
+    _log.setLevel(logging.INFO)
+    _log.propagate = False
+    return manipulador
+
+
+if os.environ.get("ISOLAFACIL_METRICAS_JSONL"):
+    exportar_jsonl(os.environ["ISOLAFACIL_METRICAS_JSONL"])
@@ -0,0 +1,160 @@
+"""Isolamento em várias camadas, cada uma com o seu material e k(T).
+
+As incógnitas são as temperaturas das interfaces T_1..T_{N-1} e a da face
+fria T_N. Em regime permanente o fluxo (por m² da face externa) é o mesmo
+em todas as camadas e igual ao perdido pela superfície:
+
+    F_i = q_i - q_{i+1},  i = 1..N-1
+    F_N = q_N - (q_conv + q_rad)(T_N)
+
+onde q_i depende só de T_{i-1} e T_i, com k_i avaliado na temperatura média
+da própria camada. O jacobiano é tridiagonal e o sistema acoplado é resolvido
+por Newton amortecido, com o algoritmo de Thomas em cada passo.
+"""
+import math
+from dataclasses import dataclass
+
+from . import metricas
+from .condutividade import FormulaKInvalida, compilar_k
+from .solver import TOLERANCIA_Q, TOLERANCIA_T
+from .transferencia import calcular_q_superficie
+
+MAX_ITER = 50
+_DELTA = 0.01  # °C, para as derivadas numéricas de k(T) e da perda na superfície
+
+
+@dataclass(frozen=True)
+class Camada:
+    espessura: float   # m
+    k_func_str: str
+
+
+@dataclass(frozen=True)
+class ResultadoMulticamada:
+    temperaturas: tuple   # T_1..T_N (interfaces e face fria), °C
+    q: float | None       # W/m² da face externa
+    convergiu: bool
+    status: str
+    iteracoes: int = 0
+    residuo: float = math.nan
+
+    @property
+    def Tf(self):
+        return self.temperaturas[-1] if self.temperaturas else None
+
+    @property
+    def interfaces(self):
+        return self.temperaturas[:-1]
+
+
+def _thomas(inferior, diagonal, superior, termo):
+    n = len(diagonal)
+    c, d = [0.0] * n, [0.0] * n
+    c[0], d[0] = superior[0] / diagonal[0], termo[0] / diagonal[0]
+    for i in range(1, n):
+        m = diagonal[i] - inferior[i] * c[i - 1]
+        c[i] = superior[i] / m if i < n - 1 else 0.0
+        d[i] = (termo[i] - inferior[i] * d[i - 1]) / m
+    x = [0.0] * n
+    x[-1] = d[-1]
+    for i in range(n - 2, -1, -1):
+        x[i] = d[i] - c[i] * x[i + 1]
+    return x
+
+
+@metricas.cronometrado("solver_multicamada", lambda r: {"status": "convergiu" if r.convergiu else "falhou",
+                                                        "iteracoes": r.iteracoes})
+def resolver_multicamada(Tq, To, camadas, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+                         tol_T=TOLERANCIA_T, tol_q=TOLERANCIA_Q, max_iter=MAX_ITER):
+    """Temperaturas de todas as interfaces e da face fria para camadas em série."""
+    camadas = list(camadas)
+    n = len(camadas)
+    if n == 0 or any(c.espessura <= 0 for c in camadas):
+        return ResultadoMulticamada((), None, False, "espessuras inválidas")
+    try:
+        k_funcs = [compilar_k(c.k_func_str) for c in camadas]
+    except FormulaKInvalida as ex:
+        return ResultadoMulticamada((), None, False, f"fórmula k(T) inválida: {ex}")
+
+    # Fator geométrico de cada camada: q_i = k_i * (T_{i-1} - T_i) * fator_i, em W/m² da face externa.
+    if geometry == "Superfície Plana":
+        fatores = [1 / c.espessura for c in camadas]
+        D_ext = sum(c.espessura for c in camadas)
+    elif geometry == "Tubulação" and pipe_diameter_m and pipe_diameter_m > 0:
+        raios = [pipe_diameter_m / 2]
+        for c in camadas:
+            raios.append(raios[-1] + c.espessura)
+        fatores = [1 / (raios[-1] * math.log(raios[i + 1] / raios[i])) for i in range(n)]
+        D_ext = 2 * raios[-1]
+    else:
+        return ResultadoMulticamada((), None, False, "geometria inválida")
+
+    T_baixo, T_alto = min(Tq, To), max(Tq, To)
+
+    def superficie(T):
+        return calcular_q_superficie(T, To, geometry, emissividade, D_ext, wind_speed_ms)
+
+    def camada(i, T_quente, T_fria):
+        # Fluxo da camada i e as derivadas em relação às suas duas faces.
+        T_media = (T_quente + T_fria) / 2
+        k = k_funcs[i](T_media)
+        if not k > 0:
+            raise ValueError(f"k(T={T_media:.1f} °C) = {k:g} na camada {i + 1}")
+        dk = (k_funcs[i](T_media + _DELTA) - k_funcs[i](T_media - _DELTA)) / (2 * _DELTA)
+        diferenca = T_quente - T_fria
+        return (k * diferenca * fatores[i],
+                (k + dk * diferenca / 2) * fatores[i],
+                (-k + dk * diferenca / 2) * fatores[i])
+
+    def sistema(T):
+        faces = [Tq] + T
+        fluxos = [camada(i, faces[i], faces[i + 1]) for i in range(n)]
+        q_sup = superficie(T[-1])
+        residuos = [fluxos[i][0] - fluxos[i + 1][0] for i in range(n - 1)] + [fluxos[-1][0] - q_sup]
+        return residuos, fluxos, q_sup
+
+    try:
+        # Estimativa inicial: perfil proporcional às resistências, com h ≈ 10 W/m².K na superfície.
+        T_media = (Tq + To) / 2
+        resistencias = [1 / (k(T_media) * f) for k, f in zip(k_funcs, fatores)]
+        total = sum(resistencias) + 0.1
+        T, acumulado = [], 0.0
+        for r in resistencias:
+            acumulado += r
+            T.append(Tq - (Tq - To) * acumulado / total)
+
+        residuos, fluxos, q_sup = sistema(T)
+        residuo = max(abs(r) for r in residuos)
+        for iteracao in range(1, max_iter + 1):
+            norma = residuo
+            inferior, diagonal, superior = [0.0] * n, [0.0] * n, [0.0] * n
+            for i in range(n):
+                _, dq_quente, dq_fria = fluxos[i]
+                if i > 0:
+                    inferior[i] = dq_quente
+                if i < n - 1:
+                    _, dq_quente_prox, dq_fria_prox = fluxos[i + 1]
+                    diagonal[i] = dq_fria - dq_quente_prox
+                    superior[i] = -dq_fria_prox
+                else:
+                    dq_sup = (superficie(T[-1] + _DELTA) - superficie(T[-1] - _DELTA)) / (2 * _DELTA)
+                    diagonal[i] = dq_fria - dq_sup
+            passo = _thomas(inferior, diagonal, superior, [-r for r in residuos])
+
+            # Amortecimento: reduz o passo até o resíduo diminuir, sem sair de [To, Tq].
+            fator = 1.0
+            while True:
+                novo = [min(max(t + fator * p, T_baixo), T_alto) for t, p in zip(T, passo)]
+                novos_residuos, novos_fluxos, novo_q_sup = sistema(novo)
+                if max(abs(r) for r in novos_residuos) < norma or fator < 1e-3:
+                    break
+                fator /= 2
+            variacao = max(abs(a - b) for a, b in zip(novo, T))
+            T, residuos, fluxos, q_sup = novo, novos_residuos, novos_fluxos, novo_q_sup
+            residuo = max(abs(r) for r in residuos)
+            if residuo <= tol_q or (fator == 1.0 and variacao <= tol_T):
+                return ResultadoMulticamada(tuple(T), q_sup, True, "convergiu", iteracao, residuo)
+    except (ArithmeticError, ValueError, TypeError) as ex:
+        return ResultadoMulticamada((), None, False, f"erro ao avaliar k(T): {ex}")
+
+    return ResultadoMulticamada(tuple(T), None, False, f"{max_iter} iterações sem atingir a tolerância", max_iter, residuo)
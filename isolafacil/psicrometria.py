@@ -0,0 +1,22 @@
+"""Propriedades do ar úmido usadas no cálculo de condensação."""
+import math
+
+# Constantes da fórmula de Magnus
+A_MAGNUS = 17.27
+B_MAGNUS = 237.7  # °C
+
+
+def temperatura_orvalho(Ta, UR):
+    """Temperatura de orvalho [°C] para temperatura ambiente Ta [°C] e umidade relativa UR [%]."""
+    alfa = ((A_MAGNUS * Ta) / (B_MAGNUS + Ta)) + math.log(UR / 100.0)
+    return (B_MAGNUS * alfa) / (A_MAGNUS - alfa)
+
+
+def temperatura_orvalho_vetorizada(Ta, UR):
+    """Versão NumPy de temperatura_orvalho; UR nula dá -inf (sem condensação)."""
+    import numpy as np
+
+    Ta, UR = np.asarray(Ta, dtype=float), np.asarray(UR, dtype=float)
+    with np.errstate(divide="ignore"):
+        alfa = (A_MAGNUS * Ta) / (B_MAGNUS + Ta) + np.log(UR / 100.0)
+    return (B_MAGNUS * alfa) / (A_MAGNUS - alfa)
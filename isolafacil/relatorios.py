@@ -0,0 +1,324 @@
+"""Relatórios em PDF dos cálculos térmico e de condensação.
+
+Fontes e imagem de fundo são lidas uma única vez por processo: monta-se um
+documento-modelo com a primeira página e as fontes já registradas, e cada
+relatório começa de uma cópia desse modelo.
+"""
+import copy
+import math
+import os
+import threading
+from datetime import datetime
+from io import BytesIO
+
+from . import metricas
+
+PASTA = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_FUNDO = os.path.join(PASTA, 'fundo_relatorio.png')
+FONTES = {'': os.path.join(PASTA, 'DejaVuSans.ttf'), 'B': os.path.join(PASTA, 'DejaVuSans-Bold.ttf')}
+
+_modelo = None
+_bytes_fontes = {}
+_trava = threading.Lock()
+
+
+@metricas.cronometrado("pdf_modelo")
+def _montar_modelo():
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    avisos = []
+    try:
+        for estilo, caminho in FONTES.items():
+            pdf.add_font('DejaVu', estilo, caminho)
+            with open(caminho, 'rb') as arquivo:
+                _bytes_fontes[str(caminho)] = arquivo.read()
+        font_family = 'DejaVu'
+    except (RuntimeError, FileNotFoundError):
+        pdf = FPDF()
+        avisos.append("Arquivos de fonte (DejaVu) não encontrados. PDF usará fonte padrão Arial.")
+        font_family = 'Arial'
+    if not os.path.exists(CAMINHO_FUNDO):
+        avisos.append(f"Aviso: Imagem de fundo '{os.path.basename(CAMINHO_FUNDO)}' não encontrada. O PDF será gerado com fundo branco.")
+    adicionar_pagina(pdf)
+    return pdf, font_family, avisos
+
+
+def _obter_modelo():
+    global _modelo
+    with _trava:
+        if _modelo is None:
+            _modelo = _montar_modelo()
+        return _modelo
+
+
+def adicionar_pagina(pdf):
+    """Nova página com a imagem de fundo (a imagem é decodificada só na primeira vez em cada documento)."""
+    pdf.add_page()
+    if os.path.exists(CAMINHO_FUNDO):
+        pdf.image(CAMINHO_FUNDO, x=0, y=0, w=210, h=297)
+
+
+def avisos_recursos():
+    """Mensagens sobre fontes ou imagem de fundo ausentes."""
+    return list(_obter_modelo()[2])
+
+
+def preparar_pdf():
+    from fontTools import ttLib
+
+    modelo, font_family, _ = _obter_modelo()
+    pdf = copy.deepcopy(modelo)
+    # A cópia compartilha o TTFont do modelo, e o subsetting feito em output() o altera.
+    # Cada documento recebe um TTFont próprio, aberto sob demanda a partir dos bytes em memória;
+    # métricas e larguras dos glifos continuam vindo do modelo.
+    for fonte in pdf.fonts.values():
+        caminho = str(getattr(fonte, 'ttffile', ''))
+        if caminho in _bytes_fontes:
+            fonte.ttfont = ttLib.TTFont(BytesIO(_bytes_fontes[caminho]), recalcTimestamp=False, lazy=True)
+    return pdf, font_family
+
+
+@metricas.cronometrado("pdf_quente")
+def gerar_pdf(dados):
+    pdf, font_family = preparar_pdf()
+    
+    # Posiciona o cursor 8mm a partir do topo da página (mais acima que o padrão)
+    pdf.set_y(8)
+    # Define a cor do texto como branco
+    pdf.set_text_color(255, 255, 255)
+    
+    pdf.set_font(font_family, 'B', 16)
+    pdf.cell(0, 10, "Relatório de Cálculo Térmico", 0, 1, "C")
+    
+    # Restaura a cor do texto para preto para o restante do documento
+    pdf.set_text_color(0, 0, 0)
+    
+    pdf.ln(10)
+    
+    pdf.set_font(font_family, '', 10)
+    data_simulacao = dados.get('data_simulacao') or datetime.now().strftime("%d/%m/%Y")
+    pdf.cell(0, 5, f"Data da Simulação: {data_simulacao}", 0, 1, "L")
+    pdf.ln(5)
+
+    pdf.set_font(font_family, 'B', 12)
+    pdf.cell(0, 8, "1. Parâmetros de Entrada", ln=1)
+    pdf.set_font(font_family, '', 11)
+    
+    texto_entradas = (
+        f"Material do Isolante: {dados.get('material', '')}\n"
+        f"Acabamento Externo: {dados.get('acabamento', '')}\n"
+        f"Tipo de Superfície: {dados.get('geometria', '')}\n"
+    )
+    if dados.get("geometria") == "Tubulação":
+        texto_entradas += f"Diâmetro da Tubulação: {dados.get('diametro_tubo', 0)} mm\n"
+    texto_entradas += f"Número de Camadas: {dados.get('num_camadas', '')}\n"
+    if dados.get('num_camadas', 1) > 1:
+        for i, (nome, esp) in enumerate(zip(dados.get('materiais_camadas', []), dados.get('espessuras', []))):
+            texto_entradas += f"  Camada {i+1}: {nome} ({esp:.1f} mm)\n"
+    texto_entradas += (
+        f"Espessura Total: {dados.get('esp_total', 0)} mm\n"
+        f"Temp. da Face Quente: {dados.get('tq', 0)} °C\n"
+        f"Temp. Ambiente: {dados.get('to', 0)} °C\n"
+        f"Emissividade (e): {dados.get('emissividade', '')}\n"
+    )
+    pdf.multi_cell(0, 6, texto_entradas.strip())
+    pdf.ln(5)
+
+    pdf.set_font(font_family, 'B', 12)
+    pdf.cell(0, 8, "2. Resultados do Cálculo Térmico", ln=1)
+    pdf.set_font(font_family, '', 11)
+
+    texto_resultados = f"Temperatura da Face Fria: {dados.get('tf', 0):.1f} °C\n"
+    for i, T_interface in enumerate(dados.get('interfaces', [])):
+        texto_resultados += f"Temp. entre camada {i+1} e {i+2}: {T_interface:.1f} °C\n"
+    texto_resultados += (
+        f"Perda de Calor com Isolante: {dados.get('perda_com_kw', 0):.3f} kW/m²\n"
+        f"Perda de Calor sem Isolante: {dados.get('perda_sem_kw', 0):.3f} kW/m²\n"
+    )
+    if dados.get('perda_com_kw_m') is not None:
+        texto_resultados += (
+            f"Perda por Metro de Tubo com Isolante: {dados['perda_com_kw_m'] * 1000:.1f} W/m\n"
+            f"Perda por Metro de Tubo sem Isolante: {dados['perda_sem_kw_m'] * 1000:.1f} W/m\n"
+        )
+    pdf.multi_cell(0, 6, texto_resultados.strip())
+    pdf.ln(5)
+
+    if dados.get("calculo_financeiro", False):
+        pdf.set_font(font_family, 'B', 12)
+        pdf.cell(0, 8, "3. Análise Financeira e Ambiental", ln=1)
+        pdf.set_font(font_family, '', 11)
+     
+        texto_financeiro = (
+            f"Economia Mensal: R$ {dados.get('eco_mensal', 0):,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.') + "\n"
+            f"Economia Anual: R$ {dados.get('eco_anual', 0):,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.') + "\n"
+            f"Redução de Perda: {dados.get('reducao_pct', 0):.1f} %\n"
+            f"Carbono Evitado: {dados.get('co2_ton_ano', 0):.2f} tCO2e/ano\n"
+        )
+        pdf.multi_cell(0, 6, texto_financeiro.strip())
+
+    buffer = BytesIO()
+    pdf.output(buffer)
+    return buffer.getvalue()
+
+
+@metricas.cronometrado("pdf_frio")
+def gerar_pdf_frio(dados):
+    pdf, font_family = preparar_pdf()
+
+    # Posiciona o cursor 8mm a partir do topo da página (mais acima que o padrão)
+    pdf.set_y(8)
+    # Define a cor do texto como branco
+    pdf.set_text_color(255, 255, 255)
+
+    pdf.set_font(font_family, 'B', 16)
+    pdf.cell(0, 10, "Relatório de Cálculo de Condensação", 0, 1, "C")
+    
+    # Restaura a cor do texto para preto para o restante do documento
+    pdf.set_text_color(0, 0, 0)
+
+    pdf.ln(10)
+    
+    pdf.set_font(font_family, '', 10)
+    data_simulacao = dados.get('data_simulacao') or datetime.now().strftime("%d/%m/%Y")
+    pdf.cell(0, 5, f"Data da Simulação: {data_simulacao}", 0, 1, "L")
+    pdf.ln(5)
+
+    pdf.set_font(font_family, 'B', 12)
+    pdf.cell(0, 8, "1. Parâmetros de Entrada", ln=1)
+    pdf.set_font(font_family, '', 11)
+
+    texto_entradas = (
+        f"Material do Isolante: {dados.get('material', '')}\n"
+        f"Tipo de Superfície: {dados.get('geometria', '')}\n"
+    )
+    if dados.get("geometria") == "Tubulação":
+        texto_entradas += f"Diâmetro da Tubulação: {dados.get('diametro_tubo', 0)} mm\n"
+    texto_entradas += (
+        f"Temp. Interna: {dados.get('ti', 0)} °C\n"
+        f"Temp. Ambiente: {dados.get('ta', 0)} °C\n"
+        f"Umidade Relativa: {dados.get('ur', 0)} %\n"
+        f"Velocidade do Vento: {dados.get('vento', 0)} m/s\n"
+    )
+    pdf.multi_cell(0, 6, texto_entradas.strip())
+    pdf.ln(5)
+
+    pdf.set_font(font_family, 'B', 12)
+    pdf.cell(0, 8, "2. Resultados do Cálculo", ln=1)
+    pdf.set_font(font_family, '', 11)
+
+    texto_resultados = (
+        f"Temperatura de Orvalho: {dados.get('t_orvalho', 0):.1f} °C\n"
+        f"Espessura Mínima Recomendada: {dados.get('espessura_final', 0):.1f} mm\n"
+    )
+    if dados.get("espessura_comercial") is not None:
+        texto_resultados += f"Espessura Comercial Recomendada: {dados['espessura_comercial']:.1f} mm\n"
+    pdf.multi_cell(0, 6, texto_resultados.strip())
+
+    buffer = BytesIO()
+    pdf.output(buffer)
+    return buffer.getvalue()
+
+
+def _moeda(valor):
+    return f"R$ {valor:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+
+
+class RelatorioConsolidado:
+    """Um único documento para um lote de itens: uma seção por item, páginas acrescentadas conforme necessário.
+
+    O documento e as fontes são preparados uma só vez; cada nova página reaproveita a
+    imagem de fundo já incorporada.
+    """
+
+    TOPO = 30       # mm, abaixo da faixa de título da imagem de fundo
+    LIMITE = 265    # mm, início de nova página
+
+    def __init__(self, titulo="Relatório Consolidado de Cálculo Térmico", data_simulacao=None):
+        self.pdf, self.font_family = preparar_pdf()
+        self.titulo = titulo
+        self.data_simulacao = data_simulacao or datetime.now().strftime("%d/%m/%Y")
+        self.itens = 0
+        self._cabecalho()
+        self.pdf.set_font(self.font_family, '', 10)
+        self.pdf.cell(0, 5, f"Data da Simulação: {self.data_simulacao}", 0, 1, "L")
+        self.pdf.ln(3)
+
+    def _cabecalho(self):
+        pdf = self.pdf
+        pdf.set_y(8)
+        pdf.set_text_color(255, 255, 255)
+        pdf.set_font(self.font_family, 'B', 16)
+        pdf.cell(0, 10, self.titulo, 0, 1, "C")
+        pdf.set_text_color(0, 0, 0)
+        pdf.set_y(self.TOPO)
+
+    def _nova_pagina_se_preciso(self, altura):
+        if self.pdf.get_y() + altura > self.LIMITE:
+            adicionar_pagina(self.pdf)
+            self._cabecalho()
+
+    def adicionar_item(self, item):
+        pdf = self.pdf
+        self.itens += 1
+        linhas = [
+            f"{item['material']} — {item['espessura_mm']:.1f} mm | Acabamento: {item['acabamento']} | {item['geometria']}"
+            + (f" Ø {item['diametro_mm']:.1f} mm" if item['geometria'] == "Tubulação" else ""),
+            f"Tq: {item['tq']:.1f} °C | To: {item['to']:.1f} °C | "
+            + (f"Comprimento: {item['comprimento_m']:.1f} m" if item['geometria'] == "Tubulação"
+               else f"Área: {item['area_m2']:.2f} m²"),
+        ]
+        if item['status'] == "ok":
+            linhas.append(f"Face fria: {item['tf']:.1f} °C | Perda com isolante: {item['perda_com_kw']:.3f} kW/m² | "
+                          f"sem isolante: {item['perda_sem_kw']:.3f} kW/m²")
+            if item['geometria'] == "Tubulação":
+                linhas.append(f"Por metro de tubo: {item['perda_com_kw_m'] * 1000:.1f} W/m com isolante | "
+                              f"{item['perda_sem_kw_m'] * 1000:.1f} W/m sem isolante")
+            if not math.isnan(item['eco_anual']):
+                linhas.append(f"Economia anual: {_moeda(item['eco_anual'])} | Redução: {item['reducao_pct']:.1f} % | "
+                              f"Carbono evitado: {item['co2_ton_ano']:.2f} tCO2e/ano")
+        else:
+            linhas.append(f"Não calculado: {item['status']}")
+
+        # text() posiciona cada linha diretamente: para milhares de itens é bem mais rápido que cell().
+        self._nova_pagina_se_preciso(7 + 5 * len(linhas) + 3)
+        x, y = pdf.l_margin, pdf.get_y()
+        pdf.set_font(self.font_family, 'B', 11)
+        pdf.text(x, y + 5, f"{self.itens}. {item['tag'] or 'Item sem tag'}")
+        y += 7
+        pdf.set_font(self.font_family, '', 9)
+        for linha in linhas:
+            pdf.text(x, y + 3.5, linha)
+            y += 5
+        pdf.set_y(y + 3)
+
+    def adicionar_itens(self, resultado):
+        """Acrescenta as linhas de um DataFrame de resultados (um bloco de ``lote_planilha``)."""
+        with metricas.medir("pdf_consolidado", linhas=len(resultado)):
+            for item in resultado.to_dict("records"):
+                self.adicionar_item(item)
+
+    def concluir(self, resumo):
+        """Fecha o documento com o resumo do lote e retorna os bytes do PDF."""
+        pdf = self.pdf
+        self._nova_pagina_se_preciso(60)
+        pdf.ln(2)
+        pdf.set_font(self.font_family, 'B', 12)
+        pdf.cell(0, 8, "Resumo do Lote", ln=1)
+        pdf.set_font(self.font_family, '', 11)
+        texto = (
+            f"Itens: {resumo['linhas']} ({resumo['calculadas']} calculados, {resumo['com_erro']} com erro)\n"
+            f"Perda total com isolante: {resumo['perda_com_kw']:.2f} kW\n"
+            f"Perda total sem isolante: {resumo['perda_sem_kw']:.2f} kW\n"
+        )
+        if resumo.get("calculo_financeiro", False):
+            texto += (
+                f"Economia anual total: {_moeda(resumo['eco_anual'])}\n"
+                f"Carbono evitado total: {resumo['co2_ton_ano']:.2f} tCO2e/ano\n"
+            )
+        pdf.multi_cell(0, 6, texto.strip())
+
+        with metricas.medir("pdf_consolidado", paginas=pdf.pages_count):
+            buffer = BytesIO()
+            pdf.output(buffer)
+        return buffer.getvalue()
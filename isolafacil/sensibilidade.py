@@ -0,0 +1,151 @@
+"""Curvas de sensibilidade: Tf e perda de calor em função de uma variável.
+
+A variável pode ser a espessura, a temperatura ambiente ou a velocidade do
+vento; as demais entradas ficam fixas no caso-base. Os pontos são resolvidos
+em ordem crescente da variável, e cada um parte de uma estimativa de Tf
+tirada dos vizinhos já calculados (``Tf_inicial`` de ``resolver_face_fria``),
+o que estreita o colchete inicial. O gerador entrega os pontos à medida que
+ficam prontos, para a curva ser desenhada durante o cálculo.
+
+Os pontos calculados ficam guardados por caso-base: ampliar a faixa ou
+refinar o passo resolve só os valores novos.
+"""
+import bisect
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from . import metricas
+from .solver import resolver_face_fria
+
+# campo do CasoBase -> (rótulo, unidade exibida, fator da unidade exibida para SI)
+VARIAVEIS = {
+    "espessura_m": ("Espessura", "mm", 1e-3),
+    "To": ("Temperatura ambiente", "°C", 1.0),
+    "vento_ms": ("Velocidade do vento", "m/s", 1.0),
+}
+CASAS_VALOR = 9
+MAXIMO_CASOS = 64
+
+
+@dataclass(frozen=True)
+class CasoBase:
+    Tq: float
+    To: float
+    espessura_m: float
+    k_func_str: str
+    geometria: str
+    emissividade: float
+    diametro_m: float | None = None
+    vento_ms: float = 0.0
+
+
+@dataclass(frozen=True)
+class PontoCurva:
+    valor: float          # na unidade SI do campo variado
+    Tf: float | None
+    q: float | None       # W/m² da face externa
+    convergiu: bool
+    avaliacoes: int       # 0 quando o ponto veio do cache
+    status: str
+
+
+def faixa(inicio, fim, passo):
+    """Valores de ``inicio`` a ``fim`` (inclusive) de ``passo`` em ``passo``.
+
+    Os valores são múltiplos de ``passo`` a partir de ``inicio``, então uma faixa
+    mais longa ou com passo submúltiplo reaproveita os pontos de uma anterior.
+    """
+    if passo <= 0 or fim < inicio:
+        return []
+    n = int((fim - inicio) / passo + 1e-9) + 1
+    return [round(inicio + i * passo, CASAS_VALOR) for i in range(n)]
+
+
+def _estimativa(valores, pontos, x):
+    """Tf estimada em ``x`` pelos vizinhos calculados: interpolação entre os dois lados, ou extrapolação linear."""
+    i = bisect.bisect_left(valores, x)
+    esquerda = [v for v in valores[max(0, i - 2):i] if pontos[v].convergiu]
+    direita = [v for v in valores[i:i + 2] if pontos[v].convergiu]
+    if esquerda and direita:
+        x0, x1 = esquerda[-1], direita[0]
+    elif len(esquerda) == 2:
+        x0, x1 = esquerda
+    elif len(direita) == 2:
+        x0, x1 = direita
+    elif esquerda or direita:
+        return pontos[(esquerda or direita)[0]].Tf
+    else:
+        return None
+    T0, T1 = pontos[x0].Tf, pontos[x1].Tf
+    return T0 + (T1 - T0) * (x - x0) / (x1 - x0)
+
+
+class CurvasSensibilidade:
+    """Pontos já resolvidos por (caso-base, variável); seguro para várias sessões do Streamlit."""
+
+    def __init__(self, maximo_casos=MAXIMO_CASOS):
+        self.maximo_casos = maximo_casos
+        self._curvas = OrderedDict()   # (caso sem a variável, variável) -> {valor: PontoCurva}
+        self._trava = threading.Lock()
+        self.calculados = 0
+        self.reaproveitados = 0
+
+    def _pontos(self, chave):
+        with self._trava:
+            pontos = self._curvas.get(chave)
+            if pontos is None:
+                pontos = self._curvas[chave] = {}
+                while len(self._curvas) > self.maximo_casos:
+                    self._curvas.popitem(last=False)
+            self._curvas.move_to_end(chave)
+            return pontos
+
+    def calcular(self, caso, variavel, valores):
+        """Gera um PontoCurva por valor (em ordem crescente, sem repetições)."""
+        if variavel not in VARIAVEIS:
+            raise ValueError(f"variável desconhecida: {variavel}")
+        pontos = self._pontos((dataclasses.replace(caso, **{variavel: None}), variavel))
+        inicio = time.perf_counter()
+        novos = reaproveitados = avaliacoes = 0
+        try:
+            for valor in sorted({round(float(v), CASAS_VALOR) for v in valores}):
+                with self._trava:
+                    ponto = pontos.get(valor)
+                    calculados = sorted(pontos) if ponto is None else None
+                if ponto is not None:
+                    reaproveitados += 1
+                    yield dataclasses.replace(ponto, avaliacoes=0)
+                    continue
+
+                argumentos = dataclasses.replace(caso, **{variavel: valor})
+                resultado = resolver_face_fria(argumentos.Tq, argumentos.To, argumentos.espessura_m,
+                                               argumentos.k_func_str, argumentos.geometria, argumentos.emissividade,
+                                               argumentos.diametro_m, argumentos.vento_ms,
+                                               Tf_inicial=_estimativa(calculados, pontos, valor))
+                ponto = PontoCurva(valor, resultado.Tf, resultado.q, resultado.convergiu, resultado.avaliacoes,
+                                   resultado.status)
+                with self._trava:
+                    pontos[valor] = ponto
+                novos += 1
+                avaliacoes += resultado.avaliacoes
+                yield ponto
+        finally:
+            # Também quando o consumidor para no meio (gerador fechado).
+            with self._trava:
+                self.calculados += novos
+                self.reaproveitados += reaproveitados
+            metricas.registrar("sensibilidade", time.perf_counter() - inicio, pontos_novos=novos,
+                               pontos_reaproveitados=reaproveitados, avaliacoes_k=avaliacoes)
+
+    def limpar(self):
+        with self._trava:
+            self._curvas.clear()
+            self.calculados = self.reaproveitados = 0
+
+    def estatisticas(self):
+        with self._trava:
+            return {"casos": len(self._curvas), "pontos": sum(len(p) for p in self._curvas.values()),
+                    "calculados": self.calculados, "reaproveitados": self.reaproveitados}
@@ -0,0 +1,165 @@
+"""Solução do balanço de energia na face fria do isolamento.
+
+A temperatura da face fria Tf é a raiz de
+
+    f(Tf) = q_conducao(Tf) - (q_conv(Tf) + q_rad(Tf))
+
+que sempre troca de sinal entre To e Tq. O intervalo [To, Tq] é usado como
+colchete inicial e a raiz é refinada pelo método de Brent (interpolação
+quadrática inversa / secante com salvaguarda de bissecção).
+"""
+import math
+import time
+from dataclasses import dataclass
+
+from . import metricas
+from .condutividade import FormulaKInvalida, compilar_k
+from .transferencia import calcular_q_superficie
+
+TOLERANCIA_T = 1e-3   # °C
+TOLERANCIA_Q = 0.5    # W/m²
+MAX_ITER = 100
+
+
+@dataclass(frozen=True)
+class ResultadoFaceFria:
+    Tf: float | None
+    q: float | None
+    convergiu: bool
+    status: str
+    iteracoes: int = 0
+    avaliacoes: int = 0
+    residuo: float = math.nan
+    largura_intervalo: float = math.nan
+
+
+def resistencia_conducao(geometry, L_total, pipe_diameter_m=None):
+    """Resistência por área da face externa [m] e diâmetro externo da superfície [m].
+
+    Para tubulação, q = k * (Tq - Tf) / (r_outer * ln(r_outer / r_inner)).
+    Retorna (None, None) quando a geometria é inválida.
+    """
+    if L_total is None or L_total <= 0:
+        return None, None
+    if geometry == "Superfície Plana":
+        return L_total, L_total
+    if geometry == "Tubulação":
+        if not pipe_diameter_m or pipe_diameter_m <= 0:
+            return None, None
+        r_inner = pipe_diameter_m / 2
+        r_outer = r_inner + L_total
+        return r_outer * math.log(r_outer / r_inner), r_outer * 2
+    return None, None
+
+
+def resolver_face_fria(Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m=None,
+                       wind_speed_ms=0, tol_T=TOLERANCIA_T, tol_q=TOLERANCIA_Q, max_iter=MAX_ITER,
+                       Tf_inicial=None):
+    """Encontra Tf e o fluxo perdido [W/m² da face externa].
+
+    ``Tf_inicial`` (opcional) é uma estimativa próxima, como a Tf de um caso
+    vizinho; ela é usada para estreitar o colchete antes das iterações.
+    """
+    inicio = time.perf_counter()
+    resultado = _resolver_face_fria(Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m,
+                                    wind_speed_ms, tol_T, tol_q, max_iter, Tf_inicial)
+    # Cada avaliação do balanço avalia k(T) uma vez: avaliacoes_k = resultado.avaliacoes.
+    metricas.registrar_solucao(time.perf_counter() - inicio, resultado)
+    return resultado
+
+
+def _resolver_face_fria(Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m,
+                        wind_speed_ms, tol_T, tol_q, max_iter, Tf_inicial):
+    try:
+        k_func = compilar_k(k_func_str)
+    except FormulaKInvalida as ex:
+        return ResultadoFaceFria(None, None, False, f"fórmula k(T) inválida: {ex}")
+
+    resistencia, outer_surface_diameter = resistencia_conducao(geometry, L_total, pipe_diameter_m)
+    if resistencia is None:
+        return ResultadoFaceFria(None, None, False, "geometria inválida")
+
+    if Tq == To:
+        return ResultadoFaceFria(To, 0.0, True, "convergiu", residuo=0.0, largura_intervalo=0.0)
+
+    avaliacoes = 0
+
+    def balanco(Tf):
+        nonlocal avaliacoes
+        avaliacoes += 1
+        k = k_func((Tq + Tf) / 2)
+        if not k > 0:
+            raise ValueError(f"k(T={(Tq + Tf) / 2:.1f} °C) = {k:g}")
+        q_transferencia = calcular_q_superficie(Tf, To, geometry, emissividade, outer_surface_diameter, wind_speed_ms)
+        return k * (Tq - Tf) / resistencia - q_transferencia, q_transferencia
+
+    try:
+        a, b = To, Tq
+        fa, _ = balanco(a)
+        fb, qb = balanco(b)
+        if (fa > 0) == (fb > 0):
+            return ResultadoFaceFria(None, None, False, "balanço sem troca de sinal entre To e Tq", avaliacoes=avaliacoes)
+        if Tf_inicial is not None and min(a, b) < Tf_inicial < max(a, b):
+            fx, qx = balanco(Tf_inicial)
+            if abs(fx) <= tol_q:
+                return ResultadoFaceFria(Tf_inicial, qx, True, "convergiu", 0, avaliacoes, fx, 0.0)
+            if (fx > 0) == (fa > 0):
+                a, fa = Tf_inicial, fx
+            else:
+                b, fb, qb = Tf_inicial, fx, qx
+        resultado = _brent(balanco, a, fa, b, fb, qb, tol_T, tol_q, max_iter)
+    except (ArithmeticError, ValueError, TypeError) as ex:
+        return ResultadoFaceFria(None, None, False, f"erro ao avaliar k(T): {ex}", avaliacoes=avaliacoes)
+
+    Tf, q, convergiu, iteracoes, residuo, largura = resultado
+    status = "convergiu" if convergiu else f"{max_iter} iterações sem atingir a tolerância (resíduo {residuo:.2f} W/m², intervalo {largura:.3g} °C)"
+    return ResultadoFaceFria(Tf, q if convergiu else None, convergiu, status, iteracoes, avaliacoes, residuo, largura)
+
+
+def encontrar_temperatura_face_fria(Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0):
+    """Interface antiga: retorna (Tf, q, convergiu)."""
+    resultado = resolver_face_fria(Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m, wind_speed_ms)
+    return resultado.Tf, resultado.q, resultado.convergiu
+
+
+def _brent(funcao, a, fa, b, fb, qb, tol_T, tol_q, max_iter):
+    # Mantém b como melhor estimativa e [b, c] como colchete com troca de sinal.
+    c, fc = a, fa
+    d = e = b - a
+    for iteracao in range(1, max_iter + 1):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+            qb = None
+        tol = 2 * 2.2e-16 * abs(b) + 0.5 * tol_T
+        meio = 0.5 * (c - b)
+        if abs(fb) <= tol_q or abs(meio) <= tol:
+            if qb is None:
+                fb, qb = funcao(b)
+            return b, qb, True, iteracao - 1, fb, abs(c - b)
+
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p, q = 2 * meio * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * meio * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * meio * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = meio
+        else:
+            d = e = meio
+
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, meio)
+        fb, qb = funcao(b)
+    return b, qb, False, max_iter, fb, abs(c - b)
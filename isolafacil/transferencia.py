@@ -0,0 +1,73 @@
+"""Correlações de convecção e radiação na face externa do isolamento."""
+import math
+
+from .ar import conveccao as propriedades_ar, propriedades_vetorizado as propriedades_ar_vetorizado
+
+# --- CONSTANTE GLOBAL ---
+sigma = 5.67e-8
+
+
+def calcular_h_conv(Tf, To, geometry, outer_diameter_m=None, wind_speed_ms=0):
+    delta_T = abs(Tf - To)
+    if delta_T == 0: return 0
+    T_film_K = (Tf + To) / 2 + 273.15
+    # Propriedades do ar na temperatura de filme, da grade pré-calculada em isolafacil.ar
+    nu, k_ar, g_beta_nu_alfa, Pr_1_3, churchill_chu = propriedades_ar(T_film_K)
+    
+    if wind_speed_ms >= 1.0:
+        L_c = 1.0 if geometry == "Superfície Plana" else outer_diameter_m
+        if L_c is None or L_c == 0: L_c = 1.0
+        Re = (wind_speed_ms * L_c) / nu
+        if Re < 5e5:
+            Nu = 0.664 * math.sqrt(Re) * Pr_1_3
+        else:
+            Nu = (0.037 * (Re**0.8) - 871) * Pr_1_3
+    else:
+        if geometry == "Superfície Plana":
+            L_c = 0.1
+            Ra = g_beta_nu_alfa * delta_T * L_c**3
+            Nu = 0.27 * math.sqrt(math.sqrt(Ra))
+        elif geometry == "Tubulação":
+            L_c = outer_diameter_m
+            Ra = g_beta_nu_alfa * delta_T * L_c**3
+            Nu = (0.60 + 0.387 * Ra**(1/6) / churchill_chu)**2
+        else:
+            Nu = 0
+    
+    return (Nu * k_ar) / L_c
+
+
+def calcular_q_superficie(Tf, To, geometry, emissividade, outer_diameter_m=None, wind_speed_ms=0):
+    """Fluxo [W/m²] perdido pela superfície por convecção + radiação."""
+    h_conv = calcular_h_conv(Tf, To, geometry, outer_diameter_m, wind_speed_ms)
+    q_rad = emissividade * sigma * ((Tf + 273.15)**4 - (To + 273.15)**4)
+    return h_conv * (Tf - To) + q_rad
+
+
+def calcular_h_conv_vetorizado(Tf, To, tubulacao, outer_diameter_m, wind_speed_ms):
+    """Versão NumPy de calcular_h_conv; ``tubulacao`` é um array booleano por linha."""
+    import numpy as np
+
+    Tf, To = np.asarray(Tf, dtype=float), np.asarray(To, dtype=float)
+    ar = propriedades_ar_vetorizado((Tf + To) / 2 + 273.15, ("nu", "k", "g_beta_nu_alfa", "Pr_1_3", "churchill_chu"))
+    delta_T = np.abs(Tf - To)
+    diametro = np.where(np.asarray(outer_diameter_m, dtype=float) > 0, outer_diameter_m, 1.0)
+
+    forcada = np.asarray(wind_speed_ms) >= 1.0
+    L_c = np.where(forcada, np.where(tubulacao, diametro, 1.0), np.where(tubulacao, diametro, 0.1))
+
+    Re = wind_speed_ms * L_c / ar["nu"]
+    Nu_forcada = np.where(Re < 5e5, 0.664 * np.sqrt(Re), 0.037 * Re**0.8 - 871) * ar["Pr_1_3"]
+
+    Ra = ar["g_beta_nu_alfa"] * delta_T * L_c**3
+    Nu_plana = 0.27 * np.sqrt(np.sqrt(Ra))
+    Nu_tubo = (0.60 + 0.387 * Ra**(1/6) / ar["churchill_chu"])**2
+    Nu = np.where(forcada, Nu_forcada, np.where(tubulacao, Nu_tubo, Nu_plana))
+
+    return np.where(delta_T == 0, 0.0, Nu * ar["k"] / L_c)
+
+
+def calcular_q_superficie_vetorizado(Tf, To, tubulacao, emissividade, outer_diameter_m, wind_speed_ms):
+    h_conv = calcular_h_conv_vetorizado(Tf, To, tubulacao, outer_diameter_m, wind_speed_ms)
+    q_rad = emissividade * sigma * ((Tf + 273.15)**4 - (To + 273.15)**4)
+    return h_conv * (Tf - To) + q_rad
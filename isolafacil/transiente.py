@@ -0,0 +1,212 @@
+"""Regime transitório: aquecimento e resfriamento através das camadas de isolamento.
+
+O isolamento é dividido em volumes finitos (planos ou anéis cilíndricos), com
+ρ·cp de cada camada. A face quente é mantida em Tq ou, com ``capacidade_interna``,
+é o conteúdo da tubulação/equipamento, tratado como uma massa concentrada que
+começa em Tq e só troca calor com o isolamento, como ao parar o escoamento. A
+face fria não tem massa e perde calor pelas mesmas correlações de convecção e
+radiação do regime permanente.
+
+O avanço no tempo é por Euler implícito, estável para qualquer passo: a cada
+passo k(T) é avaliado na temperatura de cada volume e a perda na superfície é
+linearizada em torno da temperatura anterior, de modo que o sistema é
+tridiagonal e resolvido pela rotina de banda do LAPACK (``dgtsv``).
+
+    C_i/Δt (T_i - T_i⁰) = G_{i-1} (T_{i-1} - T_i) - G_i (T_i - T_{i+1})
+    G_N (T_N - T_s) = A_ext [q(T_s⁰) + q'(T_s⁰) (T_s - T_s⁰)]
+
+As capacidades e condutâncias são por m² para superfície plana e por metro de
+tubo para tubulação. O calor latente de mudança de fase não é considerado: o
+tempo até 0 °C é o tempo até o conteúdo começar a congelar.
+"""
+import math
+from dataclasses import dataclass
+
+from . import metricas
+from .condutividade import FormulaKInvalida, compilar_k
+from .transferencia import calcular_q_superficie
+
+CELULAS_POR_CAMADA = 10
+MAX_ITER_PERMANENTE = 100
+TOLERANCIA_PERMANENTE = 1e-6   # °C, variação máxima entre iterações do perfil inicial
+_DELTA = 0.01  # °C, para a derivada numérica da perda na superfície
+
+
+@dataclass(frozen=True)
+class CamadaTransiente:
+    espessura: float                 # m
+    k_func_str: str
+    densidade: float = 100.0         # kg/m³
+    calor_especifico: float = 840.0  # J/kg.K
+
+
+@dataclass(frozen=True)
+class ResultadoTransiente:
+    tempos: tuple         # s, começando em 0
+    T_interna: tuple      # °C do conteúdo (ou Tq, quando mantida)
+    T_face_fria: tuple    # °C
+    q: tuple              # W/m² da face externa
+    posicoes: tuple       # centros dos volumes, m a partir da face quente
+    perfil_final: tuple   # °C em cada volume no último instante
+    status: str
+    passos: int = 0
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+    def tempo_ate(self, temperatura, serie="T_interna"):
+        """Primeiro instante [s] em que a série atinge ``temperatura``, interpolado; None se não atingir."""
+        valores = getattr(self, serie)
+        if not valores:
+            return None
+        sinal = valores[0] >= temperatura
+        for i in range(1, len(valores)):
+            if (valores[i] >= temperatura) != sinal or valores[i] == temperatura:
+                v0, v1 = valores[i - 1], valores[i]
+                fracao = (temperatura - v0) / (v1 - v0) if v1 != v0 else 1.0
+                return self.tempos[i - 1] + fracao * (self.tempos[i] - self.tempos[i - 1])
+        return None
+
+
+def _falha(status):
+    return ResultadoTransiente((), (), (), (), (), (), status)
+
+
+def capacidade_tubulacao(diametro_externo_m, espessura_parede_m, densidade_fluido=1000.0,
+                         calor_especifico_fluido=4186.0, densidade_parede=7850.0, calor_especifico_parede=490.0):
+    """Capacidade térmica [J/K por metro] do fluido parado e da parede de aço de uma tubulação."""
+    r_ext = diametro_externo_m / 2
+    r_int = max(r_ext - espessura_parede_m, 0.0)
+    return (densidade_fluido * calor_especifico_fluido * math.pi * r_int**2
+            + densidade_parede * calor_especifico_parede * math.pi * (r_ext**2 - r_int**2))
+
+
+def _malha(camadas, geometry, pipe_diameter_m, celulas_por_camada):
+    """Resistências das duas metades de cada volume (× k), volumes, centros, área e diâmetro externos."""
+    import numpy as np
+
+    espessuras = np.repeat([c.espessura / celulas_por_camada for c in camadas], celulas_por_camada)
+    faces = np.concatenate(([0.0], np.cumsum(espessuras)))
+    centros = (faces[:-1] + faces[1:]) / 2
+    if geometry == "Superfície Plana":
+        return espessuras / 2, espessuras / 2, espessuras, centros, 1.0, faces[-1]
+    r0 = pipe_diameter_m / 2
+    r_faces, r_centros = r0 + faces, r0 + centros
+    esquerda = np.log(r_centros / r_faces[:-1]) / (2 * math.pi)
+    direita = np.log(r_faces[1:] / r_centros) / (2 * math.pi)
+    volumes = math.pi * (r_faces[1:]**2 - r_faces[:-1]**2)
+    return esquerda, direita, volumes, centros, 2 * math.pi * r_faces[-1], 2 * r_faces[-1]
+
+
+@metricas.cronometrado("solver_transiente", lambda r: {"status": "ok" if r.ok else "falhou", "passos": r.passos,
+                                                       "celulas": len(r.posicoes)})
+def simular_transiente(Tq, To, camadas, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+                       duracao_s=3600.0, passo_s=60.0, capacidade_interna=None, T_inicial=None,
+                       celulas_por_camada=CELULAS_POR_CAMADA):
+    """Evolução das temperaturas no tempo para camadas em série.
+
+    Sem ``capacidade_interna`` [J/K por m² ou por metro] a face quente fica em Tq
+    (aquecimento); com ela, o conteúdo parte de Tq e esfria pelo isolamento.
+    ``T_inicial`` é a temperatura uniforme do isolamento em t = 0; None parte do
+    regime permanente com a face quente em Tq.
+    """
+    import numpy as np
+    from scipy.linalg.lapack import dgtsv
+
+    camadas = list(camadas)
+    if not camadas or any(c.espessura <= 0 for c in camadas):
+        return _falha("espessuras inválidas")
+    if any(not c.densidade * c.calor_especifico > 0 for c in camadas) or (
+            capacidade_interna is not None and not capacidade_interna > 0):
+        return _falha("capacidades térmicas inválidas")
+    if not (duracao_s > 0 and passo_s > 0 and celulas_por_camada >= 1):
+        return _falha("duração ou passo inválidos")
+    if not (geometry == "Superfície Plana" or (geometry == "Tubulação" and pipe_diameter_m and pipe_diameter_m > 0)):
+        return _falha("geometria inválida")
+    try:
+        k_funcs = [compilar_k(c.k_func_str) for c in camadas]
+    except FormulaKInvalida as ex:
+        return _falha(f"fórmula k(T) inválida: {ex}")
+
+    celulas_por_camada = int(celulas_por_camada)
+    esquerda, direita, volumes, posicoes, A_ext, D_ext = _malha(camadas, geometry, pipe_diameter_m, celulas_por_camada)
+    n = len(volumes)
+    # Camadas vizinhas com a mesma fórmula são avaliadas numa única chamada.
+    fatias = []
+    for i, f in enumerate(k_funcs):
+        if fatias and fatias[-1][0] is f:
+            fatias[-1][1] = slice(fatias[-1][1].start, (i + 1) * celulas_por_camada)
+        else:
+            fatias.append([f, slice(i * celulas_por_camada, (i + 1) * celulas_por_camada)])
+    rho_cp = np.repeat([c.densidade * c.calor_especifico for c in camadas], celulas_por_camada)
+    concentrada = capacidade_interna is not None
+    # Incógnitas: [conteúdo], volumes do isolamento e face fria (sem massa).
+    capacidades = np.concatenate(([capacidade_interna] if concentrada else [], rho_cp * volumes, [0.0]))
+    k = np.empty(n)
+
+    def superficie(T):
+        return calcular_q_superficie(T, To, geometry, emissividade, D_ext, wind_speed_ms)
+
+    def avancar(T, inv_dt, interno_fixo):
+        # Um passo de Euler implícito; com inv_dt = 0 é uma iteração de Picard do regime permanente.
+        celulas = T[-n - 1:-1]
+        for f, fatia in fatias:
+            k[fatia] = f.vetorizada(celulas[fatia])
+        if not (k > 0).all():
+            raise ValueError(f"k(T) não positivo entre {celulas.min():.1f} e {celulas.max():.1f} °C")
+        # Condutâncias: face quente–1º volume, entre volumes vizinhos e último volume–face fria.
+        G = np.concatenate(([k[0] / esquerda[0]], 1 / (direita[:-1] / k[:-1] + esquerda[1:] / k[1:]),
+                            [k[-1] / direita[-1]]))
+        T_sup = T[-1]
+        q0 = superficie(T_sup)
+        h = (superficie(T_sup + _DELTA) - q0) / _DELTA
+
+        acumulo = capacidades[-len(T):] * inv_dt   # sem o conteúdo no perfil de partida
+        conexoes = G[1:] if interno_fixo else G
+        diagonal = acumulo.copy()
+        diagonal[:-1] += conexoes
+        diagonal[1:] += conexoes
+        diagonal[-1] += A_ext * h
+        termo = acumulo * T
+        termo[-1] += A_ext * (h * T_sup - q0)
+        if interno_fixo:
+            diagonal[0] += G[0]
+            termo[0] += G[0] * Tq
+        _, _, _, novo, info = dgtsv(-conexoes, diagonal, -conexoes, termo)
+        if info != 0:
+            raise ArithmeticError("sistema tridiagonal singular")
+        return novo, q0
+
+    try:
+        if T_inicial is None:
+            # Perfil de partida: o mesmo sistema sem os termos de acúmulo, até parar de variar.
+            T_sup = To + 0.1 * (Tq - To)
+            T = np.append(Tq - (Tq - T_sup) * posicoes / posicoes[-1], T_sup)
+            for _ in range(MAX_ITER_PERMANENTE):
+                novo, _ = avancar(T, 0.0, True)
+                variacao = np.abs(novo - T).max()
+                T = novo
+                if variacao <= TOLERANCIA_PERMANENTE:
+                    break
+        else:
+            T = np.full(n + 1, float(T_inicial))
+        if concentrada:
+            T = np.concatenate(([Tq], T))
+
+        passos = max(1, math.ceil(duracao_s / passo_s - 1e-9))
+        dt = duracao_s / passos
+        inv_dt = 1 / dt
+        internas, faces, fluxos = [float(T[0]) if concentrada else Tq], [float(T[-1])], []
+        for _ in range(passos):
+            T, q0 = avancar(T, inv_dt, not concentrada)
+            fluxos.append(q0)
+            internas.append(float(T[0]) if concentrada else Tq)
+            faces.append(float(T[-1]))
+        fluxos.append(superficie(faces[-1]))
+    except (ArithmeticError, ValueError, TypeError) as ex:
+        return _falha(f"erro ao avaliar k(T): {ex}")
+
+    perfil = T[1:-1] if concentrada else T[:-1]
+    return ResultadoTransiente(tuple(i * dt for i in range(passos + 1)), tuple(internas), tuple(faces),
+                               tuple(fluxos), tuple(posicoes.tolist()), tuple(perfil.tolist()), "ok", passos)
@@ -0,0 +1,146 @@
+"""Medições de desempenho do solver e dos relatórios sobre o corpus de referência.
+
+    python tests/benchmark.py                      # tabela no terminal
+    python tests/benchmark.py --salvar base.json   # grava os resultados
+    python tests/benchmark.py --comparar base.json # falha se algo ficou mais lento que o limite
+
+Cada medição cronometra chamadas individuais e informa chamadas por segundo,
+latências p50/p99 e, para os solvers, avaliações do balanço por solução.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PASTA)
+sys.path.insert(0, os.path.dirname(PASTA))
+
+import referencia  # noqa: E402
+from isolafacil.espessura import espessura_minima  # noqa: E402
+from isolafacil.lote import resolver_lote  # noqa: E402
+from isolafacil.multicamada import Camada, resolver_multicamada  # noqa: E402
+from isolafacil.psicrometria import temperatura_orvalho  # noqa: E402
+from isolafacil.relatorios import gerar_pdf  # noqa: E402
+from isolafacil.solver import resolver_face_fria  # noqa: E402
+from isolafacil.transferencia import calcular_h_conv  # noqa: E402
+from isolafacil.transiente import CamadaTransiente, capacidade_tubulacao, simular_transiente  # noqa: E402
+
+LIMITE_REGRESSAO = 1.5   # razão máxima entre p50 atual e p50 gravado
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, max(0, math.ceil(p / 100 * len(ordenados)) - 1))]
+
+
+def medir(nome, chamadas, repeticoes=1, avaliacoes=None):
+    """Executa cada chamada ``repeticoes`` vezes; ``avaliacoes(resultado)`` extrai o custo interno de cada solução."""
+    tempos, custos = [], []
+    for _ in range(repeticoes):
+        for chamada in chamadas:
+            inicio = time.perf_counter_ns()
+            resultado = chamada()
+            tempos.append((time.perf_counter_ns() - inicio) / 1e9)
+            if avaliacoes is not None:
+                custos.append(avaliacoes(resultado))
+    total = sum(tempos)
+    return {
+        "nome": nome,
+        "chamadas": len(tempos),
+        "por_segundo": len(tempos) / total if total else math.inf,
+        "p50_ms": _percentil(tempos, 50) * 1000,
+        "p99_ms": _percentil(tempos, 99) * 1000,
+        "avaliacoes_media": sum(custos) / len(custos) if custos else None,
+        "avaliacoes_max": max(custos) if custos else None,
+    }
+
+
+def executar(repeticoes=20):
+    isolantes, acabamentos = referencia.carregar_catalogo()
+    casos = referencia.carregar_casos()
+
+    face_fria = [(c["tq"], c["to"], c["espessura_mm"] / 1000, isolantes[c["material"]].k_func_str, c["geometria"],
+                  acabamentos[c["acabamento"]].emissividade, c["diametro_mm"] / 1000 or None, c["vento_ms"])
+                 for c in casos["face_fria"]]
+    resultados = [
+        medir("calcular_h_conv", [lambda a=a: calcular_h_conv(a[0], a[1], a[4], 0.2, a[7]) for a in face_fria],
+              repeticoes * 50),
+        medir("resolver_face_fria", [lambda a=a: resolver_face_fria(*a) for a in face_fria], repeticoes,
+              avaliacoes=lambda r: r.avaliacoes),
+    ]
+
+    Tq, To, L, k_func, geometria, emissividade, D, vento = zip(*face_fria)
+    n = 10_000
+    lote = [v * (n // len(face_fria) + 1) for v in (Tq, To, L, geometria, emissividade, k_func, D, vento)]
+    lote = [v[:n] for v in lote]
+    lote[6] = [d or 0.0 for d in lote[6]]
+    medicao = medir(f"resolver_lote ({n} linhas)", [lambda: resolver_lote(*lote)], max(1, repeticoes // 4),
+                    avaliacoes=lambda r: r["iteracoes"].mean() + 2)
+    medicao["linhas_por_segundo"] = medicao["por_segundo"] * n
+    resultados.append(medicao)
+
+    multicamada = [(c["tq"], c["to"], [Camada(L / 1000, isolantes[m].k_func_str) for m, L in c["camadas"]],
+                    c["geometria"], acabamentos[c["acabamento"]].emissividade, c["diametro_mm"] / 1000 or None)
+                   for c in casos["multicamada"]]
+    resultados.append(medir("resolver_multicamada", [lambda a=a: resolver_multicamada(*a) for a in multicamada],
+                            repeticoes, avaliacoes=lambda r: r.iteracoes))
+
+    espessura = [(c["ti"], c["ta"], temperatura_orvalho(c["ta"], c["ur"]), isolantes[c["material"]].k_func_str,
+                  c["geometria"], 0.9, c["diametro_mm"] / 1000 or None, c["vento_ms"]) for c in casos["espessura"]]
+    resultados.append(medir("espessura_minima", [lambda a=a: espessura_minima(*a) for a in espessura], repeticoes,
+                            avaliacoes=lambda r: r.solucoes))
+
+    # Resfriamento de uma linha de água parada: 2000 passos de 1 min em 3 camadas de 10 volumes.
+    la_de_rocha = isolantes["Lã de Rocha 64 kg/m³"].k_func_str
+    # Um dia e meio em passos de 1 min, 3 camadas × 10 volumes.
+    transiente = (90, -10, [CamadaTransiente(0.025, la_de_rocha, 64, 840)] * 3, "Tubulação", 0.9, 0.0889, 3,
+                  3600 * 60.0, 60.0, capacidade_tubulacao(0.0889, 0.0055))
+    simular_transiente(*transiente[:7], duracao_s=60.0)  # carrega NumPy/SciPy fora da medição
+    resultados.append(medir("simular_transiente (3600 passos, 30 volumes)", [lambda: simular_transiente(*transiente)],
+                            max(1, repeticoes // 4)))
+
+    dados_pdf = {"material": "Lã de Rocha 64 kg/m³", "acabamento": "Alumínio", "geometria": "Superfície Plana",
+                 "num_camadas": 1, "esp_total": 51, "tq": 250, "to": 30, "emissividade": 0.1, "tf": 83.3,
+                 "perda_com_kw": 0.217, "perda_sem_kw": 1.33, "data_simulacao": "01/01/2025"}
+    gerar_pdf(dados_pdf)  # o primeiro documento monta o modelo com fontes e fundo
+    resultados.append(medir("gerar_pdf", [lambda: gerar_pdf(dados_pdf)], max(1, repeticoes // 4)))
+    return resultados
+
+
+def imprimir(resultados):
+    print(f"{'medição':<32}{'chamadas':>9}{'por s':>12}{'p50 ms':>10}{'p99 ms':>10}{'aval./sol.':>12}{'máx':>6}")
+    for r in resultados:
+        media = f"{r['avaliacoes_media']:.1f}" if r["avaliacoes_media"] is not None else "-"
+        maximo = f"{r['avaliacoes_max']:.0f}" if r["avaliacoes_max"] is not None else "-"
+        print(f"{r['nome']:<32}{r['chamadas']:>9}{r['por_segundo']:>12.1f}{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+              f"{media:>12}{maximo:>6}")
+
+
+def comparar(resultados, caminho, limite=LIMITE_REGRESSAO):
+    """Lista de medições cujo p50 ficou mais de ``limite`` vezes acima do gravado."""
+    with open(caminho, encoding="utf-8") as arquivo:
+        base = {r["nome"]: r for r in json.load(arquivo)}
+    return [(r["nome"], base[r["nome"]]["p50_ms"], r["p50_ms"]) for r in resultados
+            if r["nome"] in base and r["p50_ms"] > limite * base[r["nome"]]["p50_ms"]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--salvar", metavar="ARQUIVO")
+    parser.add_argument("--comparar", metavar="ARQUIVO")
+    argumentos = parser.parse_args()
+
+    resultados = executar(argumentos.repeticoes)
+    imprimir(resultados)
+    if argumentos.salvar:
+        with open(argumentos.salvar, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, ensure_ascii=False, indent=2, default=float)
+    if argumentos.comparar:
+        lentos = comparar(resultados, argumentos.comparar)
+        for nome, antes, agora in lentos:
+            print(f"REGRESSÃO: {nome}: p50 {antes:.3f} ms -> {agora:.3f} ms")
+        sys.exit(1 if lentos else 0)
@@ -0,0 +1,126 @@
+"""Tempo até a primeira renderização da interface, em processos Python novos.
+
+    python tests/benchmark_inicio.py                      # tabela no terminal
+    python tests/benchmark_inicio.py --salvar base.json   # grava os resultados
+    python tests/benchmark_inicio.py --comparar base.json # falha se algo ficou mais lento que o limite
+
+Cada processo abre o app.py uma vez, com o catálogo local
+(ISOLAFACIL_CATALOGO_FIXTURE), e mede a importação do streamlit, o tempo do
+início do script até o título da página, a primeira execução completa e uma
+reexecução. Também informa quais módulos pesados já estavam carregados no
+título e ao fim da primeira execução.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(PASTA)
+sys.path.insert(0, PASTA)
+sys.path.insert(0, RAIZ)
+
+CAMINHO_APP = os.path.join(RAIZ, "app.py")
+CAMINHO_CATALOGO = os.path.join(PASTA, "dados", "catalogo.json")
+PESADOS = ("numpy", "pandas", "PIL", "pyarrow", "altair", "scipy", "fpdf", "gspread", "oauth2client")
+ETAPAS = ("importar streamlit", "primeira renderização", "primeira execução", "reexecução")
+
+
+def _carregados():
+    return [m for m in PESADOS if m in sys.modules]
+
+
+def medir_processo():
+    """Executado no processo filho: uma abertura da página, do zero."""
+    inicio = time.perf_counter()
+    import streamlit
+    from streamlit.testing.v1 import AppTest
+    importacao = time.perf_counter() - inicio
+
+    # O título é o primeiro elemento depois do logo: marca quando a página já tem conteúdo.
+    marcas = {}
+    titulo = streamlit.title
+
+    def title(*args, **kwargs):
+        if "titulo" not in marcas:
+            marcas["titulo"], marcas["modulos"] = time.perf_counter(), _carregados()
+        return titulo(*args, **kwargs)
+
+    streamlit.title = title
+    app = AppTest.from_file(CAMINHO_APP, default_timeout=120)
+    comeco = time.perf_counter()
+    app.run()
+    primeira = time.perf_counter() - comeco
+    modulos = _carregados()
+    comeco_reexecucao = time.perf_counter()
+    app.run()
+    reexecucao = time.perf_counter() - comeco_reexecucao
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return {
+        "tempos": dict(zip(ETAPAS, (importacao, marcas["titulo"] - comeco, primeira, reexecucao))),
+        "modulos_renderizacao": marcas["modulos"],
+        "modulos_primeira_execucao": modulos,
+    }
+
+
+def executar(processos=3):
+    """Mede ``processos`` aberturas; o primeiro processo também cria a cópia local do catálogo."""
+    # benchmark importa o solver em lote (NumPy/pandas); só o processo de medição, nunca o filho.
+    import benchmark
+
+    execucoes = []
+    with tempfile.TemporaryDirectory() as pasta:
+        ambiente = {**os.environ, "ISOLAFACIL_CATALOGO_FIXTURE": CAMINHO_CATALOGO,
+                    "ISOLAFACIL_CATALOGO_DB": os.path.join(pasta, "catalogo.sqlite")}
+        for _ in range(processos):
+            saida = subprocess.run([sys.executable, "-W", "ignore", os.path.abspath(__file__), "--filho"],
+                                   env=ambiente, cwd=pasta, capture_output=True, text=True, check=True)
+            execucoes.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+
+    resultados = []
+    for etapa in ETAPAS:
+        tempos = [e["tempos"][etapa] for e in execucoes]
+        resultados.append({
+            "nome": etapa,
+            "chamadas": len(tempos),
+            "por_segundo": len(tempos) / sum(tempos),
+            "p50_ms": benchmark._percentil(tempos, 50) * 1000,
+            "p99_ms": benchmark._percentil(tempos, 99) * 1000,
+            "avaliacoes_media": None,
+            "avaliacoes_max": None,
+        })
+    modulos = {chave: sorted(set().union(*(e[chave] for e in execucoes)))
+               for chave in ("modulos_renderizacao", "modulos_primeira_execucao")}
+    return resultados, modulos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processos", type=int, default=3)
+    parser.add_argument("--salvar", metavar="ARQUIVO")
+    parser.add_argument("--comparar", metavar="ARQUIVO")
+    parser.add_argument("--filho", action="store_true", help=argparse.SUPPRESS)
+    argumentos = parser.parse_args()
+
+    if argumentos.filho:
+        print(json.dumps(medir_processo(), ensure_ascii=False))
+        sys.exit(0)
+
+    import benchmark
+
+    resultados, modulos = executar(argumentos.processos)
+    benchmark.imprimir(resultados)
+    print(f"\nmódulos pesados no título:          {', '.join(modulos['modulos_renderizacao']) or '-'}")
+    print(f"módulos pesados na primeira execução: {', '.join(modulos['modulos_primeira_execucao']) or '-'}")
+    if argumentos.salvar:
+        with open(argumentos.salvar, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, ensure_ascii=False, indent=2, default=float)
+    if argumentos.comparar:
+        lentos = benchmark.comparar(resultados, argumentos.comparar)
+        for nome, antes, agora in lentos:
+            print(f"REGRESSÃO: {nome}: p50 {antes:.3f} ms -> {agora:.3f} ms")
+        sys.exit(1 if lentos else 0)
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from referencia import carregar_casos, carregar_catalogo  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def catalogo():
+    """Registros de materiais e acabamentos lidos do JSON local, no lugar da planilha."""
+    return carregar_catalogo()
+
+
+@pytest.fixture(scope="session")
+def casos():
+    return carregar_casos()
@@ -0,0 +1,252 @@
+"""Corpus de casos de referência e implementação independente para gerá-los.
+
+Os valores de referência seguem o procedimento da ASTM C680: balanço entre
+a condução no isolante, com k avaliado na temperatura média, e a perda por
+convecção + radiação na superfície. Nada da física vem do pacote: a fórmula
+k(T) é avaliada aqui mesmo, as propriedades do ar são interpoladas direto da
+tabela publicada (Incropera, Tabela A.4) na temperatura de filme, e as
+correlações de convecção, a condução plana e cilíndrica e a temperatura de
+orvalho (Magnus) estão reescritas abaixo. Do pacote só se usa a leitura do
+catálogo (nomes, fórmulas e emissividades).
+
+O balanço é resolvido por bissecção simples até 1e-9 °C, sem nenhum dos
+atalhos do solver (Brent, estimativa inicial, tolerância em fluxo), e os
+resultados ficam gravados em ``dados/casos_referencia.json``. Os testes
+comparam o código atual com esses valores; qualquer mudança de física ou de
+solver que os desloque além da tolerância falha.
+
+Para regravar após uma mudança intencional de física:
+
+    python tests/referencia.py --gravar
+"""
+import json
+import math
+import os
+import sys
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA))
+
+from isolafacil.materiais import montar_acabamentos, montar_materiais  # noqa: E402
+
+CAMINHO_CATALOGO = os.path.join(PASTA, "dados", "catalogo.json")
+CAMINHO_CASOS = os.path.join(PASTA, "dados", "casos_referencia.json")
+
+# Tolerâncias da regressão
+TOLERANCIA_TF = 0.1          # °C
+TOLERANCIA_Q_RELATIVA = 0.005
+TOLERANCIA_Q_ABSOLUTA = 0.5  # W/m²
+TOLERANCIA_ESPESSURA = 0.2   # mm
+
+PLANA, TUBO = "Superfície Plana", "Tubulação"
+
+# (nome, material, acabamento, geometria, diâmetro [mm], Tq, To, espessura [mm], vento [m/s])
+CASOS_FACE_FRIA = (
+    ("plana_quente_250", "Lã de Rocha 64 kg/m³", "Alumínio", PLANA, 0, 250, 30, 51, 0),
+    ("plana_morna_100", "Lã de Vidro", "Pintado", PLANA, 0, 100, 25, 25, 0),
+    ("plana_alta_600", "Silicato de Cálcio", "Aço Inox", PLANA, 0, 600, 20, 100, 0),
+    ("tubo_vapor_250", "Lã de Rocha 64 kg/m³", "Alumínio", TUBO, 88.9, 250, 30, 51, 0),
+    ("tubo_fino_180", "Lã de Vidro", "Pintado", TUBO, 33.4, 180, 25, 25, 0),
+    ("tubo_grande_450", "Silicato de Cálcio", "Alumínio", TUBO, 219.1, 450, 20, 76, 0),
+    ("plana_vento_5", "Lã de Rocha 64 kg/m³", "Pintado", PLANA, 0, 250, 30, 51, 5),
+    ("tubo_vento_3", "Lã de Vidro", "Aço Inox", TUBO, 60.3, 150, 25, 38, 3),
+    ("plana_fria", "Elastomérico", "Pintado", PLANA, 0, -10, 25, 19, 0),
+    ("tubo_frio", "Elastomérico", "Pintado", TUBO, 48.3, -20, 30, 32, 0),
+)
+
+# (nome, acabamento, geometria, diâmetro [mm], Tq, To, [(material, espessura [mm]), ...])
+CASOS_MULTICAMADA = (
+    ("plana_duas_camadas", "Alumínio", PLANA, 0, 500, 25, (("Silicato de Cálcio", 50), ("Lã de Vidro", 50))),
+    ("tubo_tres_camadas", "Pintado", TUBO, 114.3, 400, 25,
+     (("Silicato de Cálcio", 25), ("Lã de Rocha 64 kg/m³", 38), ("Lã de Vidro", 25))),
+)
+
+# (nome, material, geometria, diâmetro [mm], Ti, Ta, UR [%], vento [m/s])
+CASOS_ESPESSURA = (
+    ("condensacao_plana", "Elastomérico", PLANA, 0, 5, 25, 70, 0),
+    ("condensacao_tubo", "Elastomérico", TUBO, 48.3, -20, 30, 80, 0),
+    ("condensacao_tubo_vento", "Elastomérico", TUBO, 21.3, 0, 32, 85, 2),
+)
+
+
+def carregar_catalogo():
+    with open(CAMINHO_CATALOGO, encoding="utf-8") as arquivo:
+        dados = json.load(arquivo)
+    isolantes, _ = montar_materiais(dados["Isolantes 2"])
+    return isolantes, montar_acabamentos(dados["Emissividade"])
+
+
+# --- FÍSICA DE REFERÊNCIA ---
+SIGMA = 5.67e-8   # W/m².K⁴
+G = 9.81          # m/s²
+
+# Ar seco a 1 atm (Incropera, Tabela A.4): T [K], ν [m²/s], k [W/m.K], α [m²/s], Pr
+AR = (
+    (150, 4.426e-6, 13.8e-3, 5.84e-6, 0.758),
+    (200, 7.590e-6, 18.1e-3, 10.3e-6, 0.737),
+    (250, 11.44e-6, 22.3e-3, 15.9e-6, 0.720),
+    (300, 15.89e-6, 26.3e-3, 22.5e-6, 0.707),
+    (350, 20.92e-6, 30.0e-3, 29.9e-6, 0.700),
+    (400, 26.41e-6, 33.8e-3, 38.3e-6, 0.690),
+    (450, 32.39e-6, 37.3e-3, 47.2e-6, 0.686),
+    (500, 38.79e-6, 40.7e-3, 56.7e-6, 0.684),
+    (550, 45.57e-6, 43.9e-3, 66.7e-6, 0.683),
+    (600, 52.69e-6, 46.9e-3, 76.9e-6, 0.685),
+    (650, 60.21e-6, 49.7e-3, 87.3e-6, 0.690),
+    (700, 68.10e-6, 52.4e-3, 98.0e-6, 0.695),
+    (750, 76.37e-6, 54.9e-3, 109.0e-6, 0.702),
+    (800, 84.93e-6, 57.3e-3, 120.0e-6, 0.709),
+)
+
+
+def ar(T):
+    """(ν, k, α, Pr) na temperatura T [K]: log-log entre os pontos da tabela para ν, k e α; linear para Pr."""
+    for (T0, *p0), (T1, *p1) in zip(AR, AR[1:]):
+        if T <= T1:
+            break
+    f = math.log(T / T0) / math.log(T1 / T0)
+    nu, k, alfa = (a * (b / a) ** f for a, b in zip(p0[:3], p1[:3]))
+    return nu, k, alfa, p0[3] + (p1[3] - p0[3]) * (T - T0) / (T1 - T0)
+
+
+def k_isolante(k_func_str, T):
+    return eval(str(k_func_str).replace(",", "."), {"__builtins__": {}, "math": math}, {"T": T})
+
+
+def h_conveccao(Tf, To, geometria, D_ext, vento):
+    """Coeficiente de convecção [W/m².K] na temperatura de filme."""
+    if Tf == To:
+        return 0.0
+    T_filme = (Tf + To) / 2 + 273.15
+    nu, k_ar, alfa, Pr = ar(T_filme)
+    if vento >= 1.0:
+        # Placa plana em escoamento paralelo (laminar ou misto), com o diâmetro como comprimento no tubo.
+        L = 1.0 if geometria == PLANA else D_ext
+        Re = vento * L / nu
+        Nu = (0.664 * Re ** 0.5 if Re < 5e5 else 0.037 * Re ** 0.8 - 871) * Pr ** (1 / 3)
+    else:
+        L = 0.1 if geometria == PLANA else D_ext
+        Ra = G * (1 / T_filme) * abs(Tf - To) * L ** 3 / (nu * alfa)
+        if geometria == PLANA:
+            Nu = 0.27 * Ra ** 0.25   # face quente para baixo / fria para cima
+        else:
+            Nu = (0.60 + 0.387 * Ra ** (1 / 6) / (1 + (0.559 / Pr) ** (9 / 16)) ** (8 / 27)) ** 2   # Churchill-Chu
+    return Nu * k_ar / L
+
+
+def q_superficie(Tf, To, geometria, emissividade, D_ext, vento=0):
+    return (h_conveccao(Tf, To, geometria, D_ext, vento) * (Tf - To)
+            + emissividade * SIGMA * ((Tf + 273.15) ** 4 - (To + 273.15) ** 4))
+
+
+def conducao(geometria, L, diametro_m):
+    """(comprimento equivalente [m], diâmetro externo [m]): q na face externa = k·ΔT / comprimento."""
+    if geometria == PLANA:
+        return L, L
+    r_i, r_e = diametro_m / 2, diametro_m / 2 + L
+    return r_e * math.log(r_e / r_i), 2 * r_e
+
+
+def orvalho(Ta, UR):
+    """Fórmula de Magnus (a = 17,27; b = 237,7 °C)."""
+    gama = math.log(UR / 100) + 17.27 * Ta / (237.7 + Ta)
+    return 237.7 * gama / (17.27 - gama)
+
+
+def _bisseccao(funcao, a, b, tolerancia=1e-9):
+    fa = funcao(a)
+    for _ in range(200):
+        meio = (a + b) / 2
+        fm = funcao(meio)
+        if (fm > 0) == (fa > 0):
+            a, fa = meio, fm
+        else:
+            b = meio
+        if abs(b - a) < tolerancia:
+            break
+    return (a + b) / 2
+
+
+def face_fria(Tq, To, L, k_func_str, geometria, emissividade, diametro_m=None, vento=0):
+    comprimento, D_ext = conducao(geometria, L, diametro_m)
+
+    def balanco(Tf):
+        return (k_isolante(k_func_str, (Tq + Tf) / 2) * (Tq - Tf) / comprimento
+                - q_superficie(Tf, To, geometria, emissividade, D_ext, vento))
+
+    Tf = _bisseccao(balanco, min(Tq, To), max(Tq, To))
+    return Tf, q_superficie(Tf, To, geometria, emissividade, D_ext, vento)
+
+
+def multicamada(Tq, To, camadas, geometria, emissividade, diametro_m=None):
+    """Tiro simples: dado Tf, o fluxo fixa cada interface de fora para dentro; busca-se Tf que reproduza Tq."""
+    if geometria == PLANA:
+        fatores = [1 / L for _, L in camadas]
+        D_ext = sum(L for _, L in camadas)
+    else:
+        raios = [diametro_m / 2]
+        for _, L in camadas:
+            raios.append(raios[-1] + L)
+        fatores = [1 / (raios[-1] * math.log(raios[i + 1] / raios[i])) for i in range(len(camadas))]
+        D_ext = 2 * raios[-1]
+    formulas = [k for k, _ in camadas]
+
+    def temperaturas(Tf):
+        q = q_superficie(Tf, To, geometria, emissividade, D_ext)
+        faces = [Tf]
+        for formula, fator in zip(reversed(formulas), reversed(fatores)):
+            fria = faces[0]
+            # q = k((Tq_i + fria)/2) * (Tq_i - fria) * fator, resolvido para a face quente da camada
+            quente = _bisseccao(lambda T: k_isolante(formula, (T + fria) / 2) * (T - fria) * fator - q,
+                                fria, fria + 5000)
+            faces.insert(0, quente)
+        return faces, q
+
+    Tf = _bisseccao(lambda T: temperaturas(T)[0][0] - Tq, min(Tq, To), max(Tq, To))
+    faces, q = temperaturas(Tf)
+    return faces[1:], q
+
+
+def espessura(Ti, Ta, UR, k_func_str, geometria, emissividade, diametro_m=None, vento=0):
+    T_orvalho = orvalho(Ta, UR)
+    L = _bisseccao(lambda L: face_fria(Ti, Ta, L, k_func_str, geometria, emissividade, diametro_m, vento)[0] - T_orvalho,
+                   0.001, 0.5, 1e-7)
+    return L, T_orvalho
+
+
+def gerar():
+    isolantes, acabamentos = carregar_catalogo()
+    casos = {"face_fria": [], "multicamada": [], "espessura": []}
+    for nome, material, acabamento, geometria, D, Tq, To, L, vento in CASOS_FACE_FRIA:
+        Tf, q = face_fria(Tq, To, L / 1000, isolantes[material].k_func_str, geometria,
+                          acabamentos[acabamento].emissividade, D / 1000 or None, vento)
+        casos["face_fria"].append({"nome": nome, "material": material, "acabamento": acabamento, "geometria": geometria,
+                                   "diametro_mm": D, "tq": Tq, "to": To, "espessura_mm": L, "vento_ms": vento,
+                                   "tf": round(Tf, 4), "q": round(q, 3)})
+    for nome, acabamento, geometria, D, Tq, To, camadas in CASOS_MULTICAMADA:
+        faces, q = multicamada(Tq, To, [(isolantes[m].k_func_str, L / 1000) for m, L in camadas], geometria,
+                               acabamentos[acabamento].emissividade, D / 1000 or None)
+        casos["multicamada"].append({"nome": nome, "acabamento": acabamento, "geometria": geometria, "diametro_mm": D,
+                                     "tq": Tq, "to": To, "camadas": [list(c) for c in camadas],
+                                     "temperaturas": [round(T, 4) for T in faces], "q": round(q, 3)})
+    for nome, material, geometria, D, Ti, Ta, UR, vento in CASOS_ESPESSURA:
+        L, T_orvalho = espessura(Ti, Ta, UR, isolantes[material].k_func_str, geometria, 0.9, D / 1000 or None, vento)
+        casos["espessura"].append({"nome": nome, "material": material, "geometria": geometria, "diametro_mm": D,
+                                   "ti": Ti, "ta": Ta, "ur": UR, "vento_ms": vento,
+                                   "t_orvalho": round(T_orvalho, 4), "espessura_mm": round(L * 1000, 4)})
+    return casos
+
+
+def carregar_casos():
+    with open(CAMINHO_CASOS, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+if __name__ == "__main__":
+    if "--gravar" in sys.argv:
+        with open(CAMINHO_CASOS, "w", encoding="utf-8", newline="\r\n") as arquivo:
+            json.dump(gerar(), arquivo, ensure_ascii=False, indent=2)
+            arquivo.write("\n")
+        print(f"Casos gravados em {CAMINHO_CASOS}")
+    else:
+        print(json.dumps(gerar(), ensure_ascii=False, indent=2))
@@ -0,0 +1,134 @@
+"""API ASGI chamada diretamente, com receive/send falsos e o catálogo de referência numa cópia local."""
+import asyncio
+import json
+import math
+
+import pytest
+
+from isolafacil import api
+from isolafacil.catalogo import CatalogoLocal, FonteArquivo
+from referencia import CAMINHO_CATALOGO
+
+K = "0,0337 + 0,000149*T"
+
+
+@pytest.fixture(autouse=True)
+def catalogo_local(tmp_path, monkeypatch):
+    caminho = str(tmp_path / "catalogo.sqlite")
+    CatalogoLocal(FonteArquivo(CAMINHO_CATALOGO), caminho).atualizar()
+    monkeypatch.setenv("ISOLAFACIL_CATALOGO_DB", caminho)
+    monkeypatch.setattr(api, "_registros", {})
+
+
+def chamar(metodo, caminho, corpo=None, partes=None):
+    """Resposta (status, cabeçalhos, dados) de uma requisição; ``partes`` envia o corpo em pedaços."""
+    if partes is None:
+        partes = [b"" if corpo is None else json.dumps(corpo).encode()]
+    mensagens = [{"type": "http.request", "body": parte, "more_body": i < len(partes) - 1}
+                 for i, parte in enumerate(partes)]
+    enviadas = []
+
+    async def receive():
+        return mensagens.pop(0)
+
+    async def send(mensagem):
+        enviadas.append(mensagem)
+
+    asyncio.run(api.app({"type": "http", "method": metodo, "path": caminho}, receive, send))
+    inicio, corpo_resposta = enviadas
+    cabecalhos = dict(inicio["headers"])
+    dados = corpo_resposta["body"].decode()
+    if cabecalhos[b"content-type"].startswith(b"application/json"):
+        dados = json.loads(dados)
+    return inicio["status"], cabecalhos, dados
+
+
+def test_face_fria_por_material_e_acabamento():
+    status, cabecalhos, dados = chamar("POST", "/face-fria", {
+        "tq": 250, "to": 25, "espessura_mm": 51, "material": "Lã de Rocha 64 kg/m³", "acabamento": "Alumínio",
+        "financeiro": {"combustivel": "Óleo BPF (kg)"}})
+    assert status == 200
+    assert dados["convergiu"] and 25 < dados["tf"] < 250
+    assert dados["perda_com_kw"] < dados["perda_sem_kw"]
+    assert "financeiro" in dados
+    assert b"total;dur=" in cabecalhos[b"server-timing"]
+
+
+def test_tubulacao_por_metro():
+    caso = {"tq": 250, "to": 25, "espessura_mm": 51, "k_func": K, "geometria": "Tubulação", "diametro_mm": 88.9}
+    status, _, dados = chamar("POST", "/face-fria", {**caso, "financeiro": {
+        "combustivel": "Óleo BPF (kg)", "comprimento_m": 10, "h_dia": 24, "d_sem": 7}})
+    assert status == 200
+    assert dados["perda_com_kw_m"] == pytest.approx(dados["perda_com_kw"] * math.pi * (0.0889 + 0.102))
+    assert dados["perda_sem_kw_m"] == pytest.approx(dados["perda_sem_kw"] * math.pi * 0.0889)
+    _, _, um_metro = chamar("POST", "/face-fria", {**caso, "financeiro": {
+        "combustivel": "Óleo BPF (kg)", "h_dia": 24, "d_sem": 7}})
+    assert dados["financeiro"]["eco_anual"] == pytest.approx(10 * um_metro["financeiro"]["eco_anual"])
+
+    status, _, dados = chamar("POST", "/face-fria", {**caso, "financeiro": {"combustivel": "Óleo BPF (kg)", "area_m2": 5}})
+    assert status == 400 and "comprimento_m" in dados["erro"]
+
+
+def test_lote_e_espessura_minima():
+    casos = [{"tq": tq, "to": 25, "espessura_mm": 50, "k_func": K} for tq in (100, 200, 300)]
+    status, _, dados = chamar("POST", "/face-fria/lote", {"casos": casos})
+    assert status == 200
+    tf = [r["tf"] for r in dados["resultados"]]
+    assert tf == sorted(tf) and len(tf) == 3
+
+    status, _, dados = chamar("POST", "/espessura-minima", {
+        "ti": -10, "ta": 30, "ur": 70, "k_func": K, "geometria": "Tubulação", "diametro_mm": 88.9,
+        "espessuras_comerciais_mm": [13, 19, 25, 32]})
+    assert status == 200 and dados["encontrada"]
+    assert dados["espessura_comercial_mm"] in (13, 19, 25, 32)
+
+
+@pytest.mark.parametrize("caminho, corpo", [
+    ("/face-fria/lote", {"casos": [{"tq": 250, "to": 25, "espessura_mm": 50, "k_func": "__import__('os')"}]}),
+    ("/espessura-minima", {"ti": -10, "ta": 30, "ur": 70, "k_func": K, "espessuras_comerciais_mm": "13, 19"}),
+    ("/face-fria", {"tq": 250, "to": 25, "espessura_mm": 50, "material": ["Lã de Rocha 64 kg/m³"]}),
+    ("/face-fria", {"tq": 250, "to": 25, "espessura_mm": 50, "k_func": K, "acabamento": {"nome": "Alumínio"}}),
+    ("/face-fria", {"tq": "quente", "to": 25, "espessura_mm": 50, "k_func": K}),
+    ("/orvalho", {"ta": 30, "ur": 150}),
+    ("/face-fria", {"tq": 250, "to": 25, "espessura_mm": 0, "k_func": K}),
+    ("/face-fria", {"tq": 250, "to": 25, "espessura_mm": -50, "k_func": K}),
+    ("/face-fria", {"tq": 250, "to": 25, "espessura_mm": 50, "k_func": K, "geometria": "Tubulação"}),
+    ("/face-fria", {"tq": 250, "to": 25, "espessura_mm": 50, "k_func": K, "geometria": "Tubulação", "diametro_mm": 0}),
+    ("/face-fria", {"tq": 250, "to": 25, "espessura_mm": 50, "k_func": K, "emissividade": 5}),
+    ("/face-fria", {"tq": 250, "to": 25, "espessura_mm": 50, "k_func": K, "emissividade": 0}),
+    ("/face-fria", {"tq": 250, "to": 25, "espessura_mm": 50, "k_func": "0.05 - 0.0004*T"}),   # k < 0 acima de 125 °C
+    ("/face-fria", {"tq": 250, "to": 25, "espessura_mm": 50, "k_func": "0.04 + 0*9**9**8"}),
+    ("/face-fria/lote", {"casos": [{"tq": 250, "to": 25, "espessura_mm": 50, "k_func": K},
+                                   {"tq": 250, "to": 25, "espessura_mm": 0, "k_func": K}]}),
+])
+def test_entrada_invalida_responde_400(caminho, corpo):
+    status, _, dados = chamar("POST", caminho, corpo)
+    assert status == 400
+    assert dados["erro"]
+
+
+def test_corpo_invalido_responde_400():
+    assert chamar("POST", "/orvalho", partes=[b"{nao e json"])[0] == 400
+    assert chamar("POST", "/orvalho", partes=[b"[1, 2]"])[0] == 400
+
+
+def test_nao_encontrado_e_metodo():
+    assert chamar("GET", "/inexistente")[0] == 404
+    status, _, dados = chamar("POST", "/face-fria", {"tq": 250, "to": 25, "espessura_mm": 50, "material": "Cortiça"})
+    assert status == 404 and "Cortiça" in dados["erro"]
+    assert chamar("GET", "/face-fria")[0] == 405
+
+
+def test_limites_de_tamanho(monkeypatch):
+    monkeypatch.setattr(api, "TAMANHO_MAXIMO_CORPO", 1024)
+    assert chamar("POST", "/orvalho", partes=[b" " * 600, b" " * 600])[0] == 413
+    monkeypatch.setattr(api, "MAXIMO_CASOS_LOTE", 2)
+    casos = [{"tq": 100, "to": 25, "espessura_mm": 50, "k_func": K}] * 3
+    assert chamar("POST", "/face-fria/lote", {"casos": casos})[0] == 413
+
+
+def test_saude_e_metricas():
+    status, _, dados = chamar("GET", "/saude")
+    assert status == 200 and dados["situacao"] == "ok"
+    status, cabecalhos, texto = chamar("GET", "/metricas")
+    assert status == 200 and cabecalhos[b"content-type"].startswith(b"text/plain")
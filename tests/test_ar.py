@@ -0,0 +1,23 @@
+"""Propriedades do ar: consultas escalares e vetorizadas devem coincidir, inclusive fora da tabela e com NaN."""
+import math
+
+import numpy as np
+import pytest
+
+from isolafacil.ar import COLUNAS, conveccao, propriedades, propriedades_vetorizado
+
+T = [100.0, 150.0, 300.0, 333.3, 600.0, 5000.0, math.inf, -math.inf]
+
+
+def test_escalar_igual_a_vetorizado():
+    vetorizado = propriedades_vetorizado(np.array(T))
+    for j, t in enumerate(T):
+        escalar = propriedades(t)
+        assert [escalar[nome] for nome in COLUNAS] == pytest.approx([vetorizado[nome][j] for nome in COLUNAS])
+
+
+def test_nan_resulta_em_nan():
+    assert all(math.isnan(v) for v in propriedades(math.nan).values())
+    assert all(math.isnan(v) for v in conveccao(math.nan))
+    vetorizado = propriedades_vetorizado(np.array([math.nan, 300.0]))
+    assert all(np.isnan(vetorizado[nome][0]) and np.isfinite(vetorizado[nome][1]) for nome in COLUNAS)
@@ -0,0 +1,126 @@
+"""Fila de auditoria das simulações contra um cliente gspread falso, em memória."""
+import time
+
+import pytest
+from gspread.exceptions import WorksheetNotFound
+
+from isolafacil.auditoria import COLUNAS, FilaSimulacoes, abrir_aba, linha_simulacao
+
+DADOS = {"material": "Lã de Rocha 64 kg/m³", "acabamento": "Alumínio", "geometria": "Tubulação", "diametro_tubo": 88.9,
+         "materiais_camadas": ["Lã de Rocha 64 kg/m³"], "espessuras": [51.0], "esp_total": 51.0, "tq": 250, "to": 25,
+         "emissividade": 0.1, "tf": 38.2, "perda_com_kw": 0.1, "perda_sem_kw": 1.2, "perda_com_kw_m": 0.06,
+         "perda_sem_kw_m": 0.33, "calculo_financeiro": False}
+
+
+class AbaFalsa:
+    def __init__(self, falhas=0, atraso=0.0):
+        self.linhas, self.chamadas = [], 0
+        self.falhas, self.atraso = falhas, atraso
+
+    def append_row(self, linha):
+        self.linhas.append(linha)
+
+    def append_rows(self, linhas, value_input_option=None):
+        self.chamadas += 1
+        time.sleep(self.atraso)
+        if self.falhas:
+            self.falhas -= 1
+            raise ConnectionError("quota excedida")
+        self.linhas.extend(linhas)
+
+
+class PlanilhaFalsa:
+    def __init__(self, aba=None):
+        self.abas = {}
+        self.aba_nova = aba or AbaFalsa()
+
+    def worksheet(self, nome):
+        if nome not in self.abas:
+            raise WorksheetNotFound(nome)
+        return self.abas[nome]
+
+    def add_worksheet(self, title, rows, cols):
+        self.abas[title] = self.aba_nova
+        return self.aba_nova
+
+
+def _fila(tmp_path, abrir, **opcoes):
+    return FilaSimulacoes(abrir, str(tmp_path / "simulacoes.sqlite"), intervalo=0.2, intervalo_spool=0.2,
+                          tentativas=3, espera_inicial=0.0, **opcoes)
+
+
+def _aguardar(condicao, limite=5.0):
+    fim = time.monotonic() + limite
+    while not condicao() and time.monotonic() < fim:
+        time.sleep(0.01)
+    assert condicao()
+
+
+def test_linha_da_simulacao():
+    linha = linha_simulacao("quente", DADOS)
+    assert len(linha) == len(COLUNAS)
+    por_coluna = dict(zip(COLUNAS, linha))
+    assert (por_coluna["tipo"], por_coluna["temperatura_interna"], por_coluna["espessura_mm"]) == ("quente", 250, 51.0)
+    assert por_coluna["t_orvalho"] == ""
+    frio = dict(zip(COLUNAS, linha_simulacao("frio", {"ti": -10, "ta": 30, "ur": 70, "espessura_final": 32.0})))
+    assert (frio["temperatura_interna"], frio["temperatura_ambiente"], frio["espessura_mm"]) == (-10, 30, 32.0)
+
+
+def test_cliques_viram_um_lote_sem_esperar_a_planilha(tmp_path):
+    planilha = PlanilhaFalsa(AbaFalsa(atraso=0.3))
+    fila = _fila(tmp_path, lambda: abrir_aba(planilha))
+    inicio = time.perf_counter()
+    for tq in range(100, 105):
+        fila.registrar("quente", {**DADOS, "tq": tq})
+    assert time.perf_counter() - inicio < 0.1
+
+    _aguardar(lambda: fila.enviadas == 5)
+    fila.fechar()
+    aba = planilha.abas["Simulações"]
+    assert aba.chamadas == 1
+    assert aba.linhas[0] == list(COLUNAS)
+    assert [dict(zip(COLUNAS, linha))["temperatura_interna"] for linha in aba.linhas[1:]] == list(range(100, 105))
+    assert fila.pendentes() == 0
+
+
+def test_falhas_temporarias_sao_repetidas(tmp_path):
+    planilha = PlanilhaFalsa(AbaFalsa(falhas=2))
+    fila = _fila(tmp_path, lambda: abrir_aba(planilha))
+    fila.registrar("quente", DADOS)
+    _aguardar(lambda: fila.enviadas == 1)
+    fila.fechar()
+    assert planilha.abas["Simulações"].chamadas == 3
+    assert fila.ultimo_erro is None
+
+
+def test_planilha_fora_do_ar_usa_o_spool(tmp_path):
+    def indisponivel():
+        raise ConnectionError("sem rede")
+
+    fora = _fila(tmp_path, indisponivel)
+    for tq in (100, 101, 102):
+        fora.registrar("quente", {**DADOS, "tq": tq})
+    _aguardar(lambda: fora.pendentes() == 3)
+    fora.fechar()
+    assert isinstance(fora.ultimo_erro, ConnectionError)
+
+    # Na próxima execução o spool é enviado primeiro, mesmo antes de uma simulação nova.
+    planilha = PlanilhaFalsa()
+    volta = _fila(tmp_path, lambda: abrir_aba(planilha))
+    _aguardar(lambda: volta.enviadas == 3)
+    volta.registrar("quente", {**DADOS, "tq": 103})
+    _aguardar(lambda: volta.enviadas == 4)
+    volta.fechar()
+    linhas = planilha.abas["Simulações"].linhas[1:]
+    assert [dict(zip(COLUNAS, linha))["temperatura_interna"] for linha in linhas] == [100, 101, 102, 103]
+    assert volta.pendentes() == 0
+
+
+@pytest.mark.parametrize("atraso", [0.0, 0.5])
+def test_fechar_guarda_o_que_nao_foi_enviado(tmp_path, atraso):
+    planilha = PlanilhaFalsa(AbaFalsa(falhas=100, atraso=atraso))
+    fila = _fila(tmp_path, lambda: abrir_aba(planilha))
+    fila.registrar("quente", DADOS)
+    fila.registrar("frio", {"ti": -10, "ta": 30})
+    fila.fechar(timeout=2.0)
+    assert fila.pendentes() == 2
@@ -0,0 +1,71 @@
+"""Cache de soluções da face fria: quantização da chave, falhas por mudança de caso e remoção LRU."""
+import pytest
+
+from isolafacil import cache_resultados
+from isolafacil.cache_resultados import CacheResultados
+
+LA_DE_ROCHA = "0,0337 + 0,000149*T + 2,8e-7*T**2"
+LA_DE_VIDRO = "0.031 + 0.00019*T"
+CASO = (250, 30, 0.051, LA_DE_ROCHA, "Tubulação", 0.1, 0.0889)
+
+
+@pytest.fixture
+def chamadas(monkeypatch):
+    """Conta as chamadas reais ao solver."""
+    contagem = []
+    original = cache_resultados.resolver_face_fria
+
+    def contar(*args, **kwargs):
+        contagem.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(cache_resultados, "resolver_face_fria", contar)
+    return contagem
+
+
+def test_entrada_arredondada_para_a_mesma_chave(chamadas):
+    cache = CacheResultados()
+    primeiro = cache.resolver(*CASO)
+    # Diferenças abaixo das casas da chave, vírgula no lugar de ponto e espaços extras na fórmula.
+    segundo = cache.resolver(250.001, 29.999, 0.051000004, " 0.0337+0.000149*T + 2.8e-7*T**2 ", "Tubulação",
+                             0.1002, 0.08890001)
+    assert segundo is primeiro
+    assert len(chamadas) == 1
+    assert cache.estatisticas()["acertos"] == 1
+
+    # Em superfície plana o diâmetro não faz parte do caso.
+    plana = cache.resolver(250, 30, 0.051, LA_DE_ROCHA, "Superfície Plana", 0.1, 0.0889)
+    assert cache.resolver(250, 30, 0.051, LA_DE_ROCHA, "Superfície Plana", 0.1, None) is plana
+
+
+@pytest.mark.parametrize("alterado", [
+    (250, 30, 0.051, LA_DE_VIDRO, "Tubulação", 0.1, 0.0889),          # outro material
+    (250, 30, 0.051, LA_DE_ROCHA + " + 0.001", "Tubulação", 0.1, 0.0889),  # outra k(T)
+    (250, 30, 0.051, LA_DE_ROCHA, "Superfície Plana", 0.1, None),      # outra geometria
+    (250, 30, 0.051, LA_DE_ROCHA, "Tubulação", 0.1, 0.1143),           # outro diâmetro
+    (250, 30, 0.052, LA_DE_ROCHA, "Tubulação", 0.1, 0.0889),           # outra espessura
+])
+def test_caso_diferente_e_falha(chamadas, alterado):
+    cache = CacheResultados()
+    original = cache.resolver(*CASO)
+    outro = cache.resolver(*alterado)
+    assert outro is not original and outro.Tf != original.Tf
+    assert len(chamadas) == 2
+    assert cache.estatisticas()["falhas"] == 2
+
+
+def test_remocao_do_menos_usado(chamadas):
+    cache = CacheResultados(tamanho_maximo=2)
+    a = cache.resolver(100, 25, 0.05, LA_DE_VIDRO, "Superfície Plana", 0.9)
+    cache.resolver(150, 25, 0.05, LA_DE_VIDRO, "Superfície Plana", 0.9)
+    assert cache.resolver(100, 25, 0.05, LA_DE_VIDRO, "Superfície Plana", 0.9) is a   # a passa a ser o mais recente
+    cache.resolver(200, 25, 0.05, LA_DE_VIDRO, "Superfície Plana", 0.9)              # remove o de 150 °C
+
+    assert cache.resolver(100, 25, 0.05, LA_DE_VIDRO, "Superfície Plana", 0.9) is a
+    cache.resolver(150, 25, 0.05, LA_DE_VIDRO, "Superfície Plana", 0.9)
+    assert len(chamadas) == 4
+    assert cache.estatisticas() == {"tamanho": 2, "tamanho_maximo": 2, "acertos": 2, "falhas": 4, "remocoes": 2,
+                                    "taxa_acerto": pytest.approx(2 / 6)}
+
+    cache.limpar()
+    assert cache.estatisticas()["tamanho"] == 0 and cache.estatisticas()["falhas"] == 0
@@ -0,0 +1,85 @@
+"""Cópia local do catálogo com uma fonte falsa: revisão inalterada, falhas e atualização em segundo plano."""
+import threading
+
+from isolafacil.catalogo import CatalogoLocal
+
+ABAS = ("Isolantes 2", "Emissividade")
+DADOS = {"Isolantes 2": [{"Nome": "Lã de Rocha", "k": "0,04"}], "Emissividade": [{"Acabamento": "Alumínio", "e": 0.1}]}
+
+
+class FonteFalsa:
+    """Conta os downloads; ``falhar`` faz a próxima leitura levantar, ``liberar`` segura a leitura até ser acionado."""
+
+    def __init__(self, dados, revisao="r1"):
+        self.dados = dados
+        self.rev = revisao
+        self.falhar = False
+        self.liberar = None
+        self.downloads = []
+
+    def revisao(self):
+        if self.liberar is not None:
+            self.liberar.wait(5)
+        if self.falhar:
+            raise ConnectionError("planilha indisponível")
+        return self.rev
+
+    def registros(self, aba):
+        self.downloads.append(aba)
+        return self.dados[aba]
+
+
+def _catalogo(tmp_path, fonte, intervalo=300):
+    return CatalogoLocal(fonte, str(tmp_path / "catalogo.sqlite"), abas=ABAS, intervalo=intervalo)
+
+
+def test_revisao_inalterada_nao_baixa(tmp_path):
+    fonte = FonteFalsa(DADOS)
+    catalogo = _catalogo(tmp_path, fonte)
+    assert catalogo.atualizar()
+    assert fonte.downloads == list(ABAS)
+
+    assert not catalogo.atualizar()
+    assert fonte.downloads == list(ABAS)
+    assert catalogo.registros("Isolantes 2") == DADOS["Isolantes 2"]
+
+    fonte.rev = "r2"
+    fonte.dados = {**DADOS, "Emissividade": [{"Acabamento": "Pintado", "e": 0.9}]}
+    assert catalogo.atualizar()
+    assert fonte.downloads == list(ABAS) * 2
+    assert catalogo.registros("Emissividade") == [{"Acabamento": "Pintado", "e": 0.9}]
+    assert catalogo.revisao("Emissividade") == "r2"
+
+
+def test_falha_em_segundo_plano_mantem_copia(tmp_path):
+    fonte = FonteFalsa(DADOS)
+    catalogo = _catalogo(tmp_path, fonte, intervalo=0)
+    assert catalogo.atualizar()
+
+    fonte.falhar, fonte.rev = True, "r2"
+    fonte.liberar = threading.Event()
+    assert catalogo.atualizar_em_segundo_plano()
+    # Durante a atualização a leitura continua servindo a cópia gravada, e não dispara outra thread.
+    assert catalogo.registros("Isolantes 2") == DADOS["Isolantes 2"]
+    assert not catalogo.atualizar_em_segundo_plano()
+    fonte.liberar.set()
+    catalogo._thread.join(5)
+
+    assert isinstance(catalogo.ultimo_erro, ConnectionError)
+    assert catalogo.registros("Isolantes 2") == DADOS["Isolantes 2"]
+    assert catalogo.revisao("Isolantes 2") == "r1"
+    assert fonte.downloads == list(ABAS)
+
+    # A próxima sincronização bem-sucedida limpa o erro.
+    fonte.falhar, fonte.liberar = False, None
+    assert catalogo.atualizar() and catalogo.ultimo_erro is None
+    assert catalogo.revisao("Isolantes 2") == "r2"
+
+
+def test_copia_em_dia_nao_dispara_thread(tmp_path):
+    fonte = FonteFalsa(DADOS)
+    catalogo = _catalogo(tmp_path, fonte)
+    assert catalogo.desatualizado()
+    catalogo.atualizar()
+    assert not catalogo.desatualizado()
+    assert not catalogo.atualizar_em_segundo_plano()
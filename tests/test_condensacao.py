@@ -0,0 +1,63 @@
+"""Mapa de condensação: mesma espessura do cálculo isolado em cada célula e envelope por percentil."""
+import numpy as np
+import pytest
+
+from isolafacil.condensacao import mapa_condensacao
+from isolafacil.espessura import RESOLUCAO, arredondar_comercial, espessura_minima
+from isolafacil.psicrometria import temperatura_orvalho, temperatura_orvalho_vetorizada
+
+TA = np.linspace(10, 40, 13)
+UR = np.linspace(40, 95, 12)
+
+
+def test_orvalho_vetorizado():
+    Ta, UR_ = np.meshgrid(TA, UR)
+    esperado = [[temperatura_orvalho(a, u) for a, u in zip(linha_a, linha_u)] for linha_a, linha_u in zip(Ta, UR_)]
+    assert temperatura_orvalho_vetorizada(Ta, UR_) == pytest.approx(np.array(esperado))
+
+
+@pytest.mark.parametrize("geometria, diametro", [("Superfície Plana", None), ("Tubulação", 0.0889)])
+def test_celulas_iguais_ao_calculo_isolado(catalogo, geometria, diametro):
+    isolantes, _ = catalogo
+    k = isolantes["Elastomérico"].k_func_str
+    mapa = mapa_condensacao([-10.0, 5.0], TA, UR, k, geometria, 0.9, diametro)
+    assert mapa.espessura.shape == (2, len(TA), len(UR))
+    for i, Ti in enumerate(mapa.Ti):
+        for a, Ta in enumerate(TA):
+            for u, ur in enumerate(UR):
+                T_orvalho = temperatura_orvalho(Ta, ur)
+                if Ti >= T_orvalho:
+                    # Sem risco: a face já fica acima do orvalho sem isolante.
+                    assert mapa.espessura[i, a, u] == 0.0
+                    continue
+                isolado = espessura_minima(Ti, Ta, T_orvalho, k, geometria, 0.9, diametro)
+                assert isolado.encontrada
+                assert mapa.espessura[i, a, u] == pytest.approx(isolado.espessura, abs=RESOLUCAO)
+
+
+def test_sem_solucao_e_envelope(catalogo):
+    isolantes, _ = catalogo
+    k = isolantes["Elastomérico"].k_func_str
+    mapa = mapa_condensacao([0.0], TA, UR, k, "Tubulação", 0.9, 0.0889, L_max=0.03)
+    espessuras = mapa.espessura[0]
+    assert np.isnan(espessuras).any() and (espessuras == 0).any()
+
+    # 95 % das células atendem, contando as que nem L_max resolve como infinitas.
+    envelope = mapa.envelope(95)[0]
+    if np.isnan(envelope):
+        assert np.isnan(espessuras).mean() > 0.05
+    else:
+        assert (np.nan_to_num(espessuras, nan=np.inf) <= envelope).mean() >= 0.95
+    assert mapa.envelope(0)[0] == 0.0
+    # Sem espessura que resolva, nada de arredondar para a menor comercial.
+    assert arredondar_comercial(float("nan"), [9, 13, 19]) is None
+    assert arredondar_comercial(10.0, [9, 13, 19]) == 13
+
+    # Com toda a frequência num único clima, o envelope é a espessura desse clima.
+    pesos = np.zeros((len(TA), len(UR)))
+    pesos[3, 4] = 8760
+    assert mapa.envelope(95, pesos)[0] == espessuras[3, 4]
+
+    tabela = mapa.tabela()
+    assert len(tabela) == espessuras.size
+    assert tabela["espessura_mm"].iloc[4 + 3 * len(UR)] == pytest.approx(espessuras[3, 4] * 1000)
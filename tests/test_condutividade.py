@@ -0,0 +1,62 @@
+"""Fórmulas k(T): o caminho vetorizado (numpy) deve coincidir com o escalar (math)."""
+import ast
+import time
+
+import numpy as np
+import pytest
+
+from isolafacil.condutividade import FormulaK, FormulaKInvalida, _verificar, compilar_k, validar_k
+
+T = np.array([-50.0, 0.0, 25.0, 150.0, 400.0])
+
+
+def _formula(texto):
+    # compilar_k troca toda vírgula por ponto decimal; chamadas com mais de um argumento são montadas direto.
+    arvore = ast.parse(texto, mode="eval")
+    _verificar(arvore)
+    return FormulaK(texto, compile(f"lambda T: ({ast.unparse(arvore)})", "<k(T)>", "eval"))
+
+
+@pytest.mark.parametrize("texto", [
+    "0.03 + 0.001*math.log(T + 300, 10)",
+    "0.03 + 0.001*math.log(T + 300)",
+    "0.02 + math.pow(T + 273.15, 2)*1e-7",
+    "max(0.03, 0.02 + 0.0001*T)",
+    "0.04",
+])
+def test_vetorizada_igual_a_escalar(texto):
+    k = _formula(texto)
+    assert k.vetorizada(T) == pytest.approx([k(t) for t in T], rel=1e-12)
+
+
+def test_virgula_decimal():
+    k = compilar_k("0,0337 + 0,000149*T")
+    assert k(100) == pytest.approx(0.0486)
+    assert k.vetorizada(T) == pytest.approx([k(t) for t in T], rel=1e-12)
+
+
+@pytest.mark.parametrize("texto", ["0.04 + 0*9**9**8", "0.04 + 0*(T + 9)**9**9", "0.04 + 0*math.exp(9**9)"])
+def test_potencia_enorme_falha_rapido(texto):
+    k = compilar_k(texto)
+    inicio = time.perf_counter()
+    with pytest.raises(OverflowError):
+        k(100)
+    with pytest.raises(FormulaKInvalida):
+        validar_k(texto)
+    # No caminho vetorizado a potência vira inf (numpy) ou OverflowError (constantes em float).
+    try:
+        assert not np.isfinite(k.vetorizada(T)).all()
+    except OverflowError:
+        pass
+    assert time.perf_counter() - inicio < 1
+
+
+def test_constante_fora_da_faixa():
+    with pytest.raises(FormulaKInvalida, match="fora da faixa"):
+        compilar_k("1" + "0" * 400)
+
+
+@pytest.mark.parametrize("texto", ["math.log(T, 10, 2)", "math.sqrt(T, T)", "math.pow(T)", "math.exp(T, T)"])
+def test_numero_de_argumentos(texto):
+    with pytest.raises(FormulaKInvalida, match="número de argumentos"):
+        _verificar(ast.parse(texto, mode="eval"))
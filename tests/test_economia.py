@@ -0,0 +1,33 @@
+"""Espessura econômica: mínimo da curva de custo anual e sua resposta ao preço do combustível."""
+import numpy as np
+import pytest
+
+from isolafacil.economia import COMBUSTIVEIS, espessura_economica
+
+LA_DE_ROCHA = [("Lã de Rocha 64 kg/m³", "0,0337 + 0,000149*T + 2,8e-7*T**2")]
+ESPESSURAS = np.arange(0.005, 0.3, 0.005)
+
+
+def _otimizar(valor_comb, geometria="Tubulação"):
+    return espessura_economica(250, 25, geometria, LA_DE_ROCHA, ESPESSURAS, 1500.0, COMBUSTIVEIS["Óleo BPF (kg)"],
+                               8, 5, vida_util_anos=10, taxa_juros=0.1, valor_comb=valor_comb,
+                               pipe_diameter_m=0.0889 if geometria == "Tubulação" else None)
+
+
+@pytest.mark.parametrize("geometria", ["Tubulação", "Superfície Plana"])
+def test_curva_convexa_em_torno_do_otimo(geometria):
+    resultado = _otimizar(1.0, geometria)
+    custos = resultado.curva["custo_total_ano"].to_numpy()
+    i = int(np.argmin(custos))
+    assert 3 <= i < len(custos) - 3   # ótimo no interior da grade
+    assert resultado.otimo["espessura_mm"] == pytest.approx(ESPESSURAS[i] * 1000)
+    assert resultado.otimo["custo_total_ano"] == custos.min()
+    vizinhanca = custos[i - 3:i + 4]
+    assert (np.diff(vizinhanca, 2) >= -1e-9).all()
+    assert (np.diff(custos[:i + 1]) <= 0).all() and (np.diff(custos[i:]) >= 0).all()
+
+
+def test_combustivel_mais_caro_pede_mais_isolante():
+    espessuras = [_otimizar(valor).otimo["espessura_mm"] for valor in (1.0, 3.5, 10.0)]
+    assert espessuras[0] < espessuras[1] < espessuras[2]
+    assert _otimizar(3.5, "Superfície Plana").otimo["espessura_mm"] > _otimizar(1.0, "Superfície Plana").otimo["espessura_mm"]
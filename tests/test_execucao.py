@@ -0,0 +1,85 @@
+"""Pool de processos: mais de um processo, mesmos resultados e mesma ordem do cálculo serial."""
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from isolafacil import execucao, lote_planilha
+from isolafacil.lote import resolver_lote
+from isolafacil.lote_planilha import processar_para_bytes
+from test_lote_planilha import FINANCEIRO, LINHAS, _csv, _xlsx
+
+K = ("0,0337 + 0,000149*T + 2,8e-7*T**2", "0.031 + 0.00019*T", "0.052 + 0.000105*T")
+
+
+def resolver_bloco(bloco):
+    return resolver_lote(bloco["tq"], bloco["to"], bloco["espessura"], bloco["geometria"], bloco["emissividade"],
+                         bloco["k_func"], bloco["diametro"])
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(execucao, "numero_processos", lambda: 2)
+    execucao.encerrar()
+    yield
+    execucao.encerrar()
+
+
+def test_pool_com_dois_processos_igual_ao_serial(pool):
+    n = 600
+    rng = np.random.default_rng(7)
+    casos = pd.DataFrame({
+        "tq": rng.uniform(60, 400, n), "to": rng.uniform(0, 40, n), "espessura": rng.uniform(0.02, 0.15, n),
+        "geometria": np.where(np.arange(n) % 2, "Tubulação", "Superfície Plana"),
+        "emissividade": rng.uniform(0.05, 0.95, n), "k_func": np.array(K, dtype=object)[np.arange(n) % 3],
+        "diametro": np.where(np.arange(n) % 2, 0.0889, 0.0),
+    })
+    assert len(execucao.aquecer(esperar=True)) == 2
+
+    blocos = [casos.iloc[i:i + 100].reset_index(drop=True) for i in range(0, n, 100)]
+    paralelo = pd.concat(list(execucao.mapear_ordenado(resolver_bloco, blocos, em_voo=3)), ignore_index=True)
+    serial = resolver_bloco(casos)
+    pd.testing.assert_frame_equal(paralelo, serial)
+
+
+@pytest.mark.parametrize("nome, gerar", [("itens.csv", _csv), ("itens.xlsx", _xlsx)], ids=["csv", "xlsx"])
+def test_planilha_no_pool(pool, monkeypatch, catalogo, nome, gerar):
+    isolantes, acabamentos = catalogo
+    usados = []
+    mapear = execucao.mapear_ordenado
+    monkeypatch.setattr(execucao, "mapear_ordenado", lambda *args, **kwargs: usados.append(1) or mapear(*args, **kwargs))
+    dados = gerar(LINHAS * 4)
+
+    serial, _ = processar_para_bytes(dados, nome, isolantes, acabamentos, financeiro=FINANCEIRO, tamanho_bloco=5)
+    paralelo, resumo = processar_para_bytes(dados, nome, isolantes, acabamentos, financeiro=FINANCEIRO,
+                                            tamanho_bloco=5, paralelo=True)
+    assert usados and paralelo == serial and resumo["linhas"] == 20
+
+    # Menos de BLOCOS_PARALELO blocos: fica em série mesmo pedindo o pool.
+    usados.clear()
+    processar_para_bytes(dados, nome, isolantes, acabamentos, tamanho_bloco=10, paralelo=True)
+    assert not usados and lote_planilha.BLOCOS_PARALELO > 2
+
+
+@pytest.mark.desempenho
+def test_pool_acelera_o_lote(catalogo):
+    """Vazão serial x paralela de uma planilha de 20 mil itens; o ganho deve crescer quase linear com os núcleos."""
+    processos = execucao.numero_processos()
+    if processos < 2:
+        pytest.skip("um único núcleo disponível")
+    isolantes, acabamentos = catalogo
+    dados = _csv(LINHAS * 4000)
+    execucao.aquecer(esperar=True)
+
+    tempos, saidas = {}, {}
+    for paralelo in (False, True):
+        inicio = time.perf_counter()
+        saidas[paralelo], _ = processar_para_bytes(dados, "itens.csv", isolantes, acabamentos, financeiro=FINANCEIRO,
+                                                   paralelo=paralelo)
+        tempos[paralelo] = time.perf_counter() - inicio
+    assert saidas[True] == saidas[False]
+    aceleracao = tempos[False] / tempos[True]
+    print(f"\nserial: {20_000 / tempos[False]:,.0f} itens/s | {processos} processos: "
+          f"{20_000 / tempos[True]:,.0f} itens/s | aceleração {aceleracao:.2f}x")
+    assert aceleracao > 0.5 * min(processos, 4)
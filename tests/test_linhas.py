@@ -0,0 +1,54 @@
+"""Lista de linhas: perdas por metro, totais e soluções únicas por especificação."""
+import math
+
+import pytest
+
+from isolafacil.economia import COMBUSTIVEIS, calcular_retorno_financeiro
+from isolafacil.linhas import avaliar_linhas
+from isolafacil.solver import resolver_face_fria
+from isolafacil.transferencia import calcular_q_superficie
+
+MATERIAL, ACABAMENTO = "Lã de Rocha 64 kg/m³", "Alumínio"
+
+
+def _trecho(tag, diametro_mm, comprimento_m, tq=250.0, espessura_mm=51.0, material=MATERIAL):
+    return {"tag": tag, "diametro_mm": diametro_mm, "comprimento_m": comprimento_m, "tq": tq, "to": 25.0,
+            "material": material, "acabamento": ACABAMENTO, "espessura_mm": espessura_mm}
+
+
+def test_perda_por_metro_e_totais(catalogo):
+    isolantes, acabamentos = catalogo
+    trechos = [_trecho(f"L-{i}", 88.9, 10.0 * (i + 1)) for i in range(5)] + [
+        _trecho("L-5", 60.3, 30.0, tq=180.0, espessura_mm=38.0),
+        _trecho("L-6", 88.9, 15.0, material="Inexistente"),
+    ]
+    financeiro = {"combustivel": COMBUSTIVEIS["Gás Natural (m³)"], "valor_comb": None, "h_dia": 24, "d_sem": 7}
+    resultado = avaliar_linhas(trechos, isolantes, acabamentos, financeiro)
+
+    assert resultado.especificacoes == 3
+    assert list(resultado.trechos["status"][:6]) == ["ok"] * 6
+    assert resultado.trechos["status"].iloc[6].startswith("material desconhecido")
+
+    emissividade = acabamentos[ACABAMENTO].emissividade
+    unico = resolver_face_fria(250, 25, 0.051, isolantes[MATERIAL].k_func_str, "Tubulação", emissividade, 0.0889)
+    w_m_com = unico.q * math.pi * (0.0889 + 2 * 0.051)
+    w_m_sem = calcular_q_superficie(250, 25, "Tubulação", emissividade, 0.0889) * math.pi * 0.0889
+    primeiro = resultado.trechos.iloc[0]
+    assert primeiro["perda_com_w_m"] == pytest.approx(w_m_com)
+    assert primeiro["perda_sem_w_m"] == pytest.approx(w_m_sem)
+    assert resultado.trechos["perda_com_kw"].iloc[4] == pytest.approx(w_m_com * 50 / 1000)
+
+    resumo = resultado.resumo
+    assert (resumo["trechos"], resumo["calculados"], resumo["com_erro"]) == (7, 6, 1)
+    assert resumo["comprimento_m"] == pytest.approx(180.0)
+    assert resumo["perda_com_kw"] == pytest.approx(resultado.trechos["perda_com_kw"].iloc[:6].sum())
+    # Mesmo resultado da função usada no cálculo individual, com o comprimento no lugar da área.
+    retorno = calcular_retorno_financeiro(w_m_sem / 1000, w_m_com / 1000, financeiro["combustivel"], None, 10.0, 24, 7)
+    assert resultado.trechos["eco_anual"].iloc[0] == pytest.approx(retorno["eco_anual"], rel=1e-3)
+    assert resultado.trechos["co2_ton_ano"].iloc[0] == pytest.approx(retorno["co2_ton_ano"], rel=1e-3)
+
+
+def test_colunas_ausentes(catalogo):
+    isolantes, acabamentos = catalogo
+    with pytest.raises(ValueError, match="comprimento_m"):
+        avaliar_linhas([{"tag": "L-1", "diametro_mm": 50}], isolantes, acabamentos)
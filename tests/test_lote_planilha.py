@@ -0,0 +1,126 @@
+"""Lote a partir de planilha: CSV e XLSX de ida e volta, linhas inválidas e limites entre blocos."""
+import csv
+import io
+import math
+
+import pytest
+from openpyxl import Workbook
+
+from isolafacil.economia import COMBUSTIVEIS, SEMANAS_POR_MES, custo_kwh
+from isolafacil.lote_planilha import COLUNAS_RESULTADO, ArquivoLoteInvalido, contar_linhas, processar_para_bytes
+from isolafacil.relatorios import RelatorioConsolidado
+from isolafacil.solver import resolver_face_fria
+
+CABECALHO = ["Tag", "Geometria", "Diâmetro mm", "Tq", "To", "Material", "Acabamento", "Espessura mm", "Area m2",
+             "Comprimento m"]
+LINHAS = [
+    ["L-01", "Tubulação", "88,9", "250", "25", "Lã de Rocha 64 kg/m³", "Alumínio", "51", "2", "30"],
+    ["L-02", "plana", "", "180", "25", "Lã de Vidro", "Pintado", "38", "", ""],
+    ["L-03", "tubo", "60.3", "150", "25", "Lã de Vidro", "Aço Inox", "abc", "1", "1"],  # espessura inválida
+    ["L-04", "Tubulação", "114,3", "300", "25", "", "Alumínio", "50", "1", "1"],         # sem material
+    ["L-05", "Superfície Plana", "", "450", "20", "Silicato de Cálcio", "Alumínio", "76", "3,5", ""],
+]
+FINANCEIRO = {"combustivel": COMBUSTIVEIS["Gás Natural (m³)"], "valor_comb": 3.6, "h_dia": 24, "d_sem": 7}
+
+
+def _csv(linhas=LINHAS):
+    saida = io.StringIO()
+    csv.writer(saida, delimiter=";").writerows([CABECALHO] + linhas)
+    return saida.getvalue().encode("utf-8-sig")
+
+
+def _xlsx(linhas=LINHAS):
+    pasta = Workbook()
+    aba = pasta.active
+    aba.append(CABECALHO)
+    for linha in linhas:
+        # Números como números, como num Excel digitado à mão; vazios como células vazias.
+        aba.append([float(v.replace(",", ".")) if v.replace(",", "").replace(".", "").isdigit() else (v or None)
+                    for v in linha])
+    aba.append([None] * len(CABECALHO))   # linha em branco no fim é ignorada
+    saida = io.BytesIO()
+    pasta.save(saida)
+    return saida.getvalue()
+
+
+def _ler(csv_bytes):
+    return list(csv.DictReader(io.StringIO(csv_bytes.decode("utf-8-sig")), delimiter=";"))
+
+
+@pytest.mark.parametrize("nome, dados", [("itens.csv", _csv()), ("itens.xlsx", _xlsx())], ids=["csv", "xlsx"])
+def test_ida_e_volta(catalogo, nome, dados):
+    isolantes, acabamentos = catalogo
+    relatorio = RelatorioConsolidado(data_simulacao="01/01/2025")
+    csv_bytes, resumo = processar_para_bytes(dados, nome, isolantes, acabamentos, relatorio, FINANCEIRO, tamanho_bloco=2)
+    linhas = _ler(csv_bytes)
+
+    assert list(linhas[0]) == list(COLUNAS_RESULTADO)
+    assert [linha["tag"] for linha in linhas] == [linha[0] for linha in LINHAS]
+    assert [linha["status"] for linha in linhas] == [
+        "ok", "ok", "espessura inválida", "material desconhecido: ", "ok"]
+    assert (resumo["linhas"], resumo["calculadas"], resumo["com_erro"]) == (5, 3, 2)
+    assert linhas[1]["geometria"] == "Superfície Plana" and float(linhas[1]["area_m2"]) == 1.0
+    assert linhas[2]["tf"] == "nan" and linhas[3]["eco_anual"] == "nan"
+
+    # Cada linha calculada coincide com o cálculo isolado.
+    for linha in linhas:
+        if linha["status"] != "ok":
+            continue
+        isolado = resolver_face_fria(float(linha["tq"]), float(linha["to"]), float(linha["espessura_mm"]) / 1000,
+                                     isolantes[linha["material"]].k_func_str, linha["geometria"],
+                                     acabamentos[linha["acabamento"]].emissividade,
+                                     float(linha["diametro_mm"]) / 1000 or None)
+        assert float(linha["tf"]) == pytest.approx(isolado.Tf, abs=0.05)
+        assert float(linha["eco_anual"]) > 0
+
+    assert relatorio.concluir(resumo).startswith(b"%PDF")
+
+
+def test_tubulacao_por_metro(catalogo):
+    isolantes, acabamentos = catalogo
+    csv_bytes, resumo = processar_para_bytes(_csv(), "itens.csv", isolantes, acabamentos, financeiro=FINANCEIRO)
+    tubo, plana = _ler(csv_bytes)[0], _ler(csv_bytes)[4]
+
+    # Tubulação: kW/m nas faces externa do isolante e do tubo, vezes o comprimento; a área não entra.
+    com_m = float(tubo["perda_com_kw"]) * math.pi * (0.0889 + 2 * 0.051)
+    sem_m = float(tubo["perda_sem_kw"]) * math.pi * 0.0889
+    assert float(tubo["perda_com_kw_m"]) == pytest.approx(com_m)
+    assert float(tubo["perda_sem_kw_m"]) == pytest.approx(sem_m)
+    horas_mes = FINANCEIRO["h_dia"] * FINANCEIRO["d_sem"] * SEMANAS_POR_MES
+    custo = custo_kwh(FINANCEIRO["combustivel"], FINANCEIRO["valor_comb"])
+    assert float(tubo["eco_mensal"]) == pytest.approx((sem_m - com_m) * 30 * custo * horas_mes)
+    assert float(tubo["reducao_pct"]) == pytest.approx((sem_m - com_m) / sem_m * 100)
+
+    # Superfície plana: kW/m² vezes a área, sem colunas por metro.
+    assert plana["perda_com_kw_m"] == "nan"
+    economia_plana = (float(plana["perda_sem_kw"]) - float(plana["perda_com_kw"])) * 3.5
+    assert float(plana["eco_mensal"]) == pytest.approx(economia_plana * custo * horas_mes)
+
+    linhas = _ler(csv_bytes)
+    assert resumo["perda_com_kw"] == pytest.approx(
+        com_m * 30 + float(plana["perda_com_kw"]) * 3.5 + float(linhas[1]["perda_com_kw"]) * 1.0)
+
+
+def test_blocos_nao_alteram_o_resultado(catalogo):
+    isolantes, acabamentos = catalogo
+    linhas = LINHAS * 3
+    inteiro, _ = processar_para_bytes(_csv(linhas), "itens.csv", isolantes, acabamentos, tamanho_bloco=500)
+    # 15 linhas em blocos de 4: a última parcial e fronteiras no meio das linhas inválidas.
+    em_blocos, resumo = processar_para_bytes(_csv(linhas), "itens.csv", isolantes, acabamentos, tamanho_bloco=4)
+    assert em_blocos == inteiro
+    assert resumo["linhas"] == 15
+    assert contar_linhas(io.BytesIO(_csv(linhas)), "itens.csv") == 15
+
+    # Sem financeiro as colunas de economia ficam vazias, e o relatório as omite.
+    relatorio = RelatorioConsolidado()
+    _, resumo = processar_para_bytes(_csv(), "itens.csv", isolantes, acabamentos, relatorio)
+    assert relatorio.concluir(resumo).startswith(b"%PDF")
+
+
+def test_arquivo_invalido(catalogo):
+    isolantes, acabamentos = catalogo
+    with pytest.raises(ArquivoLoteInvalido, match="colunas ausentes: espessura_mm"):
+        processar_para_bytes(b"tag;geometria;diametro_mm;tq;to;material;acabamento\n", "itens.csv",
+                             isolantes, acabamentos)
+    with pytest.raises(ArquivoLoteInvalido, match="formato"):
+        processar_para_bytes(b"", "itens.ods", isolantes, acabamentos)
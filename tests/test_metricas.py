@@ -0,0 +1,51 @@
+"""Contadores, rastro por requisição e exportação das métricas."""
+import json
+import logging
+
+from isolafacil import metricas
+from isolafacil.espessura import espessura_minima
+from isolafacil.solver import resolver_face_fria
+
+
+def test_rastro_do_solver(catalogo):
+    isolantes, _ = catalogo
+    k_func = isolantes["Elastomérico"].k_func_str
+    rastro = metricas.iniciar_rastro("teste")
+    unica = resolver_face_fria(250, 30, 0.051, k_func, "Superfície Plana", 0.1)
+    espessura = espessura_minima(5, 25, 19.1, k_func, "Superfície Plana", 0.9)
+
+    etapas = {linha["etapa"]: linha for linha in rastro.resumo()}
+    assert etapas["espessura_minima"]["chamadas"] == 1
+    assert etapas["espessura_minima"]["solucoes"] == espessura.solucoes
+    solver = etapas["solver_face_fria"]
+    assert solver["chamadas"] == espessura.solucoes + 1
+    assert solver["status_convergiu"] == solver["chamadas"]
+    assert solver["avaliacoes_k"] >= unica.avaliacoes + 2 * espessura.solucoes
+
+
+def test_texto_prometheus():
+    registro = metricas.Registro()
+    registro.acumular(("solver_face_fria", (("status", "convergiu"),)), 0.25, [(("solver_face_fria_iteracoes", ()), 4)])
+    registro.acumular(("solver_face_fria", (("status", "convergiu"),)), 0.5)
+    texto = registro.texto_prometheus()
+    assert "# TYPE isolafacil_solver_face_fria_segundos summary" in texto
+    assert 'isolafacil_solver_face_fria_segundos_sum{status="convergiu"} 0.75' in texto
+    assert 'isolafacil_solver_face_fria_segundos_count{status="convergiu"} 2' in texto
+    assert 'isolafacil_solver_face_fria_segundos_max{status="convergiu"} 0.5' in texto
+    assert "isolafacil_solver_face_fria_iteracoes_total 4" in texto
+
+
+def test_linhas_json(tmp_path):
+    caminho = tmp_path / "metricas.jsonl"
+    manipulador = metricas.exportar_jsonl(caminho)
+    try:
+        with metricas.medir("pdf_consolidado", linhas=3) as detalhes:
+            detalhes["paginas"] = 1
+    finally:
+        metricas._log.removeHandler(manipulador)
+        metricas._log.setLevel(logging.NOTSET)
+        manipulador.close()
+    evento = json.loads(caminho.read_text(encoding="utf-8").strip())
+    assert evento["etapa"] == "pdf_consolidado"
+    assert (evento["linhas"], evento["paginas"]) == (3, 1)
+    assert evento["ms"] >= 0
@@ -0,0 +1,124 @@
+"""Resultados numéricos do solver comparados com os casos de referência."""
+import pytest
+
+import referencia
+from isolafacil.espessura import espessura_minima
+from isolafacil.lote import resolver_lote
+from isolafacil.materiais import RegistroMateriais
+from isolafacil.multicamada import Camada, resolver_multicamada
+from isolafacil.psicrometria import temperatura_orvalho
+from isolafacil.relatorios import gerar_pdf, gerar_pdf_frio
+from isolafacil.solver import encontrar_temperatura_face_fria, resolver_face_fria
+
+CASOS = referencia.carregar_casos()
+
+
+def _q_proximo(obtido, esperado):
+    return abs(obtido - esperado) <= max(referencia.TOLERANCIA_Q_ABSOLUTA, referencia.TOLERANCIA_Q_RELATIVA * abs(esperado))
+
+
+def _argumentos(caso, catalogo):
+    isolantes, acabamentos = catalogo
+    return (caso["tq"], caso["to"], caso["espessura_mm"] / 1000, isolantes[caso["material"]].k_func_str,
+            caso["geometria"], acabamentos[caso["acabamento"]].emissividade,
+            caso["diametro_mm"] / 1000 or None, caso["vento_ms"])
+
+
+@pytest.mark.parametrize("caso", CASOS["face_fria"], ids=lambda caso: caso["nome"])
+def test_face_fria(caso, catalogo):
+    resultado = resolver_face_fria(*_argumentos(caso, catalogo))
+    assert resultado.convergiu, resultado.status
+    assert resultado.Tf == pytest.approx(caso["tf"], abs=referencia.TOLERANCIA_TF)
+    assert _q_proximo(resultado.q, caso["q"])
+
+
+@pytest.mark.parametrize("caso", CASOS["face_fria"], ids=lambda caso: caso["nome"])
+def test_interface_antiga(caso, catalogo):
+    Tf, q, convergiu = encontrar_temperatura_face_fria(*_argumentos(caso, catalogo))
+    assert convergiu
+    assert Tf == pytest.approx(caso["tf"], abs=referencia.TOLERANCIA_TF)
+
+
+def test_lote_igual_ao_escalar(catalogo):
+    argumentos = [_argumentos(caso, catalogo) for caso in CASOS["face_fria"]]
+    Tq, To, L, k_func, geometria, emissividade, D, vento = zip(*argumentos)
+    resultado = resolver_lote(Tq, To, L, geometria, emissividade, k_func, [d or 0.0 for d in D], vento)
+    assert resultado["convergiu"].all()
+    for caso, Tf, perda in zip(CASOS["face_fria"], resultado["tf"], resultado["perda_com_kw"]):
+        assert Tf == pytest.approx(caso["tf"], abs=referencia.TOLERANCIA_TF), caso["nome"]
+        assert _q_proximo(perda * 1000, caso["q"]), caso["nome"]
+
+
+@pytest.mark.parametrize("caso", CASOS["multicamada"], ids=lambda caso: caso["nome"])
+def test_multicamada(caso, catalogo):
+    isolantes, acabamentos = catalogo
+    camadas = [Camada(L / 1000, isolantes[material].k_func_str) for material, L in caso["camadas"]]
+    resultado = resolver_multicamada(caso["tq"], caso["to"], camadas, caso["geometria"],
+                                     acabamentos[caso["acabamento"]].emissividade, caso["diametro_mm"] / 1000 or None)
+    assert resultado.convergiu, resultado.status
+    assert list(resultado.temperaturas) == pytest.approx(caso["temperaturas"], abs=referencia.TOLERANCIA_TF)
+    assert _q_proximo(resultado.q, caso["q"])
+
+
+def test_multicamada_de_um_material_igual_a_camada_unica(catalogo):
+    isolantes, _ = catalogo
+    k_func = isolantes["Lã de Rocha 64 kg/m³"].k_func_str
+    unica = resolver_face_fria(250, 30, 0.076, k_func, "Tubulação", 0.1, 0.0889, tol_T=1e-6, tol_q=1e-4)
+    dividida = resolver_multicamada(250, 30, [Camada(0.038, k_func), Camada(0.038, k_func)], "Tubulação", 0.1, 0.0889,
+                                    tol_T=1e-6, tol_q=1e-4)
+    # k é avaliado na média de cada camada, então a divisão altera Tf só ligeiramente.
+    assert dividida.Tf == pytest.approx(unica.Tf, abs=0.5)
+
+
+def test_multicamada_sem_iteracoes(catalogo):
+    isolantes, _ = catalogo
+    k_func = isolantes["Lã de Rocha 64 kg/m³"].k_func_str
+    resultado = resolver_multicamada(250, 30, [Camada(0.038, k_func), Camada(0.038, k_func)], "Tubulação", 0.1, 0.0889,
+                                     max_iter=0)
+    # Sem iterações resta a estimativa inicial, com o resíduo dela.
+    assert not resultado.convergiu and resultado.status.startswith("0 iterações")
+    assert len(resultado.temperaturas) == 2 and resultado.residuo > 0
+
+
+@pytest.mark.parametrize("caso", CASOS["espessura"], ids=lambda caso: caso["nome"])
+def test_espessura_minima(caso, catalogo):
+    isolantes, _ = catalogo
+    T_orvalho = temperatura_orvalho(caso["ta"], caso["ur"])
+    assert T_orvalho == pytest.approx(caso["t_orvalho"], abs=1e-3)
+    resultado = espessura_minima(caso["ti"], caso["ta"], T_orvalho, isolantes[caso["material"]].k_func_str,
+                                 caso["geometria"], 0.9, caso["diametro_mm"] / 1000 or None, caso["vento_ms"])
+    assert resultado.encontrada, resultado.status
+    assert resultado.espessura * 1000 == pytest.approx(caso["espessura_mm"], abs=referencia.TOLERANCIA_ESPESSURA)
+    assert resultado.Tf >= T_orvalho
+
+
+def test_referencia_confere_valores_publicados():
+    # Pontos da própria tabela do ar (Incropera A.4) e orvalho de tabelas psicrométricas.
+    assert referencia.ar(300) == pytest.approx((15.89e-6, 26.3e-3, 22.5e-6, 0.707))
+    assert referencia.ar(350)[0] == pytest.approx(20.92e-6)
+    assert referencia.orvalho(20, 50) == pytest.approx(9.3, abs=0.1)
+    assert referencia.orvalho(30, 70) == pytest.approx(23.9, abs=0.1)
+    assert referencia.orvalho(25, 100) == pytest.approx(25.0, abs=1e-9)
+
+
+def test_catalogo_rejeita_formula_invalida(catalogo):
+    isolantes, _ = catalogo
+    assert isinstance(isolantes, RegistroMateriais)
+    assert "Fórmula Inválida" not in isolantes
+    assert set(isolantes.validos_para(700)) == {"Silicato de Cálcio"}
+
+
+def test_relatorios_pdf():
+    dados = {"material": "Lã de Rocha 64 kg/m³", "acabamento": "Alumínio", "geometria": "Tubulação",
+             "diametro_tubo": 88.9, "num_camadas": 2, "materiais_camadas": ["Silicato de Cálcio", "Lã de Vidro"],
+             "espessuras": [25.0, 26.0], "interfaces": [180.0], "esp_total": 51.0, "tq": 250.0, "to": 30.0,
+             "emissividade": 0.1, "tf": 60.9, "perda_com_kw": 0.165, "perda_sem_kw": 1.9,
+             "calculo_financeiro": True, "eco_mensal": 1234.5, "eco_anual": 14814.0, "reducao_pct": 91.3,
+             "co2_ton_ano": 3.2, "data_simulacao": "01/01/2025"}
+    primeiro = gerar_pdf(dados)
+    # Um segundo documento com outros caracteres usa glifos que não estavam no primeiro.
+    segundo = gerar_pdf({**dados, "material": "Ωµ Çãõ XYZ"})
+    frio = gerar_pdf_frio({"material": "Elastomérico", "geometria": "Superfície Plana", "ti": 5, "ta": 25, "ur": 70,
+                           "vento": 0, "t_orvalho": 19.1, "espessura_final": 11.5, "espessura_comercial": 13.0})
+    for pdf in (primeiro, segundo, frio):
+        assert pdf.startswith(b"%PDF")
@@ -0,0 +1,48 @@
+"""Curvas de sensibilidade com estimativa inicial dos vizinhos e pontos reaproveitados."""
+import dataclasses
+
+import pytest
+
+import referencia
+from isolafacil.sensibilidade import CasoBase, CurvasSensibilidade, faixa
+from isolafacil.solver import resolver_face_fria
+
+
+@pytest.fixture
+def caso(catalogo):
+    isolantes, _ = catalogo
+    return CasoBase(250, 30, 0.051, isolantes["Lã de Rocha 64 kg/m³"].k_func_str, "Tubulação", 0.1, 0.0889)
+
+
+@pytest.mark.parametrize("variavel, valores", [
+    ("espessura_m", [v / 1000 for v in faixa(10, 200, 5)]),
+    ("To", faixa(0, 45, 1)),
+    ("vento_ms", faixa(0, 10, 0.5)),
+])
+def test_curva_igual_aos_pontos_isolados(caso, variavel, valores):
+    pontos = list(CurvasSensibilidade().calcular(caso, variavel, reversed(valores)))
+    assert [p.valor for p in pontos] == sorted(valores)
+    avaliacoes_isoladas = 0
+    for ponto in pontos:
+        c = dataclasses.replace(caso, **{variavel: ponto.valor})
+        isolado = resolver_face_fria(c.Tq, c.To, c.espessura_m, c.k_func_str, c.geometria, c.emissividade,
+                                     c.diametro_m, c.vento_ms)
+        avaliacoes_isoladas += isolado.avaliacoes
+        assert ponto.convergiu
+        assert ponto.Tf == pytest.approx(isolado.Tf, abs=referencia.TOLERANCIA_TF)
+    # Com o passo padrão da interface, partir dos vizinhos não custa mais que resolver cada ponto do zero.
+    assert sum(p.avaliacoes for p in pontos) <= avaliacoes_isoladas
+
+
+def test_faixa_ampliada_resolve_so_pontos_novos(caso):
+    curvas = CurvasSensibilidade()
+    primeira = list(curvas.calcular(caso, "espessura_m", [v / 1000 for v in faixa(10, 100, 10)]))
+    refinada = list(curvas.calcular(caso, "espessura_m", [v / 1000 for v in faixa(10, 150, 5)]))
+    assert all(p.avaliacoes > 0 for p in primeira)
+    reaproveitados = [p for p in refinada if p.avaliacoes == 0]
+    assert len(reaproveitados) == len(primeira)
+    assert curvas.estatisticas() == {"casos": 1, "pontos": len(refinada), "calculados": len(refinada),
+                                     "reaproveitados": len(primeira)}
+    # Outro caso-base não reaproveita os pontos do primeiro.
+    outro = list(curvas.calcular(dataclasses.replace(caso, To=20), "espessura_m", [0.05]))
+    assert outro[0].avaliacoes > 0
@@ -0,0 +1,59 @@
+"""Caminhos de falha do solver da face fria: sem troca de sinal, k(T) com erro e limite de iterações."""
+import math
+
+import pytest
+
+from isolafacil import solver
+from isolafacil.solver import resolver_face_fria
+
+K_LINEAR = "0.0337 + 0.000149*T"
+
+
+def test_convergencia_e_tf_inicial():
+    resultado = resolver_face_fria(250, 25, 0.051, K_LINEAR, "Superfície Plana", 0.1)
+    assert resultado.convergiu and resultado.status == "convergiu"
+    assert 25 < resultado.Tf < 250 and resultado.q > 0
+    assert resultado.avaliacoes <= 8 and abs(resultado.residuo) <= solver.TOLERANCIA_Q
+
+    vizinho = resolver_face_fria(250, 25, 0.051, K_LINEAR, "Superfície Plana", 0.1, Tf_inicial=resultado.Tf)
+    assert vizinho.convergiu and vizinho.avaliacoes <= resultado.avaliacoes
+    assert vizinho.Tf == pytest.approx(resultado.Tf, abs=solver.TOLERANCIA_T)
+
+
+def test_sem_troca_de_sinal(monkeypatch):
+    # Perda na superfície maior que qualquer condução: o balanço é negativo em To e em Tq.
+    monkeypatch.setattr(solver, "calcular_q_superficie", lambda *args: 1e9)
+    resultado = resolver_face_fria(250, 25, 0.051, K_LINEAR, "Superfície Plana", 0.1)
+    assert not resultado.convergiu
+    assert resultado.status == "balanço sem troca de sinal entre To e Tq"
+    assert resultado.Tf is None and resultado.q is None and resultado.avaliacoes == 2
+
+
+@pytest.mark.parametrize("k_func, mensagem", [
+    ("0.05 - 0.001*T", "k(T=137.5 °C) = -0.0875"),      # k negativo já em To
+    ("0.04/(T - 137.5)", "division by zero"),            # ZeroDivisionError na média (Tq + To) / 2
+    ("0.04 + math.sqrt(T - 200)", "math domain error"),  # ValueError de math
+])
+def test_k_com_erro(k_func, mensagem):
+    resultado = resolver_face_fria(250, 25, 0.051, k_func, "Superfície Plana", 0.1)
+    assert not resultado.convergiu and resultado.Tf is None
+    assert resultado.status.startswith("erro ao avaliar k(T): ") and mensagem in resultado.status
+    assert resultado.avaliacoes == 1
+
+
+@pytest.mark.parametrize("argumentos, status", [
+    ((250, 25, 0.051, "__import__('os')", "Superfície Plana", 0.1), "fórmula k(T) inválida"),
+    ((250, 25, 0.0, K_LINEAR, "Superfície Plana", 0.1), "geometria inválida"),
+    ((250, 25, 0.051, K_LINEAR, "Tubulação", 0.1, None), "geometria inválida"),
+])
+def test_entrada_invalida(argumentos, status):
+    resultado = resolver_face_fria(*argumentos)
+    assert not resultado.convergiu and resultado.status.startswith(status)
+    assert resultado.avaliacoes == 0
+
+
+def test_limite_de_iteracoes():
+    resultado = resolver_face_fria(250, 25, 0.051, K_LINEAR, "Superfície Plana", 0.1, tol_T=0, tol_q=0, max_iter=2)
+    assert not resultado.convergiu and resultado.q is None
+    assert resultado.status.startswith("2 iterações sem atingir a tolerância")
+    assert resultado.iteracoes == 2 and math.isfinite(resultado.residuo)
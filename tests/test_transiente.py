@@ -0,0 +1,68 @@
+"""Regime transitório: limite permanente, balanço de energia e convergência no passo de tempo."""
+import math
+
+import pytest
+
+from isolafacil.solver import resolver_face_fria
+from isolafacil.transiente import CamadaTransiente, capacidade_tubulacao, simular_transiente
+
+# k linear em T: a média na camada é exata e o perfil permanente coincide com o solver de uma camada.
+K_LINEAR = "0,04 + 0,0002*T"
+
+
+@pytest.mark.parametrize("geometria, diametro", [("Superfície Plana", None), ("Tubulação", 0.0889)])
+def test_parte_do_regime_permanente_e_fica_nele(geometria, diametro):
+    resultado = simular_transiente(250, 25, [CamadaTransiente(0.051, K_LINEAR)], geometria, 0.1, diametro,
+                                   duracao_s=3600, passo_s=60)
+    permanente = resolver_face_fria(250, 25, 0.051, K_LINEAR, geometria, 0.1, diametro)
+    assert resultado.ok and resultado.passos == 60
+    assert resultado.T_face_fria[0] == pytest.approx(permanente.Tf, abs=0.02)
+    assert max(resultado.T_face_fria) - min(resultado.T_face_fria) < 1e-6
+    assert resultado.q[-1] == pytest.approx(permanente.q, rel=1e-3)
+
+
+def test_resfriamento_do_conteudo_parado():
+    camadas = [CamadaTransiente(0.025, K_LINEAR, 64, 840), CamadaTransiente(0.025, K_LINEAR, 130, 840)]
+    C = capacidade_tubulacao(0.0889, 0.0055)
+    resultado = simular_transiente(90, -10, camadas, "Tubulação", 0.9, 0.0889, 3, duracao_s=96 * 3600,
+                                   passo_s=60, capacidade_interna=C)
+    assert resultado.ok
+    assert all(b < a for a, b in zip(resultado.T_interna, resultado.T_interna[1:]))
+    assert resultado.T_interna[-1] > -10
+
+    # Energia perdida pela superfície = calor cedido pelo conteúdo e pelo isolamento.
+    A_ext = math.pi * (0.0889 + 2 * 0.05)
+    perdida = sum((a + b) / 2 * (t1 - t0) for a, b, t0, t1 in zip(
+        resultado.q, resultado.q[1:], resultado.tempos, resultado.tempos[1:])) * A_ext
+    inicial = simular_transiente(90, -10, camadas, "Tubulação", 0.9, 0.0889, 3, duracao_s=1, passo_s=1)
+    raios = [0.0889 / 2 + p for p in resultado.posicoes]
+    dr = 0.025 / 10
+    cedida = C * (resultado.T_interna[0] - resultado.T_interna[-1]) + sum(
+        (64 if p < 0.025 else 130) * 840 * 2 * math.pi * r * dr * (ti - tf)
+        for p, r, ti, tf in zip(resultado.posicoes, raios, inicial.perfil_final, resultado.perfil_final))
+    assert perdida == pytest.approx(cedida, rel=0.01)
+
+    # Implícito: o tempo até 0 °C praticamente não muda com um passo 30 vezes maior.
+    tempo = resultado.tempo_ate(0.0)
+    grosso = simular_transiente(90, -10, camadas, "Tubulação", 0.9, 0.0889, 3, duracao_s=96 * 3600,
+                                passo_s=1800, capacidade_interna=C)
+    assert 24 * 3600 < tempo < 96 * 3600
+    assert grosso.tempo_ate(0.0) == pytest.approx(tempo, rel=0.02)
+
+
+def test_aquecimento_a_partir_do_ambiente():
+    resultado = simular_transiente(250, 25, [CamadaTransiente(0.051, K_LINEAR, 64, 840)], "Superfície Plana", 0.1,
+                                   duracao_s=6 * 3600, passo_s=30, T_inicial=25)
+    permanente = resolver_face_fria(250, 25, 0.051, K_LINEAR, "Superfície Plana", 0.1)
+    assert all(b >= a - 1e-9 for a, b in zip(resultado.T_face_fria, resultado.T_face_fria[1:]))
+    assert resultado.T_face_fria[-1] == pytest.approx(permanente.Tf, abs=0.05)
+    assert 0 < resultado.tempo_ate(40.0, "T_face_fria") < 6 * 3600
+    assert resultado.tempo_ate(permanente.Tf + 10, "T_face_fria") is None
+
+
+def test_entradas_invalidas():
+    assert simular_transiente(250, 25, [], "Tubulação", 0.1, 0.0889).status == "espessuras inválidas"
+    assert simular_transiente(250, 25, [CamadaTransiente(0.05, K_LINEAR)], "Tubulação", 0.1).status == \
+        "geometria inválida"
+    assert simular_transiente(250, 25, [CamadaTransiente(0.05, "T +")], "Superfície Plana", 0.1).status.startswith(
+        "fórmula k(T) inválida")